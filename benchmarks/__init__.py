@@ -0,0 +1,7 @@
+"""
+translatepy's benchmarks
+
+The benchmarks are written in the asv (airspeed velocity) style: classes with `time_*` methods,
+optional `setup`/`teardown` methods and `params`/`param_names` attributes.
+They can be run without any additional dependency with `python -m benchmarks.run`.
+"""
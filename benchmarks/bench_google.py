@@ -0,0 +1,22 @@
+"""
+Benchmarks of the parsing of Google Translate's batchexecute responses
+"""
+
+from translatepy.translators.google import GoogleTranslateV1
+
+from translatepy.server.mock import make_google_batchexecute_response
+
+from benchmarks.fixtures import SENTENCE
+
+
+class GoogleParseResponse:
+    params = [[1, 50]]
+    param_names = ["sentences"]
+
+    def setup(self, sentences):
+        self.translator = GoogleTranslateV1()
+        text = " ".join([SENTENCE] * sentences)
+        self.response = make_google_batchexecute_response(text, text[::-1])
+
+    def time_parse_response(self, sentences):
+        self.translator._parse_response(self.response)
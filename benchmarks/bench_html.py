@@ -0,0 +1,26 @@
+"""
+Benchmarks of the HTML translation, with an offline translator
+"""
+
+from benchmarks.fixtures import make_html
+from tests.fakes import BatchFakeTranslator
+
+
+class TranslateHTML:
+    params = [[1000, 100000, 5000000]]
+    param_names = ["size"]
+    repeat = 3
+    timeout = 300
+
+    def setup(self, size):
+        self.translator = BatchFakeTranslator()
+        self.html = make_html(size)
+
+    def time_translate_html(self, size):
+        self.translator.clean_cache()
+        self.translator.translate_html(self.html, "French", "English")
+
+    def time_translate_html_stream(self, size):
+        self.translator.clean_cache()
+        for _ in self.translator.translate_html_stream(self.html, "French", "English"):
+            pass
@@ -0,0 +1,22 @@
+"""
+Benchmarks of the languages resolution (codes, names and typos)
+"""
+
+from translatepy.language import Language, _languages_cache
+
+
+class LanguageResolution:
+    params = [
+        ["fr", "fra", "French", "Français", "日本語", "Englsh", "japanes"]
+    ]
+    param_names = ["language"]
+
+    def setup(self, language):
+        Language(language, threshold=0)  # loading the data
+
+    def time_cached(self, language):
+        Language(language, threshold=0)
+
+    def time_uncached(self, language):
+        _languages_cache.clear()
+        Language(language, threshold=0)
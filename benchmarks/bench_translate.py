@@ -0,0 +1,55 @@
+"""
+Benchmarks of the `Translate` class throughput, against the local mock server emulating the services
+"""
+
+from translatepy import Translate
+from translatepy.server.mock import MockServer
+from translatepy.translators import MicrosoftTranslate, MyMemoryTranslate, YandexTranslate
+
+from benchmarks.fixtures import SENTENCE
+
+TEXTS = ["{} ({})".format(SENTENCE, index) for index in range(20)]
+
+
+class TranslateThroughput:
+    params = [[False, True], [0, 0.01]]
+    param_names = ["fast", "latency"]
+    number = 1
+
+    def setup(self, fast, latency):
+        self.server = MockServer(latency=latency)
+        self.server.start()
+        services = [YandexTranslate, MicrosoftTranslate, MyMemoryTranslate]
+        self.translator = Translate(services, request=self.server.request(cache_duration=0), fast=fast)
+
+    def teardown(self, fast, latency):
+        self.server.stop()
+
+    def time_translate(self, fast, latency):
+        self.translator.clean_cache()
+        for text in TEXTS:
+            self.translator.translate(text, "French", "English")
+
+    def time_translate_batch(self, fast, latency):
+        self.translator.clean_cache()
+        self.translator.translate_batch(TEXTS, "French", "English")
+
+
+class RateLimitedThroughput:
+    """
+    Going through the fallback chain when the first service is rate limited
+    """
+    number = 1
+
+    def setup(self):
+        self.server = MockServer(rate_limit={"translate.yandex.net": 5})
+        self.server.start()
+        self.translator = Translate([YandexTranslate, MyMemoryTranslate], request=self.server.request(cache_duration=0))
+
+    def teardown(self):
+        self.server.stop()
+
+    def time_translate(self):
+        self.translator.clean_cache()
+        for text in TEXTS:
+            self.translator.translate(text, "French", "English")
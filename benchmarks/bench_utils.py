@@ -0,0 +1,60 @@
+"""
+Benchmarks of the utilities used on every call (similarity search, sanitizing, caching)
+"""
+
+from translatepy.language import LOADED_VECTORS
+from translatepy.utils.lru_cacher import LRUDictCache, cache_key
+from translatepy.utils.sanitize import remove_spaces
+from translatepy.utils.similarity import fuzzy_search
+
+from benchmarks.fixtures import SENTENCE
+
+
+class FuzzySearch:
+    params = [["englsh", "portugese brazil", "日本"]]
+    param_names = ["query"]
+
+    def time_fuzzy_search(self, query):
+        fuzzy_search(LOADED_VECTORS, query)
+
+
+class RemoveSpaces:
+    params = [[100, 10000]]
+    param_names = ["length"]
+
+    def setup(self, length):
+        self.text = (SENTENCE * (length // len(SENTENCE) + 1))[:length]
+
+    def time_remove_spaces(self, length):
+        remove_spaces(self.text)
+
+
+class CacheKey:
+    params = [[10, 5000]]
+    param_names = ["length"]
+
+    def setup(self, length):
+        self.text = (SENTENCE * (length // len(SENTENCE) + 1))[:length]
+
+    def time_cache_key(self, length):
+        cache_key(self.text, "fr", "en")
+
+
+class LRUOperations:
+    number = 100
+
+    def setup(self):
+        self.cache = LRUDictCache(maxsize=1024)
+        self.keys = [cache_key(index) for index in range(2048)]
+        for key in self.keys[:1024]:
+            self.cache[key] = key
+
+    def time_hit(self):
+        cache = self.cache
+        for key in self.keys[:1024]:
+            cache[key]
+
+    def time_insert_evict(self):
+        cache = self.cache
+        for key in self.keys:
+            cache[key] = key
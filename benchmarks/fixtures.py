@@ -0,0 +1,26 @@
+"""
+Offline fixtures used by the benchmarks
+"""
+
+SENTENCE = "The quick brown fox jumps over the lazy dog while the translation service answers."
+
+
+def make_html(size: int) -> str:
+    """
+    Returns an HTML page of about `size` characters, with a mix of text, attributes and skipped nodes
+    """
+    block = (
+        '<div class="article"><h2>Title {index}</h2>'
+        '<p>{sentence} <a href="/page/{index}" title="Link {index}">Read more</a></p>'
+        '<img src="/image/{index}.png" alt="Picture {index}">'
+        '<pre>print("not translated")</pre></div>\n'
+    )
+    blocks = []
+    length = 0
+    index = 0
+    while length < size:
+        element = block.format(index=index, sentence=SENTENCE)
+        blocks.append(element)
+        length += len(element)
+        index += 1
+    return "<html><head><title>Benchmark</title></head><body>\n" + "".join(blocks) + "</body></html>"
@@ -0,0 +1,184 @@
+"""
+Runs the benchmarks and emits the results as JSON
+
+Usage:
+    python -m benchmarks.run [--filter PATTERN] [--repeat N] [--output FILE] [--compare PREVIOUS_FILE]
+
+The results can be compared across versions with `--compare`, which reports the benchmarks
+which became slower than the given threshold.
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import pkgutil
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from os.path import dirname
+
+import translatepy
+
+# the default number of timed repetitions of each benchmark
+REPEAT = 5
+# the maximum number of seconds spent on each benchmark
+TIMEOUT = 60
+# the minimum duration of a timed sample, used to pick the number of calls per sample
+SAMPLE_DURATION = 0.05
+
+
+def discover(pattern: str = None):
+    """
+    Yields (name, class, method name) for every benchmark of the `bench_*` modules
+    """
+    regex = re.compile(pattern) if pattern else None
+    for module_info in sorted(pkgutil.iter_modules([dirname(__file__)]), key=lambda info: info.name):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module("benchmarks." + module_info.name)
+        for class_name, suite in inspect.getmembers(module, inspect.isclass):
+            if suite.__module__ != module.__name__:
+                continue
+            for method_name, _ in inspect.getmembers(suite, inspect.isfunction):
+                if not method_name.startswith("time_"):
+                    continue
+                name = "{}.{}.{}".format(module_info.name, class_name, method_name)
+                if regex is None or regex.search(name):
+                    yield name, suite, method_name
+
+
+def _calibrate(function, params) -> int:
+    """
+    Returns the number of calls needed for a sample to last at least SAMPLE_DURATION
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function(*params)
+        if time.perf_counter() - start >= SAMPLE_DURATION or number >= 1000000:
+            return number
+        number *= 10
+
+
+def run_benchmark(suite, method_name: str, params: tuple, repeat: int = REPEAT) -> dict:
+    """
+    Runs a benchmark with the given parameters and returns its statistics (in seconds per call)
+    """
+    instance = suite()
+    repeat = getattr(suite, "repeat", repeat)
+    timeout = getattr(suite, "timeout", TIMEOUT)
+    if hasattr(instance, "setup"):
+        instance.setup(*params)
+    try:
+        function = getattr(instance, method_name)
+        number = getattr(suite, "number", None) or _calibrate(function, params)
+        samples = []
+        deadline = time.perf_counter() + timeout
+        for _ in range(max(1, int(repeat))):
+            start = time.perf_counter()
+            for _ in range(number):
+                function(*params)
+            samples.append((time.perf_counter() - start) / number)
+            if time.perf_counter() > deadline:
+                break
+    finally:
+        if hasattr(instance, "teardown"):
+            instance.teardown(*params)
+
+    return {
+        "number": number,
+        "repeat": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.
+    }
+
+
+def run(pattern: str = None, repeat: int = REPEAT, verbose: bool = True) -> dict:
+    """
+    Runs all of the benchmarks matching the given pattern and returns the results
+    """
+    results = {}
+    for name, suite, method_name in discover(pattern):
+        param_names = list(getattr(suite, "param_names", []))
+        params_lists = getattr(suite, "params", [])
+        if params_lists and not isinstance(params_lists[0], (list, tuple)):  # a single parameter
+            params_lists = [params_lists]
+        for params in itertools.product(*params_lists):
+            label = name
+            if params:
+                label += "({})".format(", ".join("{}={!r}".format(param_name, value) for param_name, value in zip(param_names, params)))
+            try:
+                result = run_benchmark(suite, method_name, params, repeat)
+            except Exception as err:
+                result = {"error": "{}: {}".format(type(err).__name__, err)}
+            result["params"] = dict(zip(param_names, [repr(value) for value in params]))
+            results[label] = result
+            if verbose:
+                if "error" in result:
+                    print("{:<90} failed: {}".format(label, result["error"]), file=sys.stderr)
+                else:
+                    print("{:<90} {:>12.3f} µs".format(label, result["median"] * 1e6), file=sys.stderr)
+    return results
+
+
+def compare(results: dict, previous: dict, threshold: float = 1.2) -> list:
+    """
+    Returns the (name, ratio) of the benchmarks which are slower than `threshold` times their previous median
+    """
+    regressions = []
+    for name, result in results.items():
+        before = previous.get(name)
+        if not before or "median" not in before or "median" not in result or not before["median"]:
+            continue
+        ratio = result["median"] / before["median"]
+        if ratio > threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Runs translatepy's benchmarks")
+    parser.add_argument("--filter", "-f", default=None, help="A regular expression to select the benchmarks to run")
+    parser.add_argument("--repeat", "-r", type=int, default=REPEAT, help="The number of timed samples for each benchmark")
+    parser.add_argument("--output", "-o", default=None, help="The JSON file to write the results to (defaults to the standard output)")
+    parser.add_argument("--compare", "-c", default=None, help="A previous results JSON file to compare the results with")
+    parser.add_argument("--threshold", "-t", type=float, default=1.2, help="The slowdown ratio reported as a regression")
+    args = parser.parse_args(args)
+
+    report = {
+        "version": translatepy.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "results": run(args.filter, args.repeat)
+    }
+
+    output = json.dumps(report, indent=4, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            previous = json.load(file)
+        regressions = compare(report["results"], previous.get("results", {}), args.threshold)
+        for name, ratio in regressions:
+            print("Regression: {} is {:.2f}x slower".format(name, ratio), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
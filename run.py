@@ -1,6 +1,7 @@
 from nasse.utils.args import Args
 
 from translatepy.server import language  # registering the endpoints
+from translatepy.server import metrics  # registering the endpoints
 from translatepy.server import translation  # registering the endpoints
 from translatepy.server.server import app
 
@@ -0,0 +1,118 @@
+"""
+The fake translators and HTTP sessions shared by the tests
+"""
+
+from time import sleep
+
+from translatepy.exceptions import UnsupportedLanguage
+from translatepy.language import Language
+from translatepy.translators.base import BaseTranslator
+
+
+class FakeTranslator(BaseTranslator):
+    def __init__(self, detected_language: str = "en", detect: bool = False, max_text_length: int = None, failing: tuple = (), unsupported: tuple = (), latency: float = 0) -> None:
+        """
+        A translator which uppercases the texts, recording the texts it translated
+
+        Parameters:
+        ----------
+            detected_language : str
+                The language the texts are detected in (alpha-2 code)
+            detect : bool
+                Whether the automatic source languages are detected with `_detect_language` (counted in `detections`)
+            max_text_length : int
+                The maximum length of the translated texts
+            failing : tuple
+                The texts which fail to be translated (ValueError)
+            unsupported : tuple
+                The destination languages which raise UnsupportedLanguage (alpha-2 codes)
+            latency : float
+                The number of seconds waited for each request
+        """
+        self.detected_language = detected_language
+        self.detect = detect
+        if max_text_length is not None:
+            self._max_text_length = max_text_length
+        self.failing = failing
+        self.unsupported = unsupported
+        self.latency = latency
+        self.texts = []
+        self.sources = []
+        self.detections = 0
+
+    def _translate(self, text, destination_language, source_language):
+        if self.latency:
+            sleep(self.latency)
+        return self._answer(text, destination_language, source_language)
+
+    def _answer(self, text, destination_language, source_language):
+        if text in self.failing:
+            raise ValueError("Failed to translate")
+        assert len(text) <= self._max_text_length
+        self.texts.append(text)
+        if destination_language in self.unsupported:
+            raise UnsupportedLanguage("{} is not supported".format(destination_language))
+        if source_language == "auto":
+            source_language = self._detect_language(text) if self.detect else self.detected_language
+        self.sources.append(source_language)
+        return source_language, text.upper()
+
+    def _language(self, text):
+        self.detections += 1
+        return self.detected_language
+
+    def _language_normalize(self, language: Language):
+        return language.alpha2
+
+    def _language_denormalize(self, language_code):
+        return Language(language_code)
+
+
+class BatchFakeTranslator(FakeTranslator):
+    """A FakeTranslator translating multiple texts in the same request"""
+
+    def _translate_batch(self, texts, destination_language, source_language):
+        if self.latency:
+            sleep(self.latency)
+        return [self._answer(text, destination_language, source_language) for text in texts]
+
+
+class FakeResponse():
+    def __init__(self, data, status_code: int = 200) -> None:
+        self.data = data
+        self.status_code = status_code
+
+    @property
+    def content(self) -> bytes:
+        return self.data if isinstance(self.data, bytes) else b""
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise ValueError("HTTP Error {}".format(self.status_code))
+
+
+class FakeSession():
+    def __init__(self, answer=None) -> None:
+        """
+        A session answering the requests with `answer(method, url, **kwargs)`, which returns a FakeResponse or its JSON data
+
+        Every request fails (500) without any `answer` function.
+        """
+        self.answer = answer
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(url)
+        if self.answer is None:
+            return FakeResponse({}, 500)
+        response = self.answer(method, url, **kwargs)
+        return response if isinstance(response, FakeResponse) else FakeResponse(response)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
@@ -0,0 +1,228 @@
+from tests.fakes import FakeResponse, FakeSession
+from translatepy import Translate
+from translatepy.translators.deepl import DeeplTranslate
+from translatepy.translators.google import GoogleTranslateV2
+from translatepy.translators.microsoft import MicrosoftSessionManager, MicrosoftTranslate
+
+
+def answer_google(method, url, params=None, data=None, **kwargs):
+    """Answers the `dict-chrome-ex` endpoint by uppercasing the texts"""
+    if "clients5.google.com" not in url:
+        return FakeResponse(None, 500)
+    texts = data["q"] if method == "POST" else params.get("q", [])
+    texts = [texts] if isinstance(texts, str) else texts
+    if params["sl"] == "auto":
+        return [[text.upper(), "en"] for text in texts]
+    return [text.upper() for text in texts]
+
+
+def test_google_batch():
+    print("[test] --> Testing GoogleTranslateV2 batch translation")
+    session = FakeSession(answer_google)
+    translator = GoogleTranslateV2(request=session)
+    texts = ["hello", "world", "hello", "good morning " * 384]
+    results = translator.translate_batch(texts, "French")
+    assert [result.result for result in results] == [text.upper() for text in texts]
+    assert all(result.source_language.alpha2 == "en" for result in results)
+    # the duplicated text is only sent once and the long text is sent in another request
+    assert len(session.calls) == 2
+
+    # only the endpoint which succeeded is used after the first failure
+    translator.translate("how are you", "French", "English")
+    session.calls.clear()
+    assert translator.translate("how are you doing", "French", "English").result == "HOW ARE YOU DOING"
+    assert len(session.calls) == 1
+
+
+class FakeDeeplJSONRPC():
+    """Answers DeepL's JSONRPC methods by uppercasing the sentences"""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.jobs = []
+        self.languages = []
+
+    def send_jsonrpc(self, method, params):
+        self.calls.append(method)
+        if method == "LMT_handle_jobs":
+            self.jobs.append(len(params["jobs"]))
+            self.languages.append(params["lang"].get("source_lang_user_selected", params["lang"].get("source_lang_computed")))
+        if method == "LMT_split_into_sentences":
+            return {"splitted_texts": [text.split(". ") for text in params["texts"]], "lang": "EN"}
+        return {
+            "source_lang": params["lang"].get("source_lang_user_selected", "EN"),
+            "translations": [{"beams": [{"postprocessed_sentence": job["raw_en_sentence"].upper()}]} for job in params["jobs"]]
+        }
+
+
+def test_deepl_batch():
+    print("[test] --> Testing DeeplTranslate batch translation")
+    translator = DeeplTranslate(request=FakeSession())
+    translator.jsonrpc = FakeDeeplJSONRPC()
+    texts = ["First one. Second one", "Third one", "Fourth one. Fifth one. Sixth one"]
+    results = translator.translate_batch(texts, "French", "English")
+    assert [result.result for result in results] == ["FIRST ONE SECOND ONE", "THIRD ONE", "FOURTH ONE FIFTH ONE SIXTH ONE"]
+    # a single request to split the texts and a single request to translate them
+    assert translator.jsonrpc.calls == ["LMT_split_into_sentences", "LMT_handle_jobs"]
+
+    # a text with too many sentences is splitted across multiple requests
+    translator.jsonrpc = FakeDeeplJSONRPC()
+    long_text = ". ".join("sentence {}".format(index) for index in range(120))
+    results = translator.translate_batch(["Short one", long_text], "French", "English")
+    assert results[0].result == "SHORT ONE"
+    assert results[1].result == " ".join("SENTENCE {}".format(index) for index in range(120))
+    assert translator.jsonrpc.jobs == [50, 50, 21]
+
+
+def test_deepl_mixed_batch():
+    print("[test] --> Testing DeeplTranslate batch translation of texts in different languages")
+    translator = DeeplTranslate(request=FakeSession())
+    translator.jsonrpc = FakeDeeplJSONRPC()
+    translator.clean_cache()
+    texts = ["Καλημέρα σε όλους", "Good morning everyone", "Γεια σου, τι κάνεις;", "Guten Morgen"]
+    results = translator.translate_batch(texts, "French")
+    assert [result.result for result in results] == [text.upper() for text in texts]
+    # the greek texts are detected offline and packed together, the others are translated separately
+    # since DeepL would use the same source language for every text of a request
+    assert translator.jsonrpc.jobs == [1, 1, 2]
+    assert results[0].source_language.id == results[2].source_language.id == "ell"
+    assert sorted(translator.jsonrpc.languages) == ["EL", "EN", "EN"]
+
+
+class FakeMicrosoftSessionManager(MicrosoftSessionManager):
+    """Answers the translate endpoint by uppercasing the texts"""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def send(self, url, data, params={}):
+        self.calls.append(len(data))
+        return [{"detectedLanguage": {"language": "en", "score": 1.0}, "translations": [{"text": element["text"].upper(), "to": params["to"]}]} for element in data]
+
+
+def test_microsoft_batch():
+    print("[test] --> Testing MicrosoftTranslate batch translation")
+    translator = MicrosoftTranslate.__new__(MicrosoftTranslate)
+    translator.session_manager = FakeMicrosoftSessionManager()
+    texts = ["text number {}".format(index) for index in range(250)]
+    results = translator.translate_batch(texts, "French")
+    assert [result.result for result in results] == [text.upper() for text in texts]
+    assert all(result.source_language.alpha2 == "en" for result in results)
+    # no detection request and no more than 100 texts per request
+    assert translator.session_manager.calls == [100, 100, 50]
+
+
+def test_html_batch():
+    print("[test] --> Testing the batched HTML translation")
+    session = FakeSession(answer_google)
+    translator = Translate([GoogleTranslateV2(request=session)])
+    html = "<div><p>Hello</p> world and <a href='/'>hello</a><p>Hello</p></div>"
+    result = translator.translate_html(html, "French", "English")
+    assert result == "<div><p>HELLO</p> WORLD AND <a href=\"/\">HELLO</a><p>HELLO</p></div>"
+    # the identical nodes are only sent once, in a single request
+    assert len(session.calls) == 1
+
+
+def test_html_stream():
+    print("[test] --> Testing the streaming HTML translation")
+    session = FakeSession(answer_google)
+    translator = Translate([GoogleTranslateV2(request=session)])
+    html = "<html><head><script>if (a < b) {}</script></head><body>" + "<p>Hello &amp; welcome</p>\n" * 10 + "<p>Bye</p></body></html>"
+    pieces = list(translator.translate_html_stream(iter([html[:50], html[50:]]), "French", "English", window_size=4))
+    assert "".join(pieces) == html.replace("Hello &amp; welcome", "HELLO &amp; WELCOME").replace("Bye", "BYE")
+    # the translated HTML is yielded window by window
+    assert len(pieces) == 3
+
+
+def test_shared_executor():
+    print("[test] --> Testing the shared thread pool")
+    from concurrent.futures import TimeoutError
+    from threading import Event
+    from time import sleep
+
+    from translatepy.utils.executor import map_bounded
+
+    assert map_bounded(lambda x: x * 2, range(50), limit=4) == [x * 2 for x in range(50)]
+    # nested calls run in the current worker instead of waiting for the pool
+    assert map_bounded(lambda x: sum(map_bounded(lambda y: y, range(x))), range(100)) == [sum(range(x)) for x in range(100)]
+
+    processed = []
+
+    def _slow(x):
+        sleep(0.05)
+        processed.append(x)
+
+    try:
+        map_bounded(_slow, range(100), limit=2, timeout=0.2)
+        assert False, "The timeout did not raise"
+    except TimeoutError:
+        pass
+    sleep(0.2)
+    # the remaining elements are cancelled
+    assert len(processed) < 20
+
+    cancel = Event()
+    cancel.set()
+    try:
+        map_bounded(_slow, range(10), cancel=cancel)
+        assert False, "The cancellation did not raise"
+    except TimeoutError:
+        pass
+
+
+def test_html_filtering():
+    print("[test] --> Testing the HTML nodes filtering")
+    session = FakeSession(answer_google)
+    translator = Translate([GoogleTranslateV2(request=session)])
+    html = '<div><p>Hello</p><p class="notranslate">Keep</p><div translate="no">no <span translate="yes">yes</span></div><pre>x = 1</pre><script>var a</script><img alt="A cat" src="a.png"/><section class="raw">skip</section></div>'
+    expected = '<div><p>HELLO</p><p class="notranslate">Keep</p><div translate="no">no <span translate="yes">YES</span></div><pre>x = 1</pre><script>var a</script><img alt="A CAT" src="a.png"/><section class="raw">skip</section></div>'
+    assert translator.translate_html(html, "French", "English", exclude=["section.raw"], attributes=["alt"]) == expected
+    assert "".join(translator.translate_html_stream(html, "French", "English", exclude=["section.raw"], attributes=["alt"])) == expected.replace('src="a.png"/>', 'src="a.png" />')
+    # the attributes are translated in the same request
+    assert len(session.calls) == 1
+
+
+def test_html_stream_selectors():
+    print("[test] --> Testing the streaming HTML selectors validation")
+    from translatepy.exceptions import ParameterValueError
+    from translatepy.utils.markup import parse_stream_selectors, translate_html_stream
+
+    assert parse_stream_selectors(["div.notes#main", "pre"]) == [("div", ["notes"], ["main"]), ("pre", [], [])]
+    # the unsupported selectors are rejected before streaming
+    try:
+        translate_html_stream("<p>Hello</p>", str.upper, exclude=["div > p"])
+        assert False, "The unsupported selector did not raise"
+    except ParameterValueError:
+        pass
+
+
+def test_html_cancel():
+    print("[test] --> Testing the HTML translation timeout and cancellation")
+    from concurrent.futures import TimeoutError
+    from threading import Event
+    from time import monotonic
+
+    from tests.fakes import BatchFakeTranslator
+
+    # the timeout also applies to the texts translated in batches
+    translator = BatchFakeTranslator(latency=0.5)
+    start = monotonic()
+    try:
+        translator.translate_html("<p>Hello</p><p>world</p>", "French", "English", timeout=0.1)
+        assert False, "The timeout did not raise"
+    except TimeoutError:
+        pass
+    assert monotonic() - start < 0.4
+
+    # the remaining windows are cancelled once the event is set (i.e when the client disconnects)
+    translator = BatchFakeTranslator(latency=0.2)
+    cancel = Event()
+    stream = translator.translate_html_stream("<p>one</p><p>two</p><p>three</p><p>four</p>", "French", "English", window_size=2, cancel=cancel)
+    assert next(stream) == "<p>ONE</p><p>TWO"
+    cancel.set()
+    try:
+        next(stream)
+        assert False, "The cancellation did not raise"
+    except TimeoutError:
+        pass
+    assert translator.texts == ["one", "two"]
@@ -0,0 +1,88 @@
+from io import StringIO
+from json import loads
+from os import remove
+from os.path import exists
+
+from translatepy.exceptions import ParameterError
+from translatepy.utils.bulk import translate_file
+
+
+class Result():
+    def __init__(self, result: str) -> None:
+        self.result = result
+
+
+class UpperTranslator():
+    """A translator uppercasing the texts, which can be interrupted after a number of batches"""
+
+    def __init__(self, interrupt_after: int = None) -> None:
+        self.interrupt_after = interrupt_after
+        self.batches = 0
+
+    def translate_batch(self, texts, destination_language, source_language="auto"):
+        self.batches += 1
+        if self.interrupt_after is not None and self.batches > self.interrupt_after:
+            raise KeyboardInterrupt
+        if "fail" in texts:
+            raise ValueError("The batch failed")
+        return [Result(text.upper()) for text in texts]
+
+    def translate(self, text, destination_language, source_language="auto"):
+        if text == "fail":
+            raise ValueError("The text failed")
+        return Result(text.upper())
+
+
+def test_translate_text_file():
+    print("[test] --> Testing the text files translation")
+    output = StringIO()
+    result = translate_file(UpperTranslator(), StringIO("hello\n\nworld\nfail\nhello\n"), output, "French", batch_size=2, window_size=3)
+    assert output.getvalue() == "HELLO\n\nWORLD\nfail\nHELLO\n"
+    assert result == {"records": 5, "translated": 3, "failed": 1, "resumed": False}
+
+
+def test_translate_csv_and_jsonl():
+    print("[test] --> Testing the CSV and JSON Lines files translation")
+    output = StringIO()
+    translate_file(UpperTranslator(), StringIO('id,text\n1,hello\n2,"good, morning"\n'), output, "French", format="csv", column="text", output_column="translation")
+    assert output.getvalue().splitlines() == ["id,text,translation", "1,hello,HELLO", '2,"good, morning","GOOD, MORNING"']
+
+    output = StringIO()
+    translate_file(UpperTranslator(), StringIO('{"id": 1, "text": "hello"}\n{"id": 2, "text": "world"}\n'), output, "French", format="jsonl")
+    assert [loads(line) for line in output.getvalue().splitlines()] == [{"id": 1, "text": "HELLO"}, {"id": 2, "text": "WORLD"}]
+
+
+def test_translate_file_resume(tmp_path):
+    print("[test] --> Testing the file translation checkpoints")
+    source = tmp_path / "source.txt"
+    source.write_text("".join("line {}\n".format(index) for index in range(10)), encoding="utf-8")
+    output = str(tmp_path / "output.txt")
+    checkpoint = output + ".checkpoint"
+
+    try:
+        translate_file(UpperTranslator(interrupt_after=2), str(source), output, "French", concurrency=1, batch_size=2, window_size=2, checkpoint=checkpoint)
+    except KeyboardInterrupt:
+        pass
+    assert loads(open(checkpoint).read())["records"] == 4
+
+    # the checkpoint can only resume the same job
+    try:
+        translate_file(UpperTranslator(), str(source), output, "German", batch_size=2, checkpoint=checkpoint)
+        assert False, "The checkpoint of another job has been resumed"
+    except ParameterError:
+        pass
+
+    result = translate_file(UpperTranslator(), str(source), output, "French", batch_size=2, checkpoint=checkpoint)
+    assert result["resumed"] and result["records"] == 10
+    assert open(output, encoding="utf-8").read() == "".join("LINE {}\n".format(index) for index in range(10))
+    assert not exists(checkpoint)
+
+    # starting again when the output has been removed
+    try:
+        translate_file(UpperTranslator(interrupt_after=1), str(source), output, "French", concurrency=1, batch_size=2, window_size=2, checkpoint=checkpoint)
+    except KeyboardInterrupt:
+        pass
+    remove(output)
+    result = translate_file(UpperTranslator(), str(source), output, "French", batch_size=2, checkpoint=checkpoint)
+    assert not result["resumed"] and result["records"] == 10
+    assert open(output, encoding="utf-8").read() == "".join("LINE {}\n".format(index) for index in range(10))
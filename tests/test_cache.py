@@ -0,0 +1,95 @@
+from io import StringIO
+
+from tests.fakes import FakeTranslator
+from translatepy import Translate
+from translatepy.exceptions import UnsupportedLanguage
+from translatepy.utils import lru_cacher
+from translatepy.utils.lru_cacher import cache_key
+
+
+def test_cache_export_import():
+    print("[test] --> Testing the caches export and import")
+    service = FakeTranslator(failing=("fail",))
+    translator = Translate([service])
+    service.clean_cache()
+    assert translator.warm_cache(["hello", "world", "hello", "fail", " "], "French", batch_size=1) == (2, 1)
+
+    file = StringIO()
+    assert translator.export_cache(file) >= 2
+    service.clean_cache()
+    file.seek(0)
+    assert translator.import_cache(file) >= 2
+
+    service.texts.clear()
+    assert translator.translate("hello", "French").result == "HELLO"
+    assert service.texts == []
+
+
+def test_failures_cache():
+    print("[test] --> Testing the known failures cache")
+    failing, service = FakeTranslator(unsupported=("ja",)), FakeTranslator()
+    translator = Translate([failing, service])
+    failing.clean_cache()
+    assert translator.translate("good morning", "Japanese").result == "GOOD MORNING"
+    assert translator.translate("good evening", "Japanese").result == "GOOD EVENING"
+    assert failing.texts == ["good morning"]  # skipped the second time
+    assert translator.translate("good evening", "French").result == "GOOD EVENING"
+    assert failing.texts == ["good morning", "good evening"]
+
+    translator = Translate([failing, service], failures_ttl=None)
+    translator.translate("good night", "Japanese")
+    assert failing.texts[-1] == "good night"
+
+
+class SpeakingTranslator(FakeTranslator):
+    """A translator which can't speak Japanese, and doesn't have any male French voice"""
+
+    def _text_to_speech(self, text, speed, gender, source_language):
+        self.texts.append(text)
+        if source_language == "ja" or (source_language == "fr" and gender == "male"):
+            raise UnsupportedLanguage("{} ({}) is not supported".format(source_language, gender))
+        return source_language, b"audio"
+
+
+def test_text_to_speech_failures():
+    print("[test] --> Testing the known failures of the text to speech")
+    service = SpeakingTranslator()
+    translator = Translate([service])
+    errors = []
+    for _ in range(2):
+        try:
+            translator.text_to_speech("konnichiwa", source_language="Japanese")
+            assert False, "The unsupported language did not raise"
+        except Exception as exception:
+            errors.append(exception.__cause__)
+    assert service.texts == ["konnichiwa"]  # skipped the second time
+    # the skipped call raises a new exception
+    assert isinstance(errors[1], UnsupportedLanguage) and errors[1] is not errors[0]
+    assert str(errors[1]) == str(errors[0])
+    # the other languages are still spoken
+    assert translator.text_to_speech("bonjour", source_language="French").result == b"audio"
+    # as well as the other voices of the language
+    try:
+        translator.text_to_speech("salut", gender="male", source_language="French")
+        assert False, "The unsupported voice did not raise"
+    except Exception:
+        pass
+    assert translator.text_to_speech("salut", gender="female", source_language="French").result == b"audio"
+
+
+def test_cache_key():
+    print("[test] --> Testing the cache keys")
+    long_text = "good morning " * 1000
+    assert cache_key(long_text, "fr", "en") == cache_key(long_text, "fr", "en")
+    assert len(cache_key(long_text, "fr", "en")) == len(cache_key("hi"))
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+    assert cache_key("hello", "fr", "en") != cache_key("hello", "en", "fr")
+
+    # without BLAKE2 (Python < 3.6)
+    blake2b = lru_cacher.blake2b
+    lru_cacher.blake2b = None
+    try:
+        assert len(cache_key(long_text, "fr", "en")) == len(cache_key("hi")) == 2 * lru_cacher.KEY_DIGEST_SIZE
+        assert cache_key("ab", "c") != cache_key("a", "bc")
+    finally:
+        lru_cacher.blake2b = blake2b
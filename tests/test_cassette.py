@@ -0,0 +1,121 @@
+from io import StringIO
+from json import dumps
+
+from translatepy.exceptions import RequestNotRecorded
+from translatepy.translators import deepl
+from translatepy.translators.deepl import DeeplTranslate
+from translatepy.translators.mymemory import MyMemoryTranslate
+from translatepy.utils.cassette import Cassette, _build_response
+from translatepy.utils.request import Request
+
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+
+
+def record_mymemory(cassette: Cassette, text: str, translation: str):
+    """Records a MyMemory translation without making any request"""
+    response = _build_response({
+        "status_code": 200,
+        "url": MYMEMORY_URL,
+        "headers": {"Content-Type": "application/json"},
+        "text": dumps({"matches": [{"source": "en-GB", "translation": translation}]})
+    })
+    cassette.record("GET", MYMEMORY_URL, {"params": {"q": text, "langpair": "en|fr"}}, response)
+
+
+def test_cassette_replay():
+    print("[test] --> Testing the cassettes replay")
+    cassette = Cassette(mode="record")
+    record_mymemory(cassette, "Hello", "Bonjour")
+    file = StringIO()
+    assert cassette.save(file) == 1
+
+    file.seek(0)
+    cassette = Cassette(mode="replay")
+    assert cassette.load(file) == 1
+    translator = MyMemoryTranslate(request=Request(cassette=cassette))
+    translator.clean_cache()
+    result = translator.translate("Hello", "French", "English")
+    assert result.result == "Bonjour"
+    assert result.source_language.id == "eng"
+
+    try:
+        translator.translate("Good night", "French", "English")
+    except RequestNotRecorded:
+        pass
+    else:
+        raise AssertionError("The request should not have been made")
+
+
+def test_cassette_errors_injection():
+    print("[test] --> Testing the cassettes errors injection")
+    statuses = []
+    for _ in range(2):
+        cassette = Cassette(mode="replay", error_rate=0.5, seed=42)
+        record_mymemory(cassette, "Hello", "Bonjour")
+        request = Request(cache_duration=0, cassette=cassette)
+        statuses.append([
+            request.get(MYMEMORY_URL, params={"langpair": "en|fr", "q": "Hello"}).status_code
+            for _ in range(20)
+        ])
+    assert statuses[0] == statuses[1]  # reproducible with the same seed
+    assert set(statuses[0]) == {200, 503}
+
+
+def answer_deepl(method, url, json=None, **kwargs):
+    """Answers DeepL's JSON-RPC methods by uppercasing the sentences"""
+    if json["method"] == "getClientState":
+        result = {"id": json["id"]}
+    elif json["method"] == "LMT_split_into_sentences":
+        result = {"result": {"splitted_texts": [[text] for text in json["params"]["texts"]], "lang": "EN"}}
+    else:
+        result = {"result": {
+            "source_lang": "EN",
+            "translations": [{"beams": [{"postprocessed_sentence": job["raw_en_sentence"].upper()}]} for job in json["params"]["jobs"]]
+        }}
+    return _build_response({"status_code": 200, "url": url, "headers": {"Content-Type": "application/json"}, "text": dumps(result)})
+
+
+def not_recorded(method, url, **kwargs):
+    raise AssertionError("{} {} should have been replayed".format(method, url))
+
+
+def test_cassette_deepl_replay(monkeypatch):
+    print("[test] --> Testing the cassettes replay of DeepL's JSON-RPC requests")
+    monkeypatch.setattr(deepl, "sleep", lambda seconds: None)
+    cassette = Cassette(mode="record")
+    request = Request(cache_duration=0, cassette=cassette)
+    request._perform = answer_deepl
+    translator = DeeplTranslate(request=request)
+    translator.clean_cache()
+    assert translator.translate("Hello world", "French", "English").result == "HELLO WORLD"
+    file = StringIO()
+    assert cassette.save(file) == 3
+
+    # the requests ids and timestamps are different when replaying
+    file.seek(0)
+    monkeypatch.setattr(deepl, "time", lambda: 2000000000.0)
+    cassette = Cassette(mode="replay")
+    cassette.load(file)
+    request = Request(cache_duration=0, cassette=cassette)
+    request._perform = not_recorded
+    translator = DeeplTranslate(request=request)
+    translator.jsonrpc.id_number += 1000
+    translator.clean_cache()
+    assert translator.translate("Hello world", "French", "English").result == "HELLO WORLD"
+
+
+def test_cassette_google_replay():
+    print("[test] --> Testing the cassettes replay of Google's tokenized requests")
+    url = "https://translate.google.fr/translate_tts"
+    for normalizers, replayed in [(None, True), ({}, False)]:
+        cassette = Cassette(mode="replay", normalizers=normalizers)
+        response = _build_response({"status_code": 200, "url": url, "text": "audio"})
+        cassette.record("GET", url, {"params": {"q": "Hello", "tl": "en", "tk": "123456.654321"}}, response)
+        request = Request(cache_duration=0, cassette=cassette)
+        try:
+            # the token changes over time
+            assert request.get(url, params={"q": "Hello", "tl": "en", "tk": "987654.456789"}).content == b"audio"
+        except RequestNotRecorded:
+            assert not replayed
+        else:
+            assert replayed
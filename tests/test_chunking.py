@@ -0,0 +1,29 @@
+from tests.fakes import FakeTranslator
+from translatepy.utils.chunking import split_text
+
+
+def test_split_text():
+    print("[test] --> Testing the long texts splitting")
+    text = "First sentence. Second sentence!\n\nA new paragraph: with a clause? " + "word " * 30 + "a" * 120
+    chunks = split_text(text, 50)
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert chunks[0] == "First sentence. Second sentence!\n\n"
+    assert split_text("short text", 50) == ["short text"]
+
+
+def test_translate_chunks():
+    print("[test] --> Testing the translation of long texts")
+    translator = FakeTranslator(max_text_length=50)
+    text = "Hello world. " * 10 + "\n\nThis is the end of the text."
+    result = translator.translate(text, "French", "English")
+    assert result.result == text.upper()
+    assert result.source == text
+    # every chunk has been translated once, without its surrounding whitespaces
+    assert len(translator.texts) == len(set(translator.texts)) > 1
+    assert all(chunk == chunk.strip() for chunk in translator.texts)
+    # the chunks are cached separately
+    chunk = translator.texts[0]
+    translator.texts.clear()
+    assert translator.translate(chunk, "French", "English").result == chunk.upper()
+    assert translator.texts == []
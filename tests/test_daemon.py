@@ -0,0 +1,57 @@
+from os import stat
+from os.path import exists
+from threading import Thread
+from time import sleep
+
+from translatepy import Translate
+from translatepy.daemon import Daemon, DaemonClient
+from translatepy.server.mock import MockServer
+from translatepy.translators.mymemory import MyMemoryTranslate
+
+
+def test_daemon(tmp_path):
+    print("[test] --> Testing the daemon")
+    path = str(tmp_path / "translatepy.sock")
+    client = DaemonClient(path, timeout=10)
+    assert not client.available()
+
+    with MockServer() as server:
+        daemon = Daemon(Translate([MyMemoryTranslate(request=server.request())]), path)
+        thread = Thread(target=daemon.serve, daemon=True)
+        thread.start()
+        for _ in range(100):
+            if client.available():
+                break
+            sleep(0.05)
+        assert client.available()
+        # only the current user can connect to the daemon
+        assert stat(path).st_mode & 0o777 == 0o600
+
+        assert client.request("ping")["success"]
+        result = client.request("translate", {"text": "Good morning", "destination_language": "French", "source_language": "English"})
+        assert result["success"] and result["service"] == "MyMemory" and result["destinationLanguage"] == "fra"
+        result = client.request("translate", {"text": "Good morning", "destination_language": "Frnch"})
+        assert not result["success"] and result["exception"] == "UnknownLanguage" and result["guessedLanguage"] == "french"
+        assert client.request("unknown")["success"] is False
+
+        assert client.request("shutdown")["success"]
+        thread.join(10)
+    assert not thread.is_alive()
+    assert not exists(path)
+
+
+def test_daemon_translators():
+    print("[test] --> Testing the daemon translators")
+    from translatepy.__main__ import DAEMON_ACTIONS
+    from translatepy.daemon import ACTIONS, TRANSLATORS_CACHE_SIZE
+
+    # the command line interface knows the daemon actions without importing the daemon
+    assert DAEMON_ACTIONS == set(ACTIONS)
+
+    daemon = Daemon(Translate([MyMemoryTranslate]))
+    first = daemon._get_translator("MyMemory")
+    for index in range(TRANSLATORS_CACHE_SIZE):
+        daemon._get_translator("MyMemory" + ",MyMemory" * (index + 1))
+    # the least recently used translators are dropped
+    assert len(daemon._translators) == TRANSLATORS_CACHE_SIZE
+    assert daemon._get_translator("MyMemory") is not first
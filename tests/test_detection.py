@@ -0,0 +1,100 @@
+from tests.fakes import FakeTranslator
+from translatepy import Translate
+from translatepy.exceptions import TranslationError
+from translatepy.translators.local import LocalTranslate
+from translatepy.utils.detection import CONFIDENCE_THRESHOLD, detect_language
+
+
+class FailingTranslator(FakeTranslator):
+    """A translator which fails after detecting the language"""
+
+    def _translate(self, text, destination_language, source_language):
+        super()._translate(text, destination_language, source_language)
+        raise TranslationError("Failed to translate")
+
+
+def test_shared_detection():
+    print("[test] --> Testing the shared language detection")
+    failing, working = FailingTranslator(detected_language="ja", detect=True), FakeTranslator(detected_language="ja", detect=True)
+    translator = Translate([failing, working])
+    result = translator.translate("Minna-san, ohayou gozaimasu", "French")
+    assert result.result == "Minna-san, ohayou gozaimasu".upper()
+    assert result.source_language.id == "jpn"
+    # the language detected by the first translator is reused by the second one
+    assert failing.detections == 1
+    assert working.detections == 0
+    assert working.sources == ["ja"]
+    # and by the language detection
+    assert translator.language("Minna-san, ohayou gozaimasu").result.id == "jpn"
+    assert failing.detections == 1
+
+
+def test_local_detection():
+    print("[test] --> Testing the offline language detection")
+    for text, language in [
+        ("こんにちは、元気ですか", "jpn"),
+        ("你好，你今天怎么样？我很好，谢谢。", "zho"),
+        ("안녕하세요", "kor"),
+        ("Γεια σου, τι κάνεις σήμερα;", "ell"),
+        ("สวัสดีครับ", "tha")
+    ]:
+        language_id, confidence = detect_language(text)
+        assert language_id == language
+        assert confidence >= CONFIDENCE_THRESHOLD
+    # the latin script is shared by too many languages to be confident
+    assert detect_language("Hello, how are you doing today?")[1] < CONFIDENCE_THRESHOLD
+    # as well as the scripts shared by a few languages (kanji-only Japanese, Assamese...)
+    assert detect_language("東京都庁舎展望室入場券")[1] < CONFIDENCE_THRESHOLD
+    assert detect_language("আমি ভাত খাই")[1] < CONFIDENCE_THRESHOLD
+    assert detect_language("1234 !?") == (None, 0.)
+    assert LocalTranslate().language("안녕하세요").result.id == "kor"
+
+
+def test_local_detection_shared_scripts():
+    print("[test] --> Testing the offline language detection of the scripts shared by several languages")
+    # the detection is only based on the scripts: latin texts are left to the services
+    for text in [
+        "Guten Morgen, wie geht es dir?",
+        "Ich bin ein Berliner",
+        "Ciao, come stai?",
+        "Bonjour tout le monde",
+        "Buenos días a todos",
+        "Good morning everyone"
+    ]:
+        assert detect_language(text) == (None, 0.)
+    # while the other shared scripts only give their most common language, with a low confidence
+    for text, language in [
+        ("Доброе утро, как дела?", "rus"),
+        ("Добрий ранок, як справи?", "rus"),  # Ukrainian
+        ("صباح الخير", "ara"),
+        ("सुप्रभात, आप कैसे हैं?", "hin")
+    ]:
+        language_id, confidence = detect_language(text)
+        assert language_id == language
+        assert confidence < CONFIDENCE_THRESHOLD
+
+
+def test_local_source_resolution():
+    print("[test] --> Testing the offline resolution of automatic source languages")
+    working = FakeTranslator(detected_language="ja", detect=True)
+    translator = Translate([working])
+    assert translator.language("Καλημέρα σε όλους").result.id == "ell"
+    result = translator.translate("Καλημέρα σε όλους", "French")
+    assert result.source_language.id == "ell"
+    assert working.sources == ["el"]
+    assert working.detections == 0
+    # low confidence detections fall back on the services
+    assert translator.language("Good morning everyone").result.id == "jpn"
+    assert working.detections == 1
+    assert translator.translate("Ich bin ein Berliner", "French").source_language.id == "jpn"
+    assert working.detections == 2
+
+
+def test_explicit_source_not_remembered():
+    print("[test] --> Testing that explicit source languages are not remembered as detections")
+    working = FakeTranslator(detected_language="ja", detect=True)
+    translator = Translate([working])
+    working.clean_cache()
+    assert translator.translate("Bonjour le monde", "English", "Korean").source_language.id == "kor"
+    assert translator.language("Bonjour le monde").result.id == "jpn"
+    assert working.detections == 1
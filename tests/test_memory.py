@@ -0,0 +1,42 @@
+from tests.fakes import FakeTranslator
+from translatepy import Translate
+from translatepy.memory import TranslationMemory
+from translatepy.models import MemoryTranslationResult
+
+
+def test_exact_memory():
+    print("[test] --> Testing the translation memory exact matches")
+    memory = TranslationMemory()
+    memory.add("Hello", "Bonjour", "French", "English")
+    result = memory.lookup("Hello", "fra")
+    assert isinstance(result, MemoryTranslationResult)
+    assert result.result == "Bonjour" and result.source_language.id == "eng" and not result.fuzzy
+    assert memory.lookup("Hello", "French", "Japanese") is None
+    assert memory.lookup("Hello", "German") is None
+    # fuzzy matches are disabled by default
+    assert memory.lookup("Hello!", "French") is None
+
+
+def test_fuzzy_memory():
+    print("[test] --> Testing the translation memory fuzzy matches")
+    memory = TranslationMemory(fuzzy_threshold=0.8)
+    memory.add("Red cotton shirt with long sleeves, size M", "Chemise rouge en coton à manches longues, taille M", "French", "English")
+    memory.add("Blue jeans", "Jean bleu", "French", "English")
+    result = memory.lookup("Red cotton shirt with long sleeves, size L", "French")
+    assert result.fuzzy and 0.8 <= result.similarity < 1
+    assert result.matched == "Red cotton shirt with long sleeves, size M"
+    assert memory.lookup("Green wool hat", "French") is None
+
+
+def test_translate_memory():
+    print("[test] --> Testing the translation memory with Translate")
+    service = FakeTranslator()
+    translator = Translate([service], memory=TranslationMemory())
+    assert translator.translate("good morning", "French").result == "GOOD MORNING"
+    # the service cache is bypassed to make sure the memory is used
+    service.clean_cache()
+    assert isinstance(translator.translate("good morning", "French"), MemoryTranslationResult)
+    results = translator.translate_batch(["good morning", "good evening"], "French")
+    assert [result.result for result in results] == ["GOOD MORNING", "GOOD EVENING"]
+    assert service.texts == ["good morning", "good evening"]
+    assert len(translator.memory) == 2
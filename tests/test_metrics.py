@@ -0,0 +1,90 @@
+from io import StringIO
+from json import loads
+
+from translatepy import Translate
+from translatepy.server.mock import MockServer
+from translatepy.translators.mymemory import MyMemoryTranslate
+from translatepy.utils.executor import executor_stats, map_bounded
+from translatepy.utils.metrics import JSONExporter, PrometheusWriter, metrics, prometheus_text
+
+
+def test_metrics():
+    print("[test] --> Testing the metrics")
+    with MockServer() as server:
+        service = MyMemoryTranslate(request=server.request())
+        translator = Translate([service])
+        translator.clean_cache()
+        metrics.reset()
+        translator.translate("Good morning", "French", "English")
+        translator.translate("Good morning", "French", "English")
+        try:
+            service.translate("Good morning", "Unknown Language", "English")
+        except Exception:
+            pass
+
+    stats = translator.stats(reset=True)
+    translate = stats["services"]["MyMemory"]["methods"]["translate"]
+    assert translate["outcomes"]["success"] == 2
+    assert translate["outcomes"]["UnknownLanguage"] == 1
+    assert translate["latency"]["count"] == 3
+    assert translate["latency"]["buckets"]["+Inf"] == 3
+    requests = stats["services"]["MyMemory"]["requests"]
+    assert requests["count"] == 1 and requests["status"] == {"200": 1}
+    assert requests["bytes_in"] > 0
+    assert stats["caches"]["translations"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+    assert translator.stats()["services"] == {}
+
+    file = StringIO()
+    exporter = JSONExporter(file)
+    metrics.add_exporter(exporter)
+    try:
+        metrics.export()
+    finally:
+        metrics.remove_exporter(exporter)
+    assert loads(file.getvalue())["services"] == {}
+
+
+def test_prometheus_text():
+    print("[test] --> Testing the Prometheus text format")
+    snapshot = {
+        "time": 0, "since": 0,
+        "services": {
+            "Google": {
+                "methods": {"translate": {"latency": {"buckets": {"0.1": 1, "+Inf": 2}, "count": 2, "sum": 1.5, "mean": 0.75}, "outcomes": {"success": 1, "TranslatepyException": 1}}},
+                "requests": {"latency": {"buckets": {"0.1": 1, "+Inf": 1}, "count": 1, "sum": 0.05, "mean": 0.05}, "count": 1, "status": {"429": 1}, "errors": {}, "bytes_in": 10, "bytes_out": 20}
+            }
+        },
+        "caches": {"translations": {"hits": 3, "misses": 1, "hit_ratio": 0.75}}
+    }
+    writer = PrometheusWriter()
+    writer.gauge("server_in_flight_requests", "The number of requests", 2)
+    writer.counter("server_requests_total", "The number of requests", 1, {"endpoint": '/language/"details"'})
+    text = prometheus_text(snapshot, writer)
+    lines = text.splitlines()
+    assert text.endswith("\n")
+    assert "# TYPE translatepy_server_in_flight_requests gauge" in lines
+    assert "translatepy_server_in_flight_requests 2" in lines
+    assert 'translatepy_server_requests_total{endpoint="/language/\\"details\\""} 1' in lines
+    assert "# TYPE translatepy_service_call_duration_seconds histogram" in lines
+    assert 'translatepy_service_call_duration_seconds_bucket{service="Google",method="translate",le="+Inf"} 2' in lines
+    assert 'translatepy_service_call_duration_seconds_sum{service="Google",method="translate"} 1.5' in lines
+    assert 'translatepy_service_calls_total{service="Google",method="translate",outcome="TranslatepyException"} 1' in lines
+    assert 'translatepy_upstream_requests_total{service="Google",status="429"} 1' in lines
+    assert 'translatepy_cache_hit_ratio{cache="translations"} 0.75' in lines
+    # each metric family is declared once
+    assert len([line for line in lines if line.startswith("# TYPE translatepy_service_calls_total ")]) == 1
+
+
+def test_executor_stats():
+    print("[test] --> Testing the thread pool stats")
+    busy = []
+
+    def work(element):
+        busy.append(executor_stats()["active"])
+        return element
+
+    assert map_bounded(work, range(8), limit=4) == list(range(8))
+    assert 1 <= max(busy) <= 4
+    stats = executor_stats()
+    assert stats["active"] == 0 and stats["queued"] == 0
+    assert stats["threads"] <= stats["max_workers"]
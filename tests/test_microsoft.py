@@ -0,0 +1,102 @@
+import gc
+import json
+
+from tests.fakes import FakeSession
+from translatepy.translators import microsoft
+from translatepy.translators.microsoft import MicrosoftSessionManager
+
+
+class FakeClock():
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class FakeTimer():
+    """A timer which is never started, the tests call its function themselves"""
+
+    timers = []
+
+    def __init__(self, delay, function) -> None:
+        self.delay = delay
+        self.function = function
+        self.cancelled = False
+        FakeTimer.timers.append(self)
+
+    def start(self) -> None:
+        pass
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class FakeBingSession():
+    """Answers the token requests"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failing = False
+
+    def send(self, url, data):
+        self.calls += 1
+        if self.failing:
+            return {"statusCode": 500}
+        return {"token": "token{}".format(self.calls), "region": "westeurope", "expiryDurationInMS": 600000}
+
+
+def answer(method, url, **kwargs):
+    return [{"Locale": "fr-FR", "Gender": "Female", "ShortName": "fr-FR-DeniseNeural"}]
+
+
+def test_token_refresh(monkeypatch, tmp_path):
+    print("[test] --> Testing the Microsoft token background refresh")
+    clock = FakeClock()
+    monkeypatch.setattr(microsoft, "time", clock)
+    monkeypatch.setattr(microsoft, "Timer", FakeTimer)
+    monkeypatch.setattr(MicrosoftSessionManager, "_voices_cache", {})
+    FakeTimer.timers.clear()
+
+    (tmp_path / ".bing_translatepy").write_text(json.dumps({"id": "IG", "iid": "IID", "key": "key", "token": "token"}))
+    (tmp_path / ".microsoft_translatepy").write_text(json.dumps({"token": "stored", "region": "westeurope", "token_expiries": clock.now + 600}))
+    session = FakeSession(answer)
+    session.session_directory = str(tmp_path)
+    bing = FakeBingSession()
+
+    # the stored token is still valid
+    first, second = MicrosoftSessionManager(session), MicrosoftSessionManager(session)
+    first.bing_session = second.bing_session = bing
+    assert first._token == second._token == "stored"
+    assert bing.calls == 0
+    # a single refresh is scheduled for both sessions, shortly before the token expires
+    refresher = first._refresher
+    assert second._refresher is refresher
+    timers = [timer for timer in FakeTimer.timers if not timer.cancelled]
+    assert len(timers) == 1
+    assert timers[0].delay == 600 - microsoft.TOKEN_REFRESH_MARGIN
+
+    # the failed refreshes are retried with a backoff
+    bing.failing = True
+    clock.now += 540
+    refresher.refresh()
+    assert FakeTimer.timers[-1].delay == microsoft.TOKEN_REFRESH_RETRY_DELAY
+    refresher.refresh()
+    assert FakeTimer.timers[-1].delay == microsoft.TOKEN_REFRESH_RETRY_DELAY * 2
+    assert first._token == "stored"
+
+    # the voices endpoint doesn't use an expired token
+    bing.failing = False
+    clock.now += 100
+    assert first.voices() == {("fr-FR", "Female"): "fr-FR-DeniseNeural"}
+    assert first._token == second._token == "token3"
+    assert refresher.failures == 0
+    assert FakeTimer.timers[-1].delay == 599 - microsoft.TOKEN_REFRESH_MARGIN
+
+    # the refresher doesn't keep the sessions alive
+    del first, second
+    gc.collect()
+    assert len(refresher.managers) == 0
+    refresher.refresh()
+    assert bing.calls == 3
+    assert refresher.path not in microsoft._refreshers
@@ -0,0 +1,42 @@
+from os import listdir
+from os.path import dirname, exists, join
+
+from translatepy import Translate
+from translatepy.server.mock import MockServer
+from translatepy.translators import microsoft
+from translatepy.translators.microsoft import MicrosoftTranslate
+from translatepy.translators.mymemory import MyMemoryTranslate
+from translatepy.translators.yandex import YandexTranslate
+
+
+def test_mock_server():
+    print("[test] --> Testing the mock server")
+    package_files = set(listdir(dirname(microsoft.__file__)))
+    with MockServer() as server:
+        translator = Translate([YandexTranslate(request=server.request()), MicrosoftTranslate(request=server.request())])
+        # the mock session is kept apart from the real one
+        assert exists(join(server.session_directory, ".microsoft_translatepy"))
+        translator.clean_cache()
+        assert translator.translate("こんにちは、元気ですか", "French").result == "[fr] こんにちは、元気ですか"
+        assert translator.translate("こんにちは、元気ですか", "French").source_language.id == "jpn"
+        results = translator.translate_batch(["Good morning", "Good night"], "German", "English")
+        assert [result.result for result in results] == ["[de] Good morning", "[de] Good night"]
+        assert server.stats["translate.yandex.net"]["requests"] >= 1
+    assert set(listdir(dirname(microsoft.__file__))) == package_files
+
+
+def test_mock_rate_limit():
+    print("[test] --> Testing the mock server rate limit")
+    with MockServer(rate_limit=1, burst=2) as server:
+        service = MyMemoryTranslate(request=server.request(cache_duration=0))
+        service.clean_cache()
+        translator = Translate([service])
+        for text in ["one", "two"]:
+            assert translator.translate(text, "French", "English").result == "[fr] " + text
+        try:
+            translator.translate("three", "French", "English")
+        except Exception:
+            pass
+        else:
+            raise AssertionError("The third request should have been rate limited")
+        assert server.stats["api.mymemory.translated.net"]["rate_limited"] == 1
@@ -0,0 +1,45 @@
+from json import loads
+
+from translatepy import Language, Translate
+from translatepy.server.mock import MockServer
+from translatepy.translators.mymemory import MyMemoryTranslate
+from translatepy.utils.profiler import Profiler, categorize
+
+
+def test_categorize():
+    print("[test] --> Testing the profiler categories")
+    assert categorize(["/usr/lib/python3/socket.py"], waiting=True) == "wait.network"
+    assert categorize(["/usr/lib/python3/threading.py"], waiting=True) == "wait.other"
+    assert categorize(["/site-packages/translatepy/language.py"], waiting=False) == "cpu.language"
+    assert categorize(["/site-packages/bs4/__init__.py", "/usr/lib/python3/html/parser.py"], waiting=False) == "cpu.bs4"
+    assert categorize(["/usr/lib/python3/json/decoder.py"], waiting=False) == "cpu.parsing"
+
+
+def test_profiler(tmp_path):
+    print("[test] --> Testing the sampling profiler")
+    with MockServer(latency=0.2) as server:
+        translator = Translate([MyMemoryTranslate(request=server.request())])
+        translator.clean_cache()
+        with Profiler(interval=0.002) as profiler:
+            translator.translate("Good morning", "French", "English")
+
+    report = profiler.report()
+    assert profiler.samples > 0
+    assert report["wait_time"] > 0 and report["categories"].get("wait.network", 0) > 0
+    assert any("translate.py:translate" in stack for stack in profiler.stacks)
+
+    files = profiler.write(str(tmp_path / "profile"))
+    assert loads(open(files[0]).read())["samples"] == profiler.samples
+    stack, count = open(files[1]).readline().rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+
+def test_cprofile(tmp_path):
+    print("[test] --> Testing the cProfile profiler")
+    with Profiler(mode="cprofile") as profiler:
+        for name in ("Franch", "Englsh", "Japanse"):
+            Language(name, threshold=50)
+
+    report = profiler.report()
+    assert report["categories"]["cpu.language"] > 0
+    assert [file.rsplit(".", 1)[-1] for file in profiler.write(str(tmp_path / "profile"))] == ["json", "pstats"]
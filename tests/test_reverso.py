@@ -0,0 +1,70 @@
+from tests.fakes import FakeResponse, FakeSession
+from translatepy.language import Language
+from translatepy.translators import reverso
+from translatepy.translators.reverso import REVERSO_LANGUAGES, TRANSLATEPY_LANGUAGES, ReversoTranslate
+
+VOICES = {"Voices": [
+    {"Language": "Japanese", "Gender": "F", "Name": "Sakura22k"},
+    {"Language": "US English", "Gender": "F", "Name": "Heather22k"},
+    {"Language": "US English", "Gender": "M", "Name": "Ryan22k"}
+]}
+
+
+def answer(method, url, **kwargs):
+    if "GetAvailableVoices" in url:
+        return VOICES
+    if "GetVoiceStream" in url:
+        return FakeResponse(b"audio")
+    return FakeResponse({}, 500)
+
+
+def test_reverso_languages():
+    print("[test] --> Testing the Reverso language codes")
+    translator = ReversoTranslate(FakeSession())
+    assert len(TRANSLATEPY_LANGUAGES) == len(REVERSO_LANGUAGES)
+    assert translator._supported_languages == {"auto"} | set(REVERSO_LANGUAGES)
+    for code, language_id in REVERSO_LANGUAGES.items():
+        language = translator._language_denormalize(code)
+        assert language.id == language_id
+        assert translator._language_normalize(language) == code
+        assert translator._language_normalize(Language(language_id)) == code
+
+
+def test_reverso_voices(monkeypatch):
+    print("[test] --> Testing the Reverso voices cache")
+    now = [1000.0]
+    monkeypatch.setattr(reverso, "time", lambda: now[0])
+    monkeypatch.setattr(ReversoTranslate, "_voices_cache", None)
+    session = FakeSession(answer)
+    translator = ReversoTranslate(session)
+
+    voices = translator._voices()
+    assert voices[("us english", "M")] == "Ryan22k"
+    assert ReversoTranslate(session)._voices() is voices
+    assert len(session.calls) == 1
+
+    now[0] += reverso.VOICES_CACHE_DURATION
+    translator._voices()
+    assert len(session.calls) == 2
+
+
+def test_reverso_text_to_speech(monkeypatch):
+    print("[test] --> Testing the Reverso text to speech source language")
+    monkeypatch.setattr(ReversoTranslate, "_voices_cache", None)
+    session = FakeSession(answer)
+    translator = ReversoTranslate(session)
+
+    # detected offline
+    result = translator.text_to_speech("こんにちは、元気ですか")
+    assert result.result == b"audio"
+    assert result.source_language.id == "jpn"
+    assert "voiceName=Sakura22k" in session.calls[-1]
+
+    # already detected by another translator
+    translator._remember_language("Good morning everyone", "eng")
+    result = translator.text_to_speech("Good morning everyone", gender="male")
+    assert result.source_language.id == "eng"
+    assert "voiceName=Ryan22k" in session.calls[-1]
+
+    # no remote language detection
+    assert not any("api.reverso.net" in url for url in session.calls)
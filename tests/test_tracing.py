@@ -0,0 +1,74 @@
+from tests.fakes import FakeTranslator
+from translatepy import Translate
+from translatepy.server.mock import MockServer
+from translatepy.translators.mymemory import MyMemoryTranslate
+from translatepy.utils.tracing import tracer
+
+
+def test_tracing():
+    print("[test] --> Testing the tracing hooks")
+    started, ended = [], []
+    hook = tracer.add_hook(on_start=started.append, on_end=ended.append)
+    try:
+        with MockServer() as server:
+            translator = Translate([MyMemoryTranslate(request=server.request())])
+            translator.clean_cache()
+            translator.translate("Good morning", "French", "English")
+            first = list(ended)
+            translator.translate("Good morning", "French", "English")
+    finally:
+        tracer.remove_hook(hook)
+
+    assert len(started) == len(ended)
+    spans = {span.name: span for span in first}
+    root = spans["Translate.translate"]
+    assert root.parent is None and root.exception is None
+    assert root.attributes == {"text_length": 12, "destination_language": "French", "source_language": "English"}
+    assert spans["translator.translate"].attributes["destination_language"] == "fra"
+    assert spans["Translate.attempt"].parent is root
+    service = spans["translator.translate"]
+    assert service.parent is spans["Translate.attempt"]
+    assert service.attributes["service"] == "MyMemory"
+    request = spans["http.request"]
+    assert request.attributes["http.status_code"] == 200
+    assert request.parent.depth >= service.depth
+    assert spans["response.parse"].duration >= 0
+    assert root.duration >= service.duration >= request.duration
+
+    lookups = [span for span in ended[len(first):] if span.name == "cache.lookup" and span.attributes["cache"] == "translations"]
+    assert lookups and lookups[0].attributes["cache.hit"]
+    assert not any(span.name == "http.request" for span in ended[len(first):])
+    assert not tracer.enabled
+
+
+def test_fast_mode_tracing():
+    print("[test] --> Testing the tracing of the FAST_MODE threads")
+    ended = []
+    hook = tracer.add_hook(on_end=ended.append)
+    try:
+        translator = Translate([FakeTranslator(), FakeTranslator()], fast=True)
+        translator.clean_cache()
+        assert translator.translate("Good evening", "French", "English").result == "GOOD EVENING"
+    finally:
+        tracer.remove_hook(hook)
+
+    root = [span for span in ended if span.name == "Translate.translate"][0]
+    attempts = [span for span in ended if span.name == "Translate.attempt"]
+    # the attempts made in the other threads belong to the caller's trace
+    assert attempts and all(span.parent is root for span in attempts)
+
+
+def test_untraced_cache_lookup():
+    print("[test] --> Testing the cache lookups without tracing hooks")
+    from translatepy.utils.lru_cacher import MeteredDictCache
+
+    def _span(*args, **kwargs):
+        raise AssertionError("A span has been created without any hook")
+
+    cache = MeteredDictCache("test")
+    cache["key"] = "value"
+    span, tracer.span = tracer.span, _span
+    try:
+        assert "key" in cache and "other" not in cache
+    finally:
+        tracer.span = span
@@ -1,5 +1,7 @@
 import argparse
 from json import dumps
+from os.path import isfile
+from sys import stderr, stdin, stdout
 from traceback import print_exc
 
 import inquirer
@@ -7,10 +9,16 @@ import inquirer
 import translatepy
 from translatepy.exceptions import UnknownLanguage, VersionNotSupported
 
+# the daemon, bulk translation and profiler modules are only imported by the commands using them
+
+# the commands which can be sent to the daemon (`translatepy.daemon.ACTIONS`)
+DAEMON_ACTIONS = {"translate", "transliterate", "spellcheck", "language"}
+# (the choices of --profile-mode and --format are `translatepy.utils.profiler.MODES` and `translatepy.utils.bulk.FORMATS`)
+
 INPUT_PREFIX = "(\033[90mtranslatepy ~ \033[0m{action}) > "
 
 NO_ACTION = """\
-usage: translatepy [-h] [--version] {translate,transliterate,spellcheck,language,shell,server} ...
+usage: translatepy [-h] [--version] {translate,translate-file,transliterate,spellcheck,language,shell,server,daemon,cache} ...
 translatepy: error: the following arguments are required: action"""
 
 actions = [
@@ -29,6 +37,12 @@ def main():
 
     parser.add_argument('--version', '-v', action='version', version=translatepy.__version__)
     parser.add_argument("--translators", action="store", type=str, help="List of translators to use. Each translator name should be comma-separated.", required=False, default=None)
+    parser.add_argument("--cache-file", action="store", type=str, help="A cache file (JSON Lines, gzipped if it ends with .gz) loaded at startup and updated before exiting", required=False, default=None)
+    parser.add_argument("--socket", action="store", type=str, help="The Unix socket of the translatepy daemon", required=False, default=None)
+    parser.add_argument("--no-daemon", action="store_true", help="Runs the command in this process even if the translatepy daemon is running")
+    parser.add_argument("--profile", action="store", type=str, help="Profiles the command and writes the profile to this path prefix (PROFILE.json and PROFILE.folded or PROFILE.pstats). With `server`, each request is profiled in the PROFILE directory", required=False, default=None)
+    parser.add_argument("--profile-mode", action="store", type=str, choices=["cprofile", "sampling"], help="The profiler to use: sampling (low overhead, flame graphs) or cprofile (exact calls)", required=False, default="sampling")
+    parser.add_argument("--profile-interval", action="store", type=float, help="The number of seconds between two samples of the sampling profiler", required=False, default=0.005)
 
     # subparser = parser.add_subparsers(help='Actions', dest="action", required=True)
     subparser = parser.add_subparsers(help='Actions', dest="action")
@@ -38,6 +52,18 @@ def main():
     parser_translate.add_argument('--dest-lang', '-d', action='store', type=str, required=True, help='destination language')
     parser_translate.add_argument('--source-lang', '-s', action='store', default='auto', type=str, help='source language')
 
+    parser_translate_file = subparser.add_parser('translate-file', help='Translates every line of a text, JSON Lines or CSV file')
+    parser_translate_file.add_argument('--input', '-i', action='store', type=str, default="-", help='the file to translate (defaults to the standard input)')
+    parser_translate_file.add_argument('--output', '-o', action='store', type=str, default="-", help='the file to write the translations to (defaults to the standard output)')
+    parser_translate_file.add_argument('--dest-lang', '-d', action='store', type=str, required=True, help='destination language')
+    parser_translate_file.add_argument('--source-lang', '-s', action='store', default='auto', type=str, help='source language')
+    parser_translate_file.add_argument('--format', '-f', action='store', type=str, default=None, choices=["csv", "jsonl", "ndjson", "txt"], help='the format of the file (guessed from the input extension, txt by default)')
+    parser_translate_file.add_argument('--column', action='store', type=str, default=None, help='the JSON Lines field ("text" by default) or the CSV column (name or index, the first one by default) to translate')
+    parser_translate_file.add_argument('--output-column', action='store', type=str, default=None, help='the field or column to write the translations to (replaces the translated one by default)')
+    parser_translate_file.add_argument("--concurrency", "-c", action="store", type=int, default=8, help="the maximum number of batches translated at the same time")
+    parser_translate_file.add_argument("--batch-size", action="store", type=int, default=50, help="the number of texts translated together")
+    parser_translate_file.add_argument("--checkpoint", action="store", type=str, default=None, help="the file to save the progress to, to resume an interrupted job (defaults to OUTPUT.checkpoint when writing to a file)")
+
     parser_transliterate = subparser.add_parser('transliterate', help='Transliterates the given text')
     parser_transliterate.add_argument('--text', '-t', action='store', type=str, required=True, help='text to transliterate')
     parser_transliterate.add_argument('--dest-lang', '-d', action='store', type=str, default="en", help='destination language')
@@ -58,6 +84,26 @@ def main():
     parser_server.add_argument('--port', '-p', action='store', default=5000, type=int, help='port to run the server on')
     parser_server.add_argument('--host', action='store', default="127.0.0.1", type=str, help='host to run the server on')
 
+    parser_daemon = subparser.add_parser("daemon", help="Runs a translatepy daemon keeping a warm translator, used by the other commands while it is running")
+    parser_daemon.add_argument("daemon_action", action="store", nargs="?", default="start", choices=["start", "stop", "status"], help="start (in the foreground), stop or check the daemon")
+
+    parser_cache = subparser.add_parser("cache", help="Manages the translation caches")
+    cache_subparser = parser_cache.add_subparsers(help="Cache actions", dest="cache_action")
+
+    parser_cache_export = cache_subparser.add_parser("export", help="Exports the caches (loaded with --cache-file, which is required) to a file")
+    parser_cache_export.add_argument("--output", "-o", action="store", type=str, required=True, help="the file to export the caches to")
+
+    parser_cache_import = cache_subparser.add_parser("import", help="Imports a cache file into the caches (saved with --cache-file, which is required)")
+    parser_cache_import.add_argument("--input", "-i", action="store", type=str, required=True, help="the file to import the caches from")
+
+    parser_cache_warm = cache_subparser.add_parser("warm", help="Translates every line of a corpus to fill the caches")
+    parser_cache_warm.add_argument("--input", "-i", action="store", type=str, required=True, help="the corpus, with one text per line")
+    parser_cache_warm.add_argument('--dest-lang', '-d', action='store', type=str, required=True, help='destination language')
+    parser_cache_warm.add_argument('--source-lang', '-s', action='store', default='auto', type=str, help='source language')
+    parser_cache_warm.add_argument("--output", "-o", action="store", type=str, default=None, help="the file to export the caches to (defaults to --cache-file)")
+    parser_cache_warm.add_argument("--concurrency", "-c", action="store", type=int, default=8, help="the maximum number of batches translated at the same time")
+    parser_cache_warm.add_argument("--batch-size", action="store", type=int, default=50, help="the number of texts translated together")
+
     args = parser.parse_args()
 
     if not args.action:
@@ -65,11 +111,94 @@ def main():
         print(NO_ACTION)
         return
 
+    if args.profile is None or args.action == "server":
+        run(args, parser_cache)
+        return
+
+    from translatepy.utils.profiler import Profiler
+    profiler = Profiler(args.profile_mode, args.profile_interval).start()
+    try:
+        run(args, parser_cache)
+    finally:
+        profiler.stop()
+        files = profiler.write(args.profile)
+        print(profiler.summary(), file=stderr)
+        print("The profile has been written to {}".format(", ".join(files)), file=stderr)
+
+
+def _daemon_arguments(args: argparse.Namespace) -> dict:
+    """Returns the arguments of the translator method called by the given command"""
+    if args.action == "language":
+        return {"text": args.text}
+    if args.action == "spellcheck":
+        return {"text": args.text, "source_language": args.source_lang}
+    return {"text": args.text, "destination_language": args.dest_lang, "source_language": args.source_lang}
+
+
+def run(args: argparse.Namespace, parser_cache: argparse.ArgumentParser):
+    client = None
+    if args.action == "daemon" or (args.action in DAEMON_ACTIONS and not args.no_daemon):
+        from translatepy.daemon import DaemonClient
+        client = DaemonClient(args.socket)
+    # the daemon has its own caches, the commands using a cache file run in this process
+    if args.action in DAEMON_ACTIONS and client is not None and args.cache_file is None and client.available():
+        try:
+            result = client.request(args.action, _daemon_arguments(args), args.translators)
+            print(dumps(result, indent=4, ensure_ascii=False))
+            return
+        except OSError:  # the daemon stopped in the meantime
+            pass
+
+    if args.action == "daemon" and args.daemon_action != "start":
+        running = client.available()
+        result = {"success": True, "socket": client.path}
+        if args.daemon_action == "stop":
+            if running:
+                client.request("shutdown")
+            result["stopped"] = running
+        else:
+            result["running"] = running
+        print(dumps(result, indent=4, ensure_ascii=False))
+        return
+
+    if args.action == "cache" and args.cache_file is None:
+        # the caches of this process start empty and are lost when it exits
+        if args.cache_action in {"export", "import"}:
+            parser_cache.error("--cache-file is required to {} the caches".format(args.cache_action))
+        if args.cache_action == "warm" and args.output is None:
+            parser_cache.error("--cache-file or --output is required to warm the caches")
+
     if args.translators is not None:
         dl = translatepy.Translator(args.translators.split(","))
     else:
         dl = translatepy.Translator()
 
+    if args.cache_file is not None and isfile(args.cache_file):
+        dl.import_cache(args.cache_file)
+
+    if args.action == "cache":
+        try:
+            if args.cache_action == "export":
+                result = {"success": True, "entries": dl.export_cache(args.output)}
+            elif args.cache_action == "import":
+                result = {"success": True, "entries": dl.import_cache(args.input)}
+            elif args.cache_action == "warm":
+                with open(args.input, "r", encoding="utf-8") as corpus:
+                    translated, failed = dl.warm_cache((line.rstrip("\r\n") for line in corpus), args.dest_lang, args.source_lang, threads_limit=args.concurrency, batch_size=args.batch_size)
+                result = {"success": True, "translated": translated, "failed": failed}
+                if args.output is not None:
+                    result["entries"] = dl.export_cache(args.output)
+            else:
+                parser_cache.print_help()
+                return
+            print(dumps(result, indent=4, ensure_ascii=False))
+        except Exception as err:
+            print(dumps({
+                "success": False,
+                "exception": err.__class__.__name__,
+                "error": str(err)
+            }, indent=4, ensure_ascii=False))
+
     if args.action == 'translate':
         try:
             result = dl.translate(text=args.text, destination_language=args.dest_lang, source_language=args.source_lang)
@@ -89,6 +218,35 @@ def main():
                 "error": str(err)
             }, indent=4, ensure_ascii=False))
 
+    elif args.action == 'translate-file':
+        # the summary goes to the standard error when the translations are written to the standard output
+        report = stderr if args.output == "-" else stdout
+        try:
+            checkpoint = args.checkpoint
+            if checkpoint is None and args.output != "-":
+                checkpoint = args.output + ".checkpoint"
+            from translatepy.utils.bulk import translate_file
+            result = translate_file(
+                dl,
+                stdin if args.input == "-" else args.input,
+                stdout if args.output == "-" else args.output,
+                destination_language=args.dest_lang,
+                source_language=args.source_lang,
+                format=args.format,
+                column=args.column,
+                output_column=args.output_column,
+                concurrency=args.concurrency,
+                batch_size=args.batch_size,
+                checkpoint=checkpoint
+            )
+            print(dumps(dict(result, success=True), indent=4, ensure_ascii=False), file=report)
+        except Exception as err:
+            print(dumps({
+                "success": False,
+                "exception": err.__class__.__name__,
+                "error": str(err)
+            }, indent=4, ensure_ascii=False), file=report)
+
     elif args.action == 'transliterate':
         try:
             result = dl.transliterate(args.text, args.dest_lang, args.source_lang)
@@ -151,8 +309,13 @@ def main():
         try:
             from translatepy.server import translation
             from translatepy.server import language
+            from translatepy.server import metrics
+            from translatepy.server import profiling
             from translatepy.server.server import app
             from nasse.logging import log, LogLevels
+            if args.profile is not None:
+                profiling.enable(args.profile, args.profile_mode, args.profile_interval)
+                log("Profiling each request to {}".format(args.profile), LogLevels.INFO)
             log("🍡 Press Ctrl+C to quit", LogLevels.INFO)
             app.run(host=args.host, port=args.port)
         except Exception as err:
@@ -164,6 +327,21 @@ def main():
                 raise VersionNotSupported("The server can only be ran on Unix-like systems") from err
             raise err
 
+    if args.action == "daemon":
+        try:
+            from translatepy.daemon import Daemon
+            daemon = Daemon(dl, args.socket)
+            print("The translatepy daemon is listening on {} (Ctrl+C or `translatepy daemon stop` to stop it)".format(daemon.path), file=stderr)
+            daemon.serve()
+        except KeyboardInterrupt:
+            pass
+        except Exception as err:
+            print(dumps({
+                "success": False,
+                "exception": err.__class__.__name__,
+                "error": str(err)
+            }, indent=4, ensure_ascii=False))
+
     # INTERACTIVE VERSION
     if args.action == 'shell':
         destination_language = args.dest_lang
@@ -286,6 +464,9 @@ def main():
 
         print("Thank you for using \033[96mtranslatepy\033[0m!")
 
+    if args.cache_file is not None:
+        dl.export_cache(args.cache_file)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,235 @@
+"""
+A background process keeping a warm translator (instantiated services, caches and connections) behind a local Unix socket
+
+The command line interface sends its commands to the daemon when it is running,
+which avoids instantiating the translators and starting with cold caches for each command.
+
+Protocol: each request is a JSON line {"action": ..., "arguments": {...}, "translators": ...},
+answered with a JSON line (the same JSON object as the one printed by the command line interface).
+"""
+
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+from json import dumps, loads
+from threading import Lock, Thread
+
+from translatepy.exceptions import UnknownLanguage, VersionNotSupported
+from translatepy.utils.annotations import Dict
+from translatepy.utils.lru_cacher import LRUDictCache
+
+# the maximum number of translators kept for the requests asking for specific translators
+TRANSLATORS_CACHE_SIZE = 16
+
+# the actions which can be sent to the daemon, with the translator method they call
+ACTIONS = {
+    "translate": "translate",
+    "transliterate": "transliterate",
+    "spellcheck": "spellcheck",
+    "language": "language"
+}
+
+
+def default_socket_path() -> str:
+    """
+    Returns the path of the daemon socket (the TRANSLATEPY_DAEMON_SOCKET environment variable, or a file in the runtime directory)
+
+    Outside of the user runtime directory, the socket is put in a private directory of the temporary directory.
+    """
+    path = os.environ.get("TRANSLATEPY_DAEMON_SOCKET")
+    if path:
+        return path
+    user = os.getuid() if hasattr(os, "getuid") else "user"
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if directory:
+        return os.path.join(directory, "translatepy-{}.sock".format(user))
+    return os.path.join(tempfile.gettempdir(), "translatepy-{}".format(user), "daemon.sock")
+
+
+def _owned(path: str) -> bool:
+    """
+    Whether the given file belongs to the current user
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    return os.stat(path).st_uid == os.getuid()
+
+
+def error_payload(exception: Exception) -> Dict[str, object]:
+    """
+    Returns the JSON object describing the given exception, as printed by the command line interface
+    """
+    if isinstance(exception, UnknownLanguage):
+        return {
+            "success": False,
+            "guessedLanguage": exception.guessed_language,
+            "similarity": exception.similarity,
+            "exception": exception.__class__.__name__,
+            "error": str(exception)
+        }
+    return {
+        "success": False,
+        "exception": exception.__class__.__name__,
+        "error": str(exception)
+    }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = loads(line.decode("utf-8"))
+                response = self.server.translatepy_daemon.execute(request.get("action"), request.get("arguments") or {}, request.get("translators"))
+            except Exception as err:
+                response = error_payload(err)
+            self.wfile.write(dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if response.get("shutdown"):
+                # shutdown() waits for serve_forever to return, which can't happen in this thread
+                Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class Daemon():
+    def __init__(self, translator=None, path: str = None) -> None:
+        """
+        Serves the given translator (a new `Translate` by default) on a Unix socket
+
+        Parameters:
+        ----------
+            translator : Translate
+                The translator used when the requests don't ask for specific translators
+            path : str
+                The path of the socket (`default_socket_path()` by default)
+        """
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise VersionNotSupported("The daemon can only be ran on Unix-like systems")
+        if translator is None:
+            from translatepy.translate import Translate
+            translator = Translate()
+        self.translator = translator
+        self.path = path or default_socket_path()
+        self._translators = LRUDictCache(TRANSLATORS_CACHE_SIZE)  # comma-separated translators --> Translate
+        self._lock = Lock()
+        self._server = None
+
+    def _get_translator(self, translators: str = None):
+        if not translators:
+            return self.translator
+        with self._lock:
+            translator = self._translators.get(translators)
+            if translator is None:
+                from translatepy.translate import Translate
+                translator = self._translators[translators] = Translate(translators.split(","))
+            else:
+                self._translators.move_to_end(translators)
+            return translator
+
+    def execute(self, action: str, arguments: dict, translators: str = None) -> Dict[str, object]:
+        """
+        Runs the given action and returns the JSON object to send back
+        """
+        if action == "ping":
+            return {"success": True, "pid": os.getpid()}
+        if action == "shutdown":
+            return {"success": True, "shutdown": True}
+        if action not in ACTIONS:
+            return {"success": False, "exception": "ParameterValueError", "error": "Unknown action: {}".format(action)}
+        try:
+            result = getattr(self._get_translator(translators), ACTIONS[action])(**arguments)
+            return loads(result.as_json(ensure_ascii=False))
+        except Exception as err:
+            return error_payload(err)
+
+    def serve(self) -> None:
+        """
+        Serves the requests until a "shutdown" request is received (or the process is interrupted)
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        if os.path.exists(self.path):
+            if DaemonClient(self.path).available():
+                raise OSError("A translatepy daemon is already running on {}".format(self.path))
+            os.remove(self.path)  # left by a daemon which didn't stop properly
+
+        # only the current user can send commands to the daemon
+        # (the default socket is in a private directory, which isn't accessible to the other users before this)
+        self._server = socketserver.ThreadingUnixStreamServer(self.path, _Handler)
+        os.chmod(self.path, 0o600)
+        self._server.daemon_threads = True
+        self._server.translatepy_daemon = self
+        logging.getLogger("translatepy").info("The translatepy daemon is listening on {}".format(self.path))
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class DaemonClient():
+    def __init__(self, path: str = None, timeout: float = None) -> None:
+        """
+        Sends commands to a running daemon
+
+        Parameters:
+        ----------
+            path : str
+                The path of the daemon socket (`default_socket_path()` by default)
+            timeout : float
+                The maximum number of seconds to wait for each response
+        """
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+
+    def _connect(self, timeout: float = None) -> socket.socket:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        try:
+            connection.connect(self.path)
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    def available(self) -> bool:
+        """
+        Whether a daemon of the current user is listening on the socket
+        """
+        if not hasattr(socket, "AF_UNIX") or not os.path.exists(self.path):
+            return False
+        try:
+            if not _owned(self.path):
+                return False
+            self._connect(timeout=1).close()
+            return True
+        except OSError:
+            return False
+
+    def request(self, action: str, arguments: dict = None, translators: str = None) -> Dict[str, object]:
+        """
+        Sends a request to the daemon and returns its response
+        """
+        if not _owned(self.path):
+            raise PermissionError("The translatepy daemon socket {} doesn't belong to the current user".format(self.path))
+        connection = self._connect(timeout=self.timeout)
+        try:
+            message = {"action": action, "arguments": arguments or {}, "translators": translators}
+            connection.sendall(dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+            with connection.makefile("rb") as file:
+                line = file.readline()
+        finally:
+            connection.close()
+        if not line:
+            raise ConnectionError("The translatepy daemon closed the connection without responding")
+        return loads(line.decode("utf-8"))
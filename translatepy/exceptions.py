@@ -54,6 +54,11 @@ class UnsupportedLanguage(TranslatepyException):
         super().__init__(*args)
 
 
+class RequestNotRecorded(TranslatepyException):
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
+
+
 class RequestStatusError(TranslatepyException):
     def __init__(self, status_code, *args: object) -> None:
         super().__init__(*args)
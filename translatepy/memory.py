@@ -0,0 +1,143 @@
+"""
+Translation memory
+
+Stores the translated segments to reuse their translations without making any request,
+for the exact same segments or for similar ones (fuzzy matches).
+"""
+
+from collections import Counter
+from math import sqrt
+from threading import Lock
+
+from translatepy.language import Language
+from translatepy.models import MemoryTranslationResult
+from translatepy.utils.annotations import Dict, Tuple
+
+
+def _vectorize(segment: str) -> Tuple[Counter, float]:
+    """
+    Returns the character trigrams vector of the segment and its length
+    """
+    padded = " " + " ".join(segment.split()) + " "
+    vector = Counter(padded[index:index + 3] for index in range(len(padded) - 2))
+    return vector, sqrt(sum(count ** 2 for count in vector.values()))
+
+
+class TranslationMemory():
+    """
+    A translation memory, which can be given to `Translate` to avoid translating the same segments again
+
+    >>> memory = TranslationMemory(fuzzy_threshold=0.9)
+    >>> translator = Translate(memory=memory)
+    """
+
+    def __init__(self, fuzzy_threshold: float = None, max_candidates: int = 50) -> None:
+        """
+        Parameters:
+        ----------
+            fuzzy_threshold : float, default = None
+                The minimum similarity (between 0 and 1) of a stored segment to reuse its translation for another segment.
+                Only exact matches are used if None.
+                The results coming from a similar segment are flagged (`MemoryTranslationResult.fuzzy`).
+            max_candidates : int, default = 50
+                The maximum number of segments sharing the most trigrams with the searched one which are compared with it
+        """
+        self.fuzzy_threshold = None if fuzzy_threshold is None else float(fuzzy_threshold)
+        self.max_candidates = int(max_candidates)
+        self._segments = {}  # destination language id --> {segment: {source language id: translation}}
+        self._index = {}  # destination language id --> {trigram: set of segments}
+        self._vectors = {}  # segment --> (trigrams vector, length)
+        self._lock = Lock()
+
+    def add(self, source: str, translation: str, destination_language: str, source_language: str = "auto") -> None:
+        """
+        Stores the translation of the given segment
+        """
+        source = str(source)
+        destination_language = Language(destination_language).id
+        source_language = Language(source_language).id
+        with self._lock:
+            segments = self._segments.setdefault(destination_language, {})
+            if source not in segments:
+                segments[source] = {}
+                if source not in self._vectors:
+                    self._vectors[source] = _vectorize(source)
+                index = self._index.setdefault(destination_language, {})
+                for trigram in self._vectors[source][0]:
+                    index.setdefault(trigram, set()).add(source)
+            segments[source][source_language] = str(translation)
+
+    @staticmethod
+    def _pick(translations: Dict[str, str], source_language: str) -> Tuple[str, str]:
+        """
+        Returns the (source language, translation) matching the given source language
+        """
+        if not translations:
+            return None
+        if source_language == "auto":
+            return next(iter(translations.items()))
+        if source_language in translations:
+            return source_language, translations[source_language]
+        return None
+
+    def lookup(self, text: str, destination_language: str, source_language: str = "auto") -> MemoryTranslationResult:
+        """
+        Returns the stored translation of the text, or of the most similar segment if `fuzzy_threshold` is set
+
+        Returns None if no translation could be found
+        """
+        text = str(text)
+        destination_language = Language(destination_language).id
+        source_language = Language(source_language).id
+        with self._lock:
+            segments = self._segments.get(destination_language)
+            if not segments:
+                return None
+
+            match = self._pick(segments.get(text), source_language)
+            if match is not None:
+                return MemoryTranslationResult(self, text, match[0], destination_language, match[1])
+
+            if self.fuzzy_threshold is None:
+                return None
+
+            # the candidates are the segments sharing the most trigrams with the text
+            vector, length = _vectorize(text)
+            index = self._index[destination_language]
+            shared = Counter()
+            for trigram in vector:
+                shared.update(index.get(trigram, ()))
+
+            best = None
+            for segment, _ in shared.most_common(self.max_candidates):
+                match = self._pick(segments[segment], source_language)
+                if match is None:
+                    continue
+                segment_vector, segment_length = self._vectors[segment]
+                summation = sum(count * segment_vector[trigram] for trigram, count in vector.items() if trigram in segment_vector)
+                similarity = summation / (length * segment_length) if length and segment_length else 0
+                if best is None or similarity > best[0]:
+                    best = (similarity, segment, match)
+
+        if best is None or best[0] < self.fuzzy_threshold:
+            return None
+        similarity, segment, (language, translation) = best
+        return MemoryTranslationResult(self, text, language, destination_language, translation, similarity=similarity, matched=segment)
+
+    def clear(self) -> None:
+        """
+        Removes every stored segment
+        """
+        with self._lock:
+            self._segments.clear()
+            self._index.clear()
+            self._vectors.clear()
+
+    def __len__(self) -> int:
+        return sum(len(translations) for segments in self._segments.values() for translations in segments.values())
+
+    def __str__(self) -> str:
+        return "Translation Memory"
+
+    def __repr__(self) -> str:
+        return "TranslationMemory({} segments)".format(len(self))
@@ -53,6 +53,48 @@ class TranslationResult:
         }, **kwargs)
 
 
+class MemoryTranslationResult(TranslationResult):
+    """
+    Class that holds a Translation found in a translation memory.
+
+    `similarity` is 1 for exact matches and lower for fuzzy matches, which translated the `matched` segment instead of the source.
+    """
+
+    def __init__(self, service, source, source_language, destination_language, result, similarity: float = 1., matched: str = None) -> None:
+        super().__init__(service=service, source=source, source_language=source_language, destination_language=destination_language, result=result)
+        self.similarity = float(similarity)
+        self.matched = self.source if matched is None else str(matched)
+
+    @property
+    def fuzzy(self) -> bool:
+        """
+        If the translation comes from a similar segment, and might need to be reviewed
+        """
+        return self.matched != self.source
+
+    def __repr__(self) -> str:
+        return "MemoryTranslationResult(service={service}, source={source}, source_language={source_language}, destination_language={destination_language}, result={result}, similarity={similarity})".format(
+            service=self.service,
+            source=self.source,
+            source_language=self.source_language,
+            destination_language=self.destination_language,
+            result=self.result,
+            similarity=self.similarity
+        )
+
+    def as_json(self, **kwargs) -> str:
+        return dumps({
+            "success": True,
+            "service": str(self.service),
+            "source": str(self.source),
+            "sourceLanguage": str((self.source_language.id) if isinstance(self.source_language, Language) else self.source_language),
+            "destinationLanguage": str((self.destination_language.id) if isinstance(self.destination_language, Language) else self.destination_language),
+            "result": str(self.result),
+            "similarity": self.similarity,
+            "matched": self.matched
+        }, **kwargs)
+
+
 class TransliterationResult:
     """
     Class that holds the result of a Transliteration.
@@ -0,0 +1,119 @@
+from threading import Lock
+from time import perf_counter
+
+import flask
+from flask import Response as FlaskResponse
+from nasse.models import Endpoint, Login
+
+from translatepy.server.server import app
+from translatepy.translators.base import BaseTranslator
+from translatepy.utils.executor import executor_stats
+from translatepy.utils.metrics import Histogram, PrometheusWriter, prometheus_text
+
+# the caches of the translators, with their names in the metrics
+CACHES = {
+    "translations": "_translations_cache",
+    "transliterations": "_transliterations_cache",
+    "languages": "_languages_cache",
+    "spellchecks": "_spellchecks_cache",
+    "examples": "_examples_cache",
+    "dictionaries": "_dictionaries_cache",
+    "text_to_speeches": "_text_to_speeches_cache"
+}
+
+
+class ServerMetrics():
+    """
+    Records the requests received by the server, per endpoint
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.in_flight = 0
+        self._latencies = {}  # endpoint --> Histogram
+        self._requests = {}  # (endpoint, method, status) --> count
+
+    def start(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(self, endpoint: str, method: str, status: int, duration: float) -> None:
+        with self._lock:
+            if endpoint not in self._latencies:
+                self._latencies[endpoint] = Histogram()
+            self._latencies[endpoint].observe(duration)
+            key = (endpoint, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def write(self, writer: PrometheusWriter) -> None:
+        with self._lock:
+            writer.gauge("server_in_flight_requests", "The number of requests currently being handled by the server", self.in_flight)
+            for (endpoint, method, status), count in self._requests.items():
+                writer.counter("server_requests_total", "The number of requests handled by the server", count, {"endpoint": endpoint, "method": method, "status": status})
+            for endpoint, histogram in self._latencies.items():
+                writer.histogram("server_request_duration_seconds", "The time taken by the server to respond (streamed responses are measured until their first byte)", histogram.as_dict(), {"endpoint": endpoint})
+
+
+server_metrics = ServerMetrics()
+
+
+def _endpoint() -> str:
+    rule = flask.request.url_rule
+    # using the route instead of the path to avoid one label per language in /language/details/<lang>
+    return rule.rule if rule is not None else "unmatched"
+
+
+@app.flask.before_request
+def _before_request():
+    flask.g.translatepy_start = perf_counter()
+    server_metrics.start()
+
+
+@app.flask.after_request
+def _after_request(response: FlaskResponse):
+    start = getattr(flask.g, "translatepy_start", None)
+    if start is not None:
+        server_metrics.observe(_endpoint(), flask.request.method, response.status_code, perf_counter() - start)
+    return response
+
+
+@app.flask.teardown_request
+def _teardown_request(exception=None):
+    if flask.g.pop("translatepy_start", None) is not None:
+        server_metrics.finish()
+
+
+def render() -> str:
+    """
+    Returns the server, translators, caches and thread pool metrics in the Prometheus text format
+    """
+    writer = PrometheusWriter()
+    server_metrics.write(writer)
+
+    for name, attribute in CACHES.items():
+        cache = getattr(BaseTranslator, attribute)
+        writer.gauge("cache_entries", "The number of entries in the cache", len(cache), {"cache": name})
+        writer.gauge("cache_max_entries", "The maximum number of entries in the cache", cache.maxsize, {"cache": name})
+
+    stats = executor_stats()
+    writer.gauge("executor_max_workers", "The maximum number of threads of the shared thread pool", stats["max_workers"])
+    writer.gauge("executor_threads", "The number of threads started by the shared thread pool", stats["threads"])
+    writer.gauge("executor_active_tasks", "The number of tasks running on the shared thread pool", stats["active"])
+    writer.gauge("executor_queued_tasks", "The number of tasks waiting for a thread of the shared thread pool", stats["queued"])
+    writer.gauge("executor_saturation", "The ratio of busy threads in the shared thread pool", stats["active"] / stats["max_workers"] if stats["max_workers"] else 0.)
+
+    return prometheus_text(writer=writer)
+
+
+@app.route("/metrics", Endpoint(
+    section="Monitoring",
+    name="Metrics",
+    description="Returns the server metrics (requests rates and latencies per endpoint, translators latencies and errors, caches and thread pool usage) in the Prometheus text format.",
+    login=Login(no_login=True)
+))
+def metrics_endpoint():
+    return FlaskResponse(render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,522 @@
+"""
+A local HTTP server emulating the upstream translation APIs used by translatepy
+
+It implements the request and response shapes of the endpoints used by the translators
+(Google, Bing, DeepL, Microsoft, Yandex, Reverso, LibreTranslate, MyMemory and translate.com)
+with a configurable latency, rate limit and concurrency, so that `Translate` can be load tested without any network.
+
+Usage:
+    >>> from translatepy import Translate
+    >>> from translatepy.server.mock import MockServer
+    >>> with MockServer(latency=0.05, rate_limit=20) as server:
+    ...     translator = Translate(request=server.request())
+    ...     translator.translate("Hello", "French")
+
+It can also be started from the command line:
+    python -m translatepy.server.mock --port 5005 --latency 0.05 --rate-limit 20
+"""
+
+import argparse
+import shutil
+import tempfile
+from json import dumps, loads
+from random import Random
+from threading import BoundedSemaphore, Lock, Thread
+from time import monotonic, sleep
+from typing import Callable, Union
+from urllib.parse import urlsplit
+
+from flask import Flask, Response, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from translatepy.language import Language
+from translatepy.translators.reverso import TRANSLATEPY_LANGUAGES as REVERSO_LANGUAGES
+from translatepy.utils.annotations import Dict, List, Tuple
+from translatepy.utils.detection import CONFIDENCE_THRESHOLD, detect_language
+from translatepy.utils.request import Request
+
+# the language returned when the language of a text could not be detected
+DEFAULT_LANGUAGE = "eng"
+
+
+def pseudo_translate(text: str, source_language: str, destination_language: str) -> str:
+    """
+    The default translation function of the mock server, which prefixes the text with the destination language
+    """
+    return "[{}] {}".format(destination_language, text)
+
+
+class TokenBucket():
+    """
+    A thread safe token bucket allowing `rate` requests per second, with bursts of `burst` requests
+    """
+
+    def __init__(self, rate: float, burst: int = None) -> None:
+        self.rate = float(rate)
+        self.burst = max(1., float(burst if burst is not None else rate))
+        self.tokens = self.burst
+        self.last = monotonic()
+        self._lock = Lock()
+
+    def consume(self) -> bool:
+        """
+        Returns True if the request is allowed
+        """
+        with self._lock:
+            now = monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def _code(service: str, text: str = None, language: str = None) -> str:
+    """
+    Returns the language code used by the given service for the given language (or the language of the given text)
+    """
+    if language is None:
+        language, confidence = detect_language(text or "")
+        if confidence < CONFIDENCE_THRESHOLD:
+            language = None
+    language = Language(language or DEFAULT_LANGUAGE)
+    if service == "deepl":
+        return "ZH" if language.id == "zho" else str(language.alpha2).upper()
+    if service == "reverso":
+        return REVERSO_LANGUAGES.get(language.id, language.alpha3)
+    return language.alpha2
+
+
+def _is_auto(language: str) -> bool:
+    return language is None or str(language).lower() in {"", "auto", "auto-detect", "autodetect"}
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs) -> None:
+        pass
+
+
+class MockServer():
+    """
+    A local server emulating the translation services
+    """
+
+    # (host, path) --> name of the method handling the endpoint
+    ENDPOINTS = {
+        ("translate.google.com", "_/TranslateWebserverUi/data/batchexecute"): "_google_batchexecute",
+        ("translate.googleapis.com", "translate_a/single"): "_google_single",
+        ("clients5.google.com", "translate_a/t"): "_google_dict_chrome_ex",
+        ("www.bing.com", "translator"): "_bing_page",
+        ("www.bing.com", "ttranslatev3"): "_bing_translate",
+        ("www.bing.com", "tfetspktok"): "_bing_token",
+        ("w.deepl.com", "web"): "_deepl_client_state",
+        ("www2.deepl.com", "jsonrpc"): "_deepl_jsonrpc",
+        ("api.cognitive.microsofttranslator.com", "translate"): "_microsoft_translate",
+        ("api.cognitive.microsofttranslator.com", "detect"): "_microsoft_detect",
+        ("translate.yandex.net", "api/v1/tr.json/translate"): "_yandex_translate",
+        ("translate.yandex.net", "api/v1/tr.json/detect"): "_yandex_detect",
+        ("api.reverso.net", "translate/v1/translation"): "_reverso_translate",
+        ("libretranslate.com", "translate"): "_libre_translate",
+        ("libretranslate.com", "detect"): "_libre_detect",
+        ("api.mymemory.translated.net", "get"): "_mymemory_translate",
+        ("www.translate.com", "translator/ajax_translate"): "_translatecom_translate",
+        ("www.translate.com", "translator/ajax_lang_auto_detect"): "_translatecom_detect",
+    }
+
+    def __init__(
+        self,
+        latency: Union[float, Tuple[float, float]] = 0,
+        rate_limit: Union[float, Dict[str, float]] = None,
+        burst: int = None,
+        max_concurrency: int = None,
+        translate: Callable[[str, str, str], str] = pseudo_translate,
+        seed: int = None
+    ) -> None:
+        """
+        Parameters:
+        ----------
+            latency : float | tuple
+                The number of seconds waited before answering each request,
+                or a (minimum, maximum) tuple to pick a random latency
+            rate_limit : float | dict
+                The maximum number of requests per second accepted by each service (host),
+                or a dict mapping the hosts to their own limits.
+                The other requests receive the service's "429 Too Many Requests" response
+            burst : int
+                The number of requests accepted at once before applying the rate limit (defaults to `rate_limit`)
+            max_concurrency : int
+                The maximum number of requests processed at the same time, the other requests wait for their turn
+            translate : function
+                The function used to translate the texts, receiving (text, source language, destination language)
+            seed : int
+                The seed of the random latencies
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.translate = translate
+
+        self._random = Random(seed)
+        self._lock = Lock()
+        self._buckets = {}
+        self._semaphore = BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._server = None
+        self._thread = None
+        # the directory of the sessions (tokens, cookies) of the translators using the mock server,
+        # which must not replace the real sessions stored in the package
+        self.session_directory = None
+
+        # host --> {"requests": ..., "rate_limited": ..., "not_found": ...}
+        self.stats = {}
+
+        self.app = Flask("translatepy-mock")
+        self.app.add_url_rule("/<host>/", "mock", self._dispatch, defaults={"path": ""}, methods=["GET", "POST"])
+        self.app.add_url_rule("/<host>/<path:path>", "mock", self._dispatch, methods=["GET", "POST"])
+
+    # Server management
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL of the running server
+        """
+        if self._server is None:
+            raise RuntimeError("The mock server is not running")
+        return "http://{}:{}".format(self._server.host, self._server.port)
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Starts the server in a background thread (on a free port if `port` is 0) and returns its URL
+        """
+        self.session_directory = tempfile.mkdtemp(prefix="translatepy-mock-")
+        self._server = make_server(host, port, self.app, threaded=True, request_handler=_QuietRequestHandler)
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """
+        Stops the server
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+        if self.session_directory is not None:
+            shutil.rmtree(self.session_directory, ignore_errors=True)
+            self.session_directory = None
+
+    def request(self, **kwargs) -> "MockRequest":
+        """
+        Returns a Request sending every request to this server
+
+        The keyword arguments are passed to `MockRequest`, the translators sessions are stored in `session_directory` by default
+        """
+        kwargs.setdefault("session_directory", self.session_directory)
+        return MockRequest(self.url, **kwargs)
+
+    def __enter__(self):
+        if self._server is None:
+            self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    # Requests handling
+
+    def _count(self, host: str, key: str) -> None:
+        with self._lock:
+            stats = self.stats.setdefault(host, {"requests": 0, "rate_limited": 0, "not_found": 0})
+            stats[key] += 1
+
+    def _allowed(self, host: str) -> bool:
+        rate_limit = self.rate_limit.get(host) if isinstance(self.rate_limit, dict) else self.rate_limit
+        if not rate_limit:
+            return True
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(rate_limit, self.burst)
+        return bucket.consume()
+
+    def _wait(self) -> None:
+        latency = self.latency
+        if isinstance(latency, (list, tuple)):
+            with self._lock:
+                latency = self._random.uniform(*latency)
+        if latency:
+            sleep(latency)
+
+    def _dispatch(self, host: str, path: str):
+        self._count(host, "requests")
+        method = self.ENDPOINTS.get((host, path.strip("/")))
+        if method is None:
+            self._count(host, "not_found")
+            return self._json({"error": "Unknown endpoint: {}/{}".format(host, path)}, 404)
+
+        if not self._allowed(host):
+            self._count(host, "rate_limited")
+            response = self._rate_limited(host)
+            response.headers["Retry-After"] = "1"
+            return response
+
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            self._wait()
+            return getattr(self, method)(self._payload())
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    @staticmethod
+    def _payload() -> Dict[str, object]:
+        """
+        Returns the query parameters, form fields and JSON body of the request as a single dict (lists for repeated fields)
+        """
+        payload = {}
+        for values in (request.args, request.form):
+            for key in values:
+                elements = values.getlist(key)
+                payload[key] = elements if len(elements) > 1 else elements[0]
+        if request.is_json:
+            payload["json"] = request.get_json(silent=True)
+        elif request.data and not request.form:
+            try:
+                payload["json"] = loads(request.data)
+            except ValueError:
+                pass
+        return payload
+
+    @staticmethod
+    def _json(data, status: int = 200) -> Response:
+        return Response(dumps(data, ensure_ascii=False), status=status, mimetype="application/json")
+
+    def _rate_limited(self, host: str) -> Response:
+        """
+        Returns the "Too Many Requests" response of the given service
+        """
+        if host == "www.bing.com":  # Bing returns the status code in the body
+            return self._json({"statusCode": 429, "ShowCaptcha": True})
+        if host == "api.cognitive.microsofttranslator.com":
+            return self._json({"error": {"code": 429001, "message": "The server rejected the request because the client has exceeded request limits."}}, 429)
+        if host.endswith("deepl.com"):
+            return self._json({"jsonrpc": "2.0", "error": {"code": 1042911, "message": "Too many requests."}}, 429)
+        if host == "translate.yandex.net":
+            return self._json({"code": 429, "message": "Too many requests"}, 429)
+        return self._json({"error": "Too Many Requests"}, 429)
+
+    def _translation(self, text: str, source_language: str, destination_language: str, service: str) -> Tuple[str, str]:
+        """
+        Returns the (detected language, translation) of the text
+        """
+        if _is_auto(source_language):
+            source_language = _code(service, text=text)
+        return source_language, self.translate(str(text), str(source_language), str(destination_language))
+
+    # Google
+
+    def _google_batchexecute(self, payload):
+        text, source_language, destination_language, _ = loads(loads(payload["f.req"])[0][0][1])[0]
+        detected, translation = self._translation(text, source_language, destination_language, "google")
+        return Response(make_google_batchexecute_response(text, translation, detected, destination_language), mimetype="application/json")
+
+    def _google_single(self, payload):
+        text = payload.get("q", "")
+        detected, translation = self._translation(text, payload.get("sl"), payload.get("tl"), "google")
+        if payload.get("dj") == "1":
+            return self._json({"sentences": [{"trans": translation, "orig": text, "src_translit": text}], "src": detected, "ld_result": {"srclangs": [detected]}})
+        return self._json([[[translation, text, None, None, 1]], None, detected])
+
+    def _google_dict_chrome_ex(self, payload):
+        texts = payload.get("q", [])
+        source_language = payload.get("sl")
+        if isinstance(texts, str):
+            if _is_auto(source_language):  # single text with an automatic source language
+                detected, translation = self._translation(texts, source_language, payload.get("tl"), "google")
+                return self._json({"sentences": [{"trans": translation, "orig": texts}], "src": detected, "ld_result": {"srclangs": [detected]}})
+            texts = [texts]
+        results = []
+        for text in texts:
+            detected, translation = self._translation(text, source_language, payload.get("tl"), "google")
+            results.append([translation, detected] if _is_auto(source_language) else translation)
+        return self._json(results)
+
+    # Bing
+
+    def _bing_page(self, payload):
+        return Response(
+            '<html><script>_G={IG:"MOCKIG"};var params_AbusePreventionHelper = [1234567890,"mock-token",3600000];</script>'
+            '<div id="rich_tta" data-iid="translator.5023"></div></html>',
+            mimetype="text/html"
+        )
+
+    def _bing_translate(self, payload):
+        detected, translation = self._translation(payload.get("text", ""), payload.get("fromLang"), payload.get("to"), "bing")
+        return self._json([{"detectedLanguage": {"language": detected, "score": 1.0}, "translations": [{"text": translation, "to": payload.get("to")}]}])
+
+    def _bing_token(self, payload):
+        return self._json({"token": "mock-token", "region": "mock", "expiryDurationInMS": 600000})
+
+    # DeepL
+
+    def _deepl_client_state(self, payload):
+        return self._json({"jsonrpc": "2.0", "id": (payload.get("json") or {}).get("id", 1) + 1})
+
+    def _deepl_jsonrpc(self, payload):
+        data = payload.get("json") or {}
+        params = data.get("params", {})
+        if data.get("method") == "LMT_split_into_sentences":
+            texts = params.get("texts", [])
+            result = {
+                "splitted_texts": [[text] for text in texts],
+                "lang": _code("deepl", text=" ".join(texts)) if _is_auto(params.get("lang", {}).get("lang_user_selected")) else params["lang"]["lang_user_selected"]
+            }
+        elif data.get("method") == "LMT_handle_jobs":
+            lang = params.get("lang", {})
+            source_language = lang.get("source_lang_user_selected", lang.get("source_lang_computed"))
+            jobs = params.get("jobs", [])
+            if _is_auto(source_language):
+                source_language = _code("deepl", text=" ".join(job.get("raw_en_sentence", "") for job in jobs))
+            result = {
+                "translations": [
+                    {"beams": [{"postprocessed_sentence": self.translate(job.get("raw_en_sentence", ""), source_language, lang.get("target_lang"))}]}
+                    for job in jobs
+                ],
+                "source_lang": source_language,
+                "target_lang": lang.get("target_lang")
+            }
+        else:
+            return self._json({"jsonrpc": "2.0", "error": {"code": -32601, "message": "Method not found"}, "id": data.get("id")}, 400)
+        return self._json({"jsonrpc": "2.0", "result": result, "id": data.get("id")})
+
+    # Microsoft
+
+    def _microsoft_translate(self, payload):
+        results = []
+        for element in payload.get("json") or []:
+            detected, translation = self._translation(element.get("text", ""), payload.get("from"), payload.get("to"), "microsoft")
+            result = {"translations": [{"text": translation, "to": payload.get("to")}]}
+            if "from" not in payload:
+                result["detectedLanguage"] = {"language": detected, "score": 1.0}
+            results.append(result)
+        return self._json(results)
+
+    def _microsoft_detect(self, payload):
+        return self._json([{"language": _code("microsoft", text=element.get("text", "")), "score": 1.0} for element in payload.get("json") or []])
+
+    # Yandex
+
+    def _yandex_translate(self, payload):
+        lang = str(payload.get("lang", ""))
+        source_language, _, destination_language = lang.rpartition("-")
+        detected, translation = self._translation(payload.get("text", ""), source_language or None, destination_language, "yandex")
+        return self._json({"code": 200, "lang": "{}-{}".format(detected, destination_language), "text": [translation]})
+
+    def _yandex_detect(self, payload):
+        return self._json({"code": 200, "lang": _code("yandex", text=payload.get("text", ""))})
+
+    # Reverso
+
+    def _reverso_translate(self, payload):
+        data = payload.get("json") or {}
+        text = data.get("input", "")
+        source_language = data.get("from")
+        result = {"input": [text], "from": source_language, "to": data.get("to")}
+        if data.get("options", {}).get("languageDetection"):
+            source_language = _code("reverso", text=text)
+            result["languageDetection"] = {"detectedLanguage": source_language, "isDirectionChanged": False}
+        result["translation"] = [self.translate(text, source_language, data.get("to"))]
+        return self._json(result)
+
+    # LibreTranslate
+
+    def _libre_translate(self, payload):
+        detected, translation = self._translation(payload.get("q", ""), payload.get("source"), payload.get("target"), "libre")
+        result = {"translatedText": translation}
+        if _is_auto(payload.get("source")):
+            result["detectedLanguage"] = {"confidence": 100.0, "language": detected}
+        return self._json(result)
+
+    def _libre_detect(self, payload):
+        return self._json([{"confidence": 100.0, "language": _code("libre", text=payload.get("q", ""))}])
+
+    # MyMemory
+
+    def _mymemory_translate(self, payload):
+        source_language, _, destination_language = str(payload.get("langpair", "")).partition("|")
+        detected, translation = self._translation(payload.get("q", ""), source_language, destination_language, "mymemory")
+        return self._json({
+            "responseData": {"translatedText": translation, "match": 1},
+            "responseStatus": 200,
+            "matches": [{"source": detected, "target": destination_language, "segment": payload.get("q", ""), "translation": translation, "match": 1}]
+        })
+
+    # translate.com
+
+    def _translatecom_translate(self, payload):
+        _, translation = self._translation(payload.get("text_to_translate", ""), payload.get("source_lang"), payload.get("translated_lang"), "translatecom")
+        return self._json({"result": "success", "translated_text": translation})
+
+    def _translatecom_detect(self, payload):
+        return self._json({"result": "success", "language": _code("translatecom", text=payload.get("text_to_translate", ""))})
+
+
+def make_google_batchexecute_response(text: str, translation: str, source_language: str = "en", destination_language: str = "fr") -> str:
+    """
+    Returns a response of Google Translate's batchexecute RPC API (see `GoogleTranslateV1._parse_response`)
+    """
+    data = dumps([
+        [None, None, source_language, [[[0, [[[None, len(text)]], [True]]]], len(text)], [[text, None, None, len(text)]]],
+        [[[None, None, None, None, None, [[translation, None, None, None, [[translation, [5], []]]]]]], destination_language, 1, source_language, [text, source_language, destination_language, True]],
+        source_language
+    ])
+    payload = dumps([["wrb.fr", "MkEWBc", data, None, None, None, "generic"], ["di", 40], ["af.httprm", 40, "-1234567890", 1]])
+    return ")]}'\n\n" + str(len(payload)) + "\n" + payload + "\n25\n" + '[["e",4,null,null,' + str(len(payload) + 100) + ']]\n'
+
+
+class MockRequest(Request):
+    def __init__(self, base_url: str, *args, **kwargs) -> None:
+        """
+        A Request sending every request to the mock server at `base_url` instead of the real services
+
+        The other arguments are passed to `translatepy.utils.request.Request`
+        """
+        super().__init__(*args, **kwargs)
+        self.base_url = str(base_url).rstrip("/")
+
+    def rewrite(self, url: str) -> str:
+        """
+        Returns the URL of the mock server endpoint emulating the given URL
+        """
+        parsed = urlsplit(url)
+        result = "{}/{}{}".format(self.base_url, parsed.netloc, parsed.path or "/")
+        if parsed.query:
+            result += "?" + parsed.query
+        return result
+
+    def _perform(self, method: str, url: str, **kwargs):
+        return super()._perform(method, self.rewrite(url), **kwargs)
+
+
+def main(args: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m translatepy.server.mock", description="A local server emulating the translation services")
+    parser.add_argument("--host", default="127.0.0.1", help="The host to listen on")
+    parser.add_argument("--port", type=int, default=5005, help="The port to listen on")
+    parser.add_argument("--latency", type=float, default=0, help="The number of seconds waited before answering each request")
+    parser.add_argument("--rate-limit", type=float, default=None, help="The maximum number of requests per second for each service")
+    parser.add_argument("--burst", type=int, default=None, help="The number of requests accepted at once before applying the rate limit")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="The maximum number of requests processed at the same time")
+    args = parser.parse_args(args)
+
+    server = MockServer(latency=args.latency, rate_limit=args.rate_limit, burst=args.burst, max_concurrency=args.max_concurrency)
+    print("Mock server listening on http://{}:{}".format(args.host, args.port))
+    server.app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import logging
+from os import makedirs
+
+import flask
+
+from translatepy.server.server import app
+from translatepy.utils.profiler import Profiler, profile_directory_prefix
+
+# the profiling settings, profiling each request while `directory` is set
+settings = {
+    "directory": None,
+    "mode": "sampling",
+    "interval": 0.005
+}
+
+
+def enable(directory: str, mode: str = "sampling", interval: float = 0.005) -> None:
+    """
+    Profiles every request handled by the server, writing one profile per request to the given directory
+
+    (see `translatepy.utils.profiler.Profiler.write` for the written files)
+    """
+    Profiler(mode, interval)  # validating the parameters
+    makedirs(directory, exist_ok=True)
+    settings.update(directory=directory, mode=mode, interval=interval)
+
+
+def disable() -> None:
+    settings["directory"] = None
+
+
+@app.flask.before_request
+def _start_profiling():
+    if settings["directory"] is None:
+        return
+    # sampling every thread running translatepy, as the services are called from the shared thread pool and the FAST_MODE threads
+    # (the samples of concurrent requests are mixed together)
+    profiler = Profiler(settings["mode"], settings["interval"])
+    try:
+        profiler.start()
+    except ValueError:  # another cProfile profiler is already running (concurrent requests on Python 3.12+)
+        logging.getLogger("translatepy").warning("Could not profile {}, another profiler is running".format(flask.request.path))
+        return
+    flask.g.translatepy_profiler = (profiler, settings["directory"])
+
+
+@app.flask.teardown_request
+def _stop_profiling(exception=None):
+    profiler = flask.g.pop("translatepy_profiler", None)
+    if profiler is None:
+        return
+    profiler, directory = profiler
+    profiler.stop()
+    rule = flask.request.url_rule
+    try:
+        profiler.write(profile_directory_prefix(directory, rule.rule if rule is not None else flask.request.path))
+    except Exception:
+        logging.getLogger("translatepy").exception("Error while writing the profile of {}".format(flask.request.path))
@@ -1,16 +1,17 @@
 import json
-from threading import Thread
+from threading import Event, Thread
 from typing import List
-from bs4 import NavigableString
 from nasse import Response
 from flask import Response as FlaskResponse
 from nasse.models import Endpoint, Error, Login, Param, Return
+from nasse.utils.boolean import to_bool
 from translatepy import Translator
-from translatepy.exceptions import NoResult, UnknownLanguage, UnknownTranslator
+from translatepy.exceptions import NoResult, ParameterValueError, UnknownLanguage, UnknownTranslator
 from translatepy.language import Language
 from translatepy.server.server import app
 from collections import Counter
 
+from translatepy.utils.markup import get_text_nodes, parse_html, parse_stream_selectors, translate_html_stream, translate_nodes
 from translatepy.utils.queue import Queue
 
 base = Endpoint(
@@ -34,6 +35,10 @@ def TranslatorList(value: str):
     # return get_translator(value.split(","))
 
 
+def CommaList(value: str):
+    return [element.strip() for element in value.split(",") if element.strip()]
+
+
 t = Translator()
 
 
@@ -206,6 +211,9 @@ def translate(text: str, dest: str, source: str = "auto", translators: List[str]
         Param("source", "The source language", required=False),
         Param("parser", "The HTML parser to use", required=False),
         Param("translators", "The translator(s) to use. When providing multiple translators, the names should be comma-separated.", required=False, type=TranslatorList),
+        Param("exclude", "A CSS selector of the elements which shouldn't be translated (only simple selectors like `div.notes` are supported when streaming)", required=False),
+        Param("attributes", "The attributes to translate along with the text nodes (i.e `alt,title,placeholder`), comma-separated.", required=False, type=CommaList),
+        Param("stream", "Whether to stream the translated HTML (as `text/html`) as soon as each part is translated, instead of returning the JSON response. Recommended for very large documents.", required=False, type=to_bool),
     ],
     returning=[
         Return("services", ["Google", "Bing"], "The translators used"),
@@ -215,7 +223,7 @@ def translate(text: str, dest: str, source: str = "auto", translators: List[str]
         Return("result", "<div><p>こんにちは、今日はお元気ですか</p><p>大丈夫</p></div>", "The translated text")
     ]
 ))
-def translate(code: str, dest: str, source: str = "auto", parser: str = "html.parser", translators: List[str] = None):
+def translate(code: str, dest: str, source: str = "auto", parser: str = "html.parser", translators: List[str] = None, exclude: str = None, attributes: List[str] = None, stream: bool = False):
     current_translator = t
     if translators is not None:
         try:
@@ -244,19 +252,43 @@ def translate(code: str, dest: str, source: str = "auto", parser: str = "html.pa
             error="UNKNOWN_LANGUAGE",
             code=400
         )
-    services = []
-    languages = []
 
-    def _translate(node: NavigableString):
+    def _translate(text: str):
+        return current_translator.translate(text, destination_language=dest, source_language=source)
+
+    def _translate_batch(texts: List[str]):
+        return current_translator.translate_batch(texts, destination_language=dest, source_language=source)
+
+    exclude = [exclude] if exclude else None
+
+    if stream:
+        # validating the selectors before the response starts, as the errors can't be returned once it is streamed
         try:
-            result = current_translator.translate(str(node), destination_language=dest, source_language=source)
-            services.append(str(result.service))
-            languages.append(str(result.source_language))
-            node.replace_with(result.result)
-        except Exception:  # ignore if it couldn't find any result or an error occured
-            pass
-
-    result = current_translator.translate_html(html=code, destination_language=dest, source_language=source, parser=parser, __internal_replacement_function__=_translate)
+            parse_stream_selectors(exclude)
+        except ParameterValueError as err:
+            return Response(
+                message=str(err),
+                error="PARAMETER_VALUE_ERROR",
+                code=400
+            )
+        cancel = Event()
+        translated = translate_html_stream(code, _translate, _translate_batch, exclude=exclude, attributes=attributes, cancel=cancel)
+
+        def _stream():
+            try:
+                yield from translated
+            finally:
+                # the response is closed when it is fully sent or when the client disconnects,
+                # the remaining translations are then cancelled
+                cancel.set()
+
+        return FlaskResponse(_stream(), mimetype="text/html")
+
+    page = parse_html(code, parser)
+    results = translate_nodes(get_text_nodes(page, exclude, attributes), _translate, _translate_batch)
+    services = [str(element.service) for element in results]
+    languages = [str(element.source_language) for element in results]
+    result = str(page)
 
     return 200, {
         "services": [element for element, _ in Counter(services).most_common()],
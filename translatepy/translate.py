@@ -4,15 +4,19 @@ translatepy v2.4
 © Anime no Sekai — 2021
 """
 import inspect
-from multiprocessing.pool import ThreadPool
-from threading import Thread
-from typing import Iterable, Union
+from contextlib import contextmanager
+from threading import Event, Thread
+from typing import Iterable, Iterator, Union
 
 from bs4 import BeautifulSoup
-from bs4.element import NavigableString, PageElement, PreformattedString, Tag
+from bs4.element import PageElement, Tag
 
-from translatepy.exceptions import NoResult, ParameterTypeError, ParameterValueError
+from translatepy.exceptions import (NoResult, ParameterError,
+                                    ParameterTypeError, ParameterValueError,
+                                    UnknownLanguage, UnsupportedLanguage,
+                                    UnsupportedMethod)
 from translatepy.language import Language
+from translatepy.memory import TranslationMemory
 from translatepy.models import (DictionaryResult, ExampleResult,
                                 LanguageResult, SpellcheckResult,
                                 TextToSpechResult, TranslationResult,
@@ -21,12 +25,19 @@ from translatepy.translators import (BaseTranslator, BingTranslate,
                                      DeeplTranslate, GoogleTranslate,
                                      LibreTranslate, MyMemoryTranslate,
                                      ReversoTranslate, TranslateComTranslate,
-                                     YandexTranslate, MicrosoftTranslate)
-from translatepy.utils.annotations import List
+                                     YandexTranslate, MicrosoftTranslate,
+                                     LocalTranslate)
+from translatepy.translators.base import EXPORTABLE_CACHES, BaseTranslateException
+from translatepy.utils.annotations import Dict, List, Tuple
+from translatepy.utils.lru_cacher import LRUDictCache, TTLDictCache, cache_key, dump_caches, load_caches
 from translatepy.utils.queue import Queue
 from translatepy.utils.request import Request
 from translatepy.utils.sanitize import remove_spaces
+from translatepy.utils.executor import map_bounded
 from translatepy.utils.importer import get_translator
+from translatepy.utils.markup import get_text_nodes, parse_html, translate_html_stream, translate_nodes
+from translatepy.utils.metrics import metrics
+from translatepy.utils.tracing import Span, attach, current_span, traced, tracer
 
 
 class Translate():
@@ -48,7 +59,9 @@ class Translate():
             MyMemoryTranslate
         ],
         request: Request = Request(),
-        fast: bool = False
+        fast: bool = False,
+        memory: TranslationMemory = None,
+        failures_ttl: float = 300
     ) -> None:
         """
         A special Translator class grouping multiple translators to have better results.
@@ -61,6 +74,11 @@ class Translate():
                 The Request class used to make requests
             fast : bool
                 Enabling fast mode (concurrent processing) or not
+            memory : TranslationMemory
+                A translation memory consulted before the services, and filled with their translations
+            failures_ttl : float
+                The number of seconds during which a service is skipped for a call it is known to fail on
+                (unsupported method, language pair or text). None or 0 disables the failures cache
         """
         if not isinstance(services_list, Iterable):
             raise ParameterTypeError("Parameter 'services_list' must be iterable, {} was given".format(type(services_list).__name__))
@@ -69,12 +87,18 @@ class Translate():
             raise ParameterValueError("Parameter 'services_list' must not be empty")
 
         self.FAST_MODE = fast
+        self.memory = memory
+        # the known failures, to skip the services which would fail the same way again
+        self._failures = TTLDictCache(maxsize=4096, ttl=failures_ttl) if failures_ttl else None
 
         if isinstance(request, type):  # is not instantiated
             self.request = request()
         else:
             self.request = request
 
+        # used to detect the languages without making any request when possible
+        self._local_detector = LocalTranslate()
+
         self.services = []
         for service in services_list:
             if isinstance(service, str):
@@ -93,6 +117,84 @@ class Translate():
             services_list[index] = service
         return service
 
+    def _memorize(self, result: TranslationResult) -> TranslationResult:
+        """
+        Stores the translation in the translation memory, if any
+        """
+        if self.memory is not None:
+            self.memory.add(result.source, result.result, result.destination_language, result.source_language)
+        return result
+
+    def _merge_memorized(self, memorized: List[TranslationResult], results: List[TranslationResult]) -> List[TranslationResult]:
+        """
+        Fills the missing translations of the translation memory with the given results (and stores them)
+        """
+        results = iter(results)
+        return [self._memorize(next(results)) if result is None else result for result in memorized]
+
+    @staticmethod
+    def _fresh_exception(exception: Exception) -> Exception:
+        """
+        Returns a new instance of the given exception, without its traceback
+
+        (sharing the stored instance between the FAST_MODE threads would mix their tracebacks)
+        """
+        fresh = type(exception).__new__(type(exception), *exception.args)
+        fresh.__dict__.update(exception.__dict__)
+        return fresh
+
+    @contextmanager
+    def _known_failures(self, index: int, method: str, text: str = None, destination_language: Language = None, source_language: Language = None, options: tuple = ()):
+        """
+        Skips the service at the given index if it is known to fail on this call,
+        and remembers the failures which would happen again for the same call
+
+        The failures are keyed by service and method (unsupported method),
+        by language pair and `options` (unsupported language, by text when only the source language is given and is detected) or by text (deterministic errors)
+
+        `options` are the other parameters the support of a language depends on (i.e the gender of the text to speech voice)
+
+        Each attempt is traced in a "Translate.attempt" span
+        """
+        service = self.services[index]
+        with tracer.span("Translate.attempt", service=getattr(service, "__name__", None) or str(service), index=index, method=method) as span:
+            if self._failures is None:
+                yield
+                return
+
+            languages = (
+                None if destination_language is None else destination_language.id,
+                None if source_language is None else source_language.id
+            )
+            text_hash = None if text is None else cache_key(text)
+            method_key = (index, method)
+            languages_key = method_key + languages + tuple(options)
+            text_key = languages_key + (text_hash,)
+
+            for key in (method_key, languages_key, text_key):
+                exception = self._failures.get(key)
+                if exception is not None:
+                    span.set_attribute("skipped", True)
+                    raise self._fresh_exception(exception)
+
+            try:
+                yield
+            except UnsupportedMethod as exception:
+                self._failures[method_key] = exception
+                raise
+            except UnsupportedLanguage as exception:
+                # without any destination language, the unsupported language is the detected one, which depends on the text
+                self._failures[text_key if languages == (None, "auto") else languages_key] = exception
+                raise
+            except (ParameterError, UnknownLanguage) as exception:
+                self._failures[text_key] = exception
+                raise
+            except BaseTranslateException as exception:
+                if exception.deterministic:
+                    self._failures[text_key] = exception
+                raise
+
+    @traced("Translate.translate")
     def translate(self, text: str, destination_language: str, source_language: str = "auto") -> TranslationResult:
         """
         Translates the given text to the given language
@@ -102,50 +204,118 @@ class Translate():
         dest_lang = Language(destination_language)
         source_lang = Language(source_language)
 
+        if self.memory is not None:
+            result = self.memory.lookup(text, dest_lang, source_lang)
+            if result is not None:
+                return result
+
         def _translate(translator: BaseTranslator, index: int):
-            translator = self._instantiate_translator(translator, self.services, index)
-            result = translator.translate(
-                text=text, destination_language=dest_lang, source_language=source_lang
-            )
+            with self._known_failures(index, "translate", text, dest_lang, source_lang):
+                translator = self._instantiate_translator(translator, self.services, index)
+                result = translator.translate(
+                    text=text, destination_language=dest_lang, source_language=source_lang
+                )
             if result is None:
                 raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
             return result
 
-        def _fast_translate(queue: Queue, translator: BaseTranslator, index: int):
-            try:
-                queue.put(_translate(translator=translator, index=index))
-            except Exception:
-                pass
+        def _fast_translate(queue: Queue, translator: BaseTranslator, index: int, span: Span = None):
+            with attach(span):  # continuing the caller's trace in this thread
+                try:
+                    queue.put(_translate(translator=translator, index=index))
+                except Exception:
+                    pass
 
         if self.FAST_MODE:
             _queue = Queue()
+            span = current_span()
             threads = []
             for index, service in enumerate(self.services):
-                thread = Thread(target=_fast_translate, args=(_queue, service, index))
+                thread = Thread(target=_fast_translate, args=(_queue, service, index, span))
                 thread.start()
                 threads.append(thread)
             result = _queue.get(threads=threads)  # wait for a value and return it
             if result is None:
                 raise NoResult("No service has returned a valid result")
+            return self._memorize(result)
+
+        exception = None
+        for index, service in enumerate(self.services):
+            try:
+                return self._memorize(_translate(translator=service, index=index))
+            except Exception as ex:
+                exception = ex
+                continue
+        else:
+            raise NoResult("No service has returned a valid result") from exception
+
+    @traced("Translate.translate_batch")
+    def translate_batch(self, texts: List[str], destination_language: str, source_language: str = "auto") -> List[TranslationResult]:
+        """
+        Translates the given texts to the given language, packing them in as few requests as possible
+
+        i.e ["Good morning", "Good evening"] (en) --> ["おはようございます", "こんばんは"] (ja)
+        """
+        texts = list(texts)
+        dest_lang = Language(destination_language)
+        source_lang = Language(source_language)
+
+        memorized = [None] * len(texts)
+        if self.memory is not None:
+            memorized = [self.memory.lookup(text, dest_lang, source_lang) for text in texts]
+        # the texts which are not in the translation memory
+        pending = [text for text, result in zip(texts, memorized) if result is None]
+        if not pending:
+            return memorized
+
+        def _translate_batch(translator: BaseTranslator, index: int):
+            with self._known_failures(index, "translate_batch", "\n".join(pending), dest_lang, source_lang):
+                translator = self._instantiate_translator(translator, self.services, index)
+                result = translator.translate_batch(
+                    texts=pending, destination_language=dest_lang, source_language=source_lang
+                )
+            if result is None or len(result) != len(pending):
+                raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
             return result
 
+        def _fast_translate_batch(queue: Queue, translator: BaseTranslator, index: int, span: Span = None):
+            with attach(span):
+                try:
+                    queue.put(_translate_batch(translator=translator, index=index))
+                except Exception:
+                    pass
+
+        if self.FAST_MODE:
+            _queue = Queue()
+            span = current_span()
+            threads = []
+            for index, service in enumerate(self.services):
+                thread = Thread(target=_fast_translate_batch, args=(_queue, service, index, span))
+                thread.start()
+                threads.append(thread)
+            result = _queue.get(threads=threads)  # wait for a value and return it
+            if result is None:
+                raise NoResult("No service has returned a valid result")
+            return self._merge_memorized(memorized, result)
+
         exception = None
         for index, service in enumerate(self.services):
             try:
-                return _translate(translator=service, index=index)
+                return self._merge_memorized(memorized, _translate_batch(translator=service, index=index))
             except Exception as ex:
                 exception = ex
                 continue
         else:
             raise NoResult("No service has returned a valid result") from exception
 
-    def translate_html(self, html: Union[str, PageElement, Tag, BeautifulSoup], destination_language: str, source_language: str = "auto", parser: str = "html.parser", threads_limit: int = 100, __internal_replacement_function__ = None) -> Union[str, PageElement, Tag, BeautifulSoup]:
+    @traced("Translate.translate_html")
+    def translate_html(self, html: Union[str, PageElement, Tag, BeautifulSoup], destination_language: str, source_language: str = "auto", parser: str = "html.parser", threads_limit: int = 100, __internal_replacement_function__ = None, timeout: float = None, exclude: List[str] = None, attributes: List[str] = None, cancel: Event = None) -> Union[str, PageElement, Tag, BeautifulSoup]:
         """
         Translates the given HTML string or BeautifulSoup object to the given language
 
         i.e
          English: `<div class="hello"><h1>Hello</h1> everyone and <a href="/welcome">welcome</a> to <span class="w-full">my website</span></div>`
-         French: `<div class="hello"><h1>Bonjour</h1>tout le monde et<a href="/welcome">Bienvenue</a>à<span class="w-full">Mon site internet</span></div>`
+         French: `<div class="hello"><h1>Bonjour</h1> tout le monde et <a href="/welcome">Bienvenue</a> à <span class="w-full">Mon site internet</span></div>`
 
         Note: This method is not perfect since it is not tag/context aware. Example: `<span>Hello <strong>everyone</strong></span>` will not be understood as
         "Hello everyone" with "everyone" in bold but rather "Hello" and "everyone" separately.
@@ -165,9 +335,18 @@ class Translate():
             parser : str, default = "html.parser"
                 The parser that BeautifulSoup will use to parse the HTML string.
             threads_limit : int, default = 100
-                The maximum number of threads that will be spawned by translate_html
+                The maximum number of nodes translated at the same time (on the shared thread pool, see `translatepy.utils.executor`) when they can't be translated in batches
             __internal_replacement_function__ : function, default = None
                 This is used internally, especially by the translatepy HTTP server to modify the translation step.
+            timeout : float, default = None
+                The maximum number of seconds to wait for the translations, the remaining ones are cancelled afterwards (raising `TimeoutError`)
+            exclude : list[str], default = None
+                CSS selectors of the elements which shouldn't be translated.
+                The content of <script>, <style>, <code> and <pre> elements and of the elements with the `notranslate` class or the `translate="no"` attribute is never translated.
+            attributes : list[str], default = None
+                The attributes to translate along with the text nodes (i.e `translatepy.utils.markup.TRANSLATABLE_ATTRIBUTES`: alt, title and placeholder)
+            cancel : threading.Event, default = None
+                An event which can be set (i.e from another thread) to cancel the remaining translations (raising `TimeoutError`)
 
         Returns:
         --------
@@ -181,25 +360,69 @@ class Translate():
         dest_lang = Language(destination_language)
         source_lang = Language(source_language)
 
-        def _translate(node: NavigableString):
-            try:
-                node.replace_with(self.translate(str(node), destination_language=dest_lang, source_language=source_lang).result)
-            except Exception:  # ignore if it couldn't find any result or an error occured
-                pass
+        if __internal_replacement_function__ is not None:  # kept for backward compatibility, translates each node separately
+            page = parse_html(html, parser)
+            nodes = [node for group in get_text_nodes(page, exclude).values() for node in group]
+            map_bounded(__internal_replacement_function__, nodes, limit=threads_limit, timeout=timeout, cancel=cancel)
+            return page if isinstance(html, (PageElement, Tag, BeautifulSoup)) else str(page)
 
-        if __internal_replacement_function__ is not None:
-            _translate = __internal_replacement_function__
+        def _translate(text: str) -> TranslationResult:
+            return self.translate(text, destination_language=dest_lang, source_language=source_lang)
 
-        if not isinstance(html, (PageElement, Tag, BeautifulSoup)):
-            page = BeautifulSoup(str(html), str(parser))
-        else:
-            page = html
-        # nodes = [tag.text for tag in page.find_all(text=True, recursive=True, attrs=lambda class_name: "notranslate" not in str(class_name).split()) if not isinstance(tag, (PreformattedString)) and remove_spaces(tag) != ""]
-        nodes = [tag for tag in page.find_all(text=True, recursive=True) if not isinstance(tag, (PreformattedString)) and remove_spaces(tag) != ""]
-        with ThreadPool(int(threads_limit)) as pool:
-            pool.map(_translate, nodes)
+        def _translate_batch(texts: List[str]) -> List[TranslationResult]:
+            return self.translate_batch(texts, destination_language=dest_lang, source_language=source_lang)
+
+        page = parse_html(html, parser)
+        # identical nodes are translated once, and packed in a few requests if possible
+        translate_nodes(get_text_nodes(page, exclude, attributes), _translate, _translate_batch, threads_limit, timeout, cancel)
         return page if isinstance(html, (PageElement, Tag, BeautifulSoup)) else str(page)
 
+    def translate_html_stream(self, html: Union[str, Iterable[str]], destination_language: str, source_language: str = "auto", window_size: int = 100, threads_limit: int = 100, timeout: float = None, exclude: List[str] = None, attributes: List[str] = None, cancel: Event = None) -> Iterator[str]:
+        """
+        Translates the given HTML incrementally and yields the translated HTML as soon as each part is translated
+
+        Contrary to `translate_html`, the whole document is never parsed nor kept in memory,
+        which makes it suitable for very large documents.
+
+        Parameters:
+        ----------
+            html : str | file-like object | Iterable[str]
+                The HTML to be translated. This can also be a file-like object or an iterable of strings (i.e a generator reading a file).
+            destination_language : str
+                The language the HTML needs to be translated in.
+            source_language : str, default = "auto"
+                The language of the HTML.
+            window_size : int, default = 100
+                The number of text nodes translated at once
+            threads_limit : int, default = 100
+                The maximum number of nodes translated at the same time (on the shared thread pool, see `translatepy.utils.executor`) when they can't be translated in batches
+            timeout : float, default = None
+                The maximum number of seconds to wait for the translations of each window, the remaining ones are cancelled afterwards (raising `TimeoutError`)
+            exclude : list[str], default = None
+                Simple CSS selectors (a tag name followed by classes and ids, i.e "div.notes#main") of the elements which shouldn't be translated.
+                The content of <script>, <style>, <code> and <pre> elements and of the elements with the `notranslate` class or the `translate="no"` attribute is never translated.
+            attributes : list[str], default = None
+                The attributes to translate along with the text nodes (i.e `translatepy.utils.markup.TRANSLATABLE_ATTRIBUTES`: alt, title and placeholder)
+            cancel : threading.Event, default = None
+                An event which can be set (i.e from another thread) to cancel the remaining translations (raising `TimeoutError`)
+
+        Yields:
+        -------
+            str:
+                The translated HTML, piece by piece
+        """
+        dest_lang = Language(destination_language)
+        source_lang = Language(source_language)
+
+        def _translate(text: str) -> TranslationResult:
+            return self.translate(text, destination_language=dest_lang, source_language=source_lang)
+
+        def _translate_batch(texts: List[str]) -> List[TranslationResult]:
+            return self.translate_batch(texts, destination_language=dest_lang, source_language=source_lang)
+
+        return translate_html_stream(html, _translate, _translate_batch, window_size, threads_limit, timeout, exclude, attributes, cancel)
+
+    @traced("Translate.transliterate")
     def transliterate(self, text: str, destination_language: str = "en", source_language: str = "auto") -> TransliterationResult:
         """
         Transliterates the given text, get its pronunciation
@@ -210,25 +433,28 @@ class Translate():
         source_lang = Language(source_language)
 
         def _transliterate(translator: BaseTranslator, index: int):
-            translator = self._instantiate_translator(translator, self.services, index)
-            result = translator.transliterate(
-                text=text, destination_language=dest_lang, source_language=source_lang
-            )
+            with self._known_failures(index, "transliterate", text, dest_lang, source_lang):
+                translator = self._instantiate_translator(translator, self.services, index)
+                result = translator.transliterate(
+                    text=text, destination_language=dest_lang, source_language=source_lang
+                )
             if result is None:
                 raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
             return result
 
-        def _fast_transliterate(queue: Queue, translator: BaseTranslator, index: int):
-            try:
-                queue.put(_transliterate(translator=translator, index=index))
-            except Exception:
-                pass
+        def _fast_transliterate(queue: Queue, translator: BaseTranslator, index: int, span: Span = None):
+            with attach(span):
+                try:
+                    queue.put(_transliterate(translator=translator, index=index))
+                except Exception:
+                    pass
 
         if self.FAST_MODE:
             _queue = Queue()
+            span = current_span()
             threads = []
             for index, service in enumerate(self.services):
-                thread = Thread(target=_fast_transliterate, args=(_queue, service, index))
+                thread = Thread(target=_fast_transliterate, args=(_queue, service, index, span))
                 thread.start()
                 threads.append(thread)
             result = _queue.get(threads=threads)  # wait for a value and return it
@@ -246,6 +472,7 @@ class Translate():
         else:
             raise NoResult("No service has returned a valid result") from exception
 
+    @traced("Translate.spellcheck")
     def spellcheck(self, text: str, source_language: str = "auto") -> SpellcheckResult:
         """
         Checks the spelling of a given text
@@ -255,25 +482,28 @@ class Translate():
         source_lang = Language(source_language)
 
         def _spellcheck(translator: BaseTranslator, index: int):
-            translator = self._instantiate_translator(translator, self.services, index)
-            result = translator.spellcheck(
-                text=text, source_language=source_lang
-            )
+            with self._known_failures(index, "spellcheck", text, None, source_lang):
+                translator = self._instantiate_translator(translator, self.services, index)
+                result = translator.spellcheck(
+                    text=text, source_language=source_lang
+                )
             if result is None:
                 raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
             return result
 
-        def _fast_spellcheck(queue: Queue, translator: BaseTranslator, index: int):
-            try:
-                queue.put(_spellcheck(translator=translator, index=index))
-            except Exception:
-                pass
+        def _fast_spellcheck(queue: Queue, translator: BaseTranslator, index: int, span: Span = None):
+            with attach(span):
+                try:
+                    queue.put(_spellcheck(translator=translator, index=index))
+                except Exception:
+                    pass
 
         if self.FAST_MODE:
             _queue = Queue()
+            span = current_span()
             threads = []
             for index, service in enumerate(self.services):
-                thread = Thread(target=_fast_spellcheck, args=(_queue, service, index))
+                thread = Thread(target=_fast_spellcheck, args=(_queue, service, index, span))
                 thread.start()
                 threads.append(thread)
             result = _queue.get(threads=threads)  # wait for a value and return it
@@ -291,32 +521,42 @@ class Translate():
         else:
             raise NoResult("No service has returned a valid result") from exception
 
+    @traced("Translate.language")
     def language(self, text: str) -> LanguageResult:
         """
         Returns the language of the given text
 
         i.e 皆さんおはようございます！ --> Japanese
         """
+        # the offline detection is tried first and the services are only used if it isn't confident enough
+        try:
+            return self._local_detector.language(text=text)
+        except NoResult:
+            pass
+
         def _language(translator: BaseTranslator, index: int):
-            translator = self._instantiate_translator(translator, self.services, index)
-            result = translator.language(
-                text=text
-            )
+            with self._known_failures(index, "language", text, None, None):
+                translator = self._instantiate_translator(translator, self.services, index)
+                result = translator.language(
+                    text=text
+                )
             if result is None:
                 raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
             return result
 
-        def _fast_language(queue: Queue, translator: BaseTranslator, index: int):
-            try:
-                queue.put(_language(translator=translator, index=index))
-            except Exception:
-                pass
+        def _fast_language(queue: Queue, translator: BaseTranslator, index: int, span: Span = None):
+            with attach(span):
+                try:
+                    queue.put(_language(translator=translator, index=index))
+                except Exception:
+                    pass
 
         if self.FAST_MODE:
             _queue = Queue()
+            span = current_span()
             threads = []
             for index, service in enumerate(self.services):
-                thread = Thread(target=_fast_language, args=(_queue, service, index))
+                thread = Thread(target=_fast_language, args=(_queue, service, index, span))
                 thread.start()
                 threads.append(thread)
             result = _queue.get(threads=threads)  # wait for a value and return it
@@ -334,6 +574,7 @@ class Translate():
         else:
             raise NoResult("No service has returned a valid result") from exception
 
+    @traced("Translate.example")
     def example(self, text: str, destination_language: str, source_language: str = "auto") -> ExampleResult:
         """
         Returns a set of examples / use cases for the given word
@@ -344,25 +585,28 @@ class Translate():
         source_lang = Language(source_language)
 
         def _example(translator: BaseTranslator, index: int):
-            translator = self._instantiate_translator(translator, self.services, index)
-            result = translator.example(
-                text=text, destination_language=dest_lang, source_language=source_lang
-            )
+            with self._known_failures(index, "example", text, dest_lang, source_lang):
+                translator = self._instantiate_translator(translator, self.services, index)
+                result = translator.example(
+                    text=text, destination_language=dest_lang, source_language=source_lang
+                )
             if result is None:
                 raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
             return result
 
-        def _fast_example(queue: Queue, translator: BaseTranslator, index: int):
-            try:
-                queue.put(_example(translator=translator, index=index))
-            except Exception:
-                pass
+        def _fast_example(queue: Queue, translator: BaseTranslator, index: int, span: Span = None):
+            with attach(span):
+                try:
+                    queue.put(_example(translator=translator, index=index))
+                except Exception:
+                    pass
 
         if self.FAST_MODE:
             _queue = Queue()
+            span = current_span()
             threads = []
             for index, service in enumerate(self.services):
-                thread = Thread(target=_fast_example, args=(_queue, service, index))
+                thread = Thread(target=_fast_example, args=(_queue, service, index, span))
                 thread.start()
                 threads.append(thread)
             result = _queue.get(threads=threads)  # wait for a value and return it
@@ -380,6 +624,7 @@ class Translate():
         else:
             raise NoResult("No service has returned a valid result") from exception
 
+    @traced("Translate.dictionary")
     def dictionary(self, text: str, destination_language: str, source_language="auto") -> DictionaryResult:
         """
         Returns a list of translations that are classified between two categories: featured and less common
@@ -390,25 +635,28 @@ class Translate():
         source_lang = Language(source_language)
 
         def _dictionary(translator: BaseTranslator, index: int):
-            translator = self._instantiate_translator(translator, self.services, index)
-            result = translator.dictionary(
-                text=text, destination_language=dest_lang, source_language=source_lang
-            )
+            with self._known_failures(index, "dictionary", text, dest_lang, source_lang):
+                translator = self._instantiate_translator(translator, self.services, index)
+                result = translator.dictionary(
+                    text=text, destination_language=dest_lang, source_language=source_lang
+                )
             if result is None:
                 raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
             return result
 
-        def _fast_dictionary(queue: Queue, translator: BaseTranslator, index: int):
-            try:
-                queue.put(_dictionary(translator=translator, index=index))
-            except Exception:
-                pass
+        def _fast_dictionary(queue: Queue, translator: BaseTranslator, index: int, span: Span = None):
+            with attach(span):
+                try:
+                    queue.put(_dictionary(translator=translator, index=index))
+                except Exception:
+                    pass
 
         if self.FAST_MODE:
             _queue = Queue()
+            span = current_span()
             threads = []
             for index, service in enumerate(self.services):
-                thread = Thread(target=_fast_dictionary, args=(_queue, service, index))
+                thread = Thread(target=_fast_dictionary, args=(_queue, service, index, span))
                 thread.start()
                 threads.append(thread)
             result = _queue.get(threads=threads)  # wait for a value and return it
@@ -426,6 +674,7 @@ class Translate():
         else:
             raise NoResult("No service has returned a valid result") from exception
 
+    @traced("Translate.text_to_speech")
     def text_to_speech(self, text: str, speed: int = 100, gender: str = "female", source_language: str = "auto") -> TextToSpechResult:
         """
         Gives back the text to speech result for the given text
@@ -454,25 +703,28 @@ class Translate():
         source_lang = Language(source_language)
 
         def _text_to_speech(translator: BaseTranslator, index: int):
-            translator = self._instantiate_translator(translator, self.services, index)
-            result = translator.text_to_speech(
-                text=text, speed=speed, gender=gender, source_language=source_lang
-            )
+            with self._known_failures(index, "text_to_speech", text, None, source_lang, options=(gender, speed)):
+                translator = self._instantiate_translator(translator, self.services, index)
+                result = translator.text_to_speech(
+                    text=text, speed=speed, gender=gender, source_language=source_lang
+                )
             if result is None:
                 raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
             return result
 
-        def _fast_text_to_speech(queue: Queue, translator: BaseTranslator, index: int):
-            try:
-                queue.put(_text_to_speech(translator=translator, index=index))
-            except Exception:
-                pass
+        def _fast_text_to_speech(queue: Queue, translator: BaseTranslator, index: int, span: Span = None):
+            with attach(span):
+                try:
+                    queue.put(_text_to_speech(translator=translator, index=index))
+                except Exception:
+                    pass
 
         if self.FAST_MODE:
             _queue = Queue()
+            span = current_span()
             threads = []
             for index, service in enumerate(self.services):
-                thread = Thread(target=_fast_text_to_speech, args=(_queue, service, index))
+                thread = Thread(target=_fast_text_to_speech, args=(_queue, service, index, span))
                 thread.start()
                 threads.append(thread)
             result = _queue.get(threads=threads)  # wait for a value and return it
@@ -490,6 +742,111 @@ class Translate():
         else:
             raise NoResult("No service has returned a valid result") from exception
 
+    def _get_caches(self) -> Dict[str, List[LRUDictCache]]:
+        """
+        Returns the exportable caches of every service, by name
+        """
+        caches = {}
+        seen = set()
+        for service in self.services:
+            for name, attribute in EXPORTABLE_CACHES.items():
+                cache = getattr(service, attribute)  # the caches are class attributes
+                if id(cache) not in seen:
+                    seen.add(id(cache))
+                    caches.setdefault(name, []).append(cache)
+        return caches
+
+    def export_cache(self, file) -> int:
+        """
+        Exports the caches of the services to a JSON Lines file, which can be loaded back with `import_cache`
+
+        Parameters:
+        ----------
+            file : str | file-like object
+                The path of the file (compressed with gzip if it ends with ".gz") or a text file-like object
+
+        Returns:
+        --------
+            int:
+                The number of exported entries
+        """
+        return dump_caches(self._get_caches(), file)
+
+    def import_cache(self, file) -> int:
+        """
+        Loads the caches exported with `export_cache`
+
+        Parameters:
+        ----------
+            file : str | file-like object
+                The path of the file (compressed with gzip if it ends with ".gz") or a text file-like object
+
+        Returns:
+        --------
+            int:
+                The number of imported entries
+        """
+        return load_caches(self._get_caches(), file)
+
+    def warm_cache(self, texts: Iterable[str], destination_language: str, source_language: str = "auto", threads_limit: int = 8, batch_size: int = 50) -> Tuple[int, int]:
+        """
+        Translates the given texts to fill the caches (and the translation memory, if any)
+
+        Parameters:
+        ----------
+            texts : Iterable[str]
+                The texts to translate
+            destination_language : str
+                The language to translate the texts in
+            source_language : str, default = "auto"
+                The language of the texts
+            threads_limit : int, default = 8
+                The maximum number of batches translated at the same time
+            batch_size : int, default = 50
+                The number of texts translated together
+
+        Returns:
+        --------
+            tuple[int, int]:
+                The number of translated texts and the number of texts which couldn't be translated
+        """
+        texts = list({str(text): None for text in texts if remove_spaces(str(text)) != ""})  # removing the duplicates
+        batch_size = max(1, int(batch_size))
+        batches = [texts[index:index + batch_size] for index in range(0, len(texts), batch_size)]
+
+        def _warm(batch: List[str]) -> int:
+            try:
+                self.translate_batch(batch, destination_language, source_language)
+                return len(batch)
+            except Exception:  # translating each text separately to isolate the failures
+                translated = 0
+                for text in batch:
+                    try:
+                        self.translate(text, destination_language, source_language)
+                        translated += 1
+                    except Exception:
+                        pass
+                return translated
+
+        translated = sum(map_bounded(_warm, batches, limit=threads_limit))
+        return translated, len(texts) - translated
+
+    def stats(self, reset: bool = False) -> Dict[str, dict]:
+        """
+        Returns the metrics of the translators (latency and outcome of each method, requests and caches)
+
+        See `translatepy.utils.metrics.Metrics.snapshot` for the format
+
+        Parameters:
+        ----------
+            reset : bool
+                If the metrics should be cleared after being returned
+        """
+        snapshot = metrics.snapshot()
+        if reset:
+            metrics.reset()
+        return snapshot
+
     def clean_cache(self) -> None:
         """
         Cleans caches
@@ -498,4 +855,9 @@ class Translate():
             None
         """
         for service in self.services:
-            service.clean_cache()
+            if isinstance(service, BaseTranslator):
+                service.clean_cache()
+            else:  # not instantiated yet, the caches are class attributes
+                BaseTranslator.clean_cache(service)
+        if self._failures is not None:
+            self._failures.clear()
@@ -1,17 +1,22 @@
 from abc import ABCMeta, abstractmethod
-from multiprocessing.pool import ThreadPool
-from typing import Union
+from threading import Event
+from typing import Iterable, Iterator, Union
 
 from bs4 import BeautifulSoup
-from bs4.element import NavigableString, PageElement, PreformattedString, Tag
+from bs4.element import PageElement, Tag
 from translatepy.exceptions import ParameterTypeError, ParameterValueError, TranslatepyException, UnsupportedMethod, UnsupportedLanguage
 from translatepy.language import Language
 from translatepy.models import (DictionaryResult, ExampleResult,
                                 LanguageResult, SpellcheckResult,
                                 TextToSpechResult, TranslationResult,
                                 TransliterationResult)
-from translatepy.utils.annotations import List
-from translatepy.utils.lru_cacher import LRUDictCache
+from translatepy.utils.annotations import Dict, List, Tuple
+from translatepy.utils.chunking import split_text
+from translatepy.utils.detection import CONFIDENCE_THRESHOLD, detect_language
+from translatepy.utils.executor import map_bounded
+from translatepy.utils.lru_cacher import LRUDictCache, MeteredDictCache, cache_key, dump_caches, load_caches
+from translatepy.utils.markup import get_text_nodes, parse_html, translate_html_stream, translate_nodes
+from translatepy.utils.metrics import instrumented
 from translatepy.utils.sanitize import remove_spaces
 
 
@@ -27,6 +32,8 @@ class ABC(metaclass=ABCMeta):
 
 class BaseTranslateException(TranslatepyException):
     error_codes = {}
+    # the error codes which will be returned again for the same request (i.e an unsupported language)
+    deterministic_codes = set()
 
     def __init__(self, status_code: int = -1, message=None):
         unknown_status_code_msg = "Unknown error. Error code: {}".format(status_code)
@@ -39,30 +46,58 @@ class BaseTranslateException(TranslatepyException):
 
         super().__init__(self.message)
 
+    @property
+    def deterministic(self) -> bool:
+        """
+        If retrying the same request would fail the same way
+        """
+        return self.status_code in self.deterministic_codes
+
     def __str__(self):
         return "{} | {}".format(self.status_code, self.message)
 
 
-# TODO: Feat: support translating > 5000 characters (or just exception raising)
 # TODO: Feat: Some translation services give out a lot of useful information that can come in handy for programmers. I think we need implement separate models class for each Translator service
 # --> If these informations come from already using endpoints like the translation or transliteration endpoint we could make an "extra data" field with those informations
 # --> but if it is completely different endpoints, we could just add them to the Translator class or as an extra function in the classes which the user would be able to use by initiating their own translator.
 
+# The caches which can be exported (the text to speech results are not)
+EXPORTABLE_CACHES = {
+    "translations": "_translations_cache",
+    "transliterations": "_transliterations_cache",
+    "languages": "_languages_cache",
+    "spellchecks": "_spellchecks_cache",
+    "examples": "_examples_cache",
+    "dictionaries": "_dictionaries_cache"
+}
+
+
 class BaseTranslator(ABC):
     """
     Base abstract class for a translate service
     """
 
-    _translations_cache = LRUDictCache()
-    _transliterations_cache = LRUDictCache()
-    _languages_cache = LRUDictCache()
-    _spellchecks_cache = LRUDictCache()
-    _examples_cache = LRUDictCache()
-    _dictionaries_cache = LRUDictCache()
-    _text_to_speeches_cache = LRUDictCache(8)
+    _translations_cache = MeteredDictCache("translations")
+    _transliterations_cache = MeteredDictCache("transliterations")
+    _languages_cache = MeteredDictCache("languages")
+    _spellchecks_cache = MeteredDictCache("spellchecks")
+    _examples_cache = MeteredDictCache("examples")
+    _dictionaries_cache = MeteredDictCache("dictionaries")
+    _text_to_speeches_cache = MeteredDictCache("text_to_speeches", 8)
 
     _supported_languages = {}
 
+    # The maximum number of characters sent in a single translation request,
+    # longer texts are splitted into chunks which are translated separately
+    _max_text_length = 5000
+    # The maximum number of chunks of a long text translated at the same time
+    _chunks_threads_limit = 10
+
+    # The minimum confidence of the offline detection to resolve an automatic source language without any request
+    # (None disables the offline detection)
+    _local_detection_threshold = CONFIDENCE_THRESHOLD
+
+    @instrumented("translate")
     def translate(self, text: str, destination_language: str, source_language: str = "auto") -> TranslationResult:
         """
         Translates text from a given language to another specific language.
@@ -99,18 +134,7 @@ class BaseTranslator(ABC):
 
         self._validate_language_pair(source_code, dest_code)
 
-        # Build cache key
-        _cache_key = str({"t": text, "d": dest_code, "s": source_code})
-
-        if _cache_key in self._translations_cache:
-            # Taking the values from the cache
-            source_language, translation = self._translations_cache[_cache_key]
-        else:
-            # Call the private concrete implementation of the Translator to get the translation
-            source_language, translation = self._translate(text, dest_code, source_code)
-
-            # Cache the translation values to speed up the translation process in the future
-            self._translations_cache[_cache_key] = (source_language, translation)
+        source_language, translation = self._cached_translate(text, dest_code, source_code)
 
         # Return a `TranslationResult` object
         return TranslationResult(
@@ -129,13 +153,154 @@ class BaseTranslator(ABC):
         """
         raise UnsupportedMethod()
 
-    def translate_html(self, html: Union[str, PageElement, Tag, BeautifulSoup], destination_language: str, source_language: str = "auto", parser: str = "html.parser", threads_limit: int = 100) -> Union[str, PageElement, Tag, BeautifulSoup]:
+    def _cached_translate(self, text: str, destination_language: str, source_language: str) -> Tuple[str, str]:
+        """
+        Translates the text with the validated and normalized languages, using the cache if possible
+
+        Returns a tuple with (detected_language, result)
+        """
+        # Build cache key
+        _cache_key = cache_key(text, destination_language, source_language)
+
+        if _cache_key in self._translations_cache:
+            # Taking the values from the cache
+            return self._translations_cache[_cache_key]
+
+        if len(text) > self._max_text_length:
+            result = self._translate_chunks(text, destination_language, source_language)
+        else:
+            # Call the private concrete implementation of the Translator to get the translation
+            result = self._translate(text, destination_language, self._resolve_source_language(text, source_language))
+            self._remember_language(text, result[0], source_language)
+
+        # Cache the translation values to speed up the translation process in the future
+        self._translations_cache[_cache_key] = result
+        return result
+
+    def _translate_chunks(self, text: str, destination_language: str, source_language: str) -> Tuple[str, str]:
+        """
+        Translates a text longer than `_max_text_length` by splitting it on paragraphs and sentences boundaries.
+
+        The chunks are translated concurrently (and cached separately) before being joined back in order.
+
+        Returns a tuple with (detected_language, result)
+        """
+        chunks = split_text(text, self._max_text_length)
+        # every chunk is translated from the same language if it can be resolved beforehand
+        source_language = self._resolve_source_language(text, source_language)
+
+        def _translate_chunk(chunk: str) -> Tuple[str, str]:
+            content = chunk.strip()
+            if content == "":
+                return None, chunk
+            leading_spaces = chunk[:len(chunk) - len(chunk.lstrip())]
+            trailing_spaces = chunk[len(chunk.rstrip()):]
+            detected_language, translation = self._cached_translate(content, destination_language, source_language)
+            return detected_language, leading_spaces + translation + trailing_spaces
+
+        results = map_bounded(_translate_chunk, chunks, limit=self._chunks_threads_limit)
+
+        detected_language = next((language for language, _ in results if language is not None), source_language)
+        return detected_language, "".join(translation for _, translation in results)
+
+    @instrumented("translate_batch")
+    def translate_batch(self, texts: List[str], destination_language: str, source_language: str = "auto") -> List[TranslationResult]:
+        """
+        Translates multiple texts from a given language to another specific language.
+
+        Translators implementing `_translate_batch` are able to pack multiple texts in the same request,
+        the others will translate each text separately.
+
+        Parameters:
+        ----------
+            texts : list[str]
+                The texts to be translated.
+            destination_language : str
+                If str it expects the language code that the `texts` should be translated to.
+            source_language : str
+                If str it expects the code of the language that the `texts` are written in. When using the default value (`auto`),
+                the `Translator` will try to find the language automatically.
+
+        Returns:
+        --------
+            list[TranslationResult]:
+                The translation results, in the same order as `texts`.
+
+        """
+        texts = list(texts)
+
+        # Validate the texts
+        for text in texts:
+            self._validate_text(text)
+
+        # Validate the languages
+        dest_code = self._detect_and_validate_lang(destination_language)
+        source_code = self._detect_and_validate_lang(source_language)
+
+        self._validate_language_pair(source_code, dest_code)
+
+        results = [None] * len(texts)
+        # text --> indexes of the texts which are not cached yet (duplicates are only translated once)
+        pending = {}
+        for index, text in enumerate(texts):
+            # Build cache key
+            _cache_key = cache_key(text, dest_code, source_code)
+            if _cache_key in self._translations_cache:
+                # Taking the values from the cache
+                results[index] = self._translations_cache[_cache_key]
+            elif len(text) > self._max_text_length:
+                # Long texts are splitted into chunks which are translated separately
+                results[index] = self._cached_translate(text, dest_code, source_code)
+            else:
+                pending.setdefault(text, []).append(index)
+
+        if pending:
+            pending_texts = list(pending)
+            # Call the private concrete implementation of the Translator to get the translations
+            translations = self._translate_batch(pending_texts, dest_code, source_code)
+            for text, translation in zip(pending_texts, translations):
+                self._remember_language(text, translation[0], source_code)
+                # Cache the translation values to speed up the translation process in the future
+                self._translations_cache[cache_key(text, dest_code, source_code)] = translation
+                for index in pending[text]:
+                    results[index] = translation
+
+        # Return a list of `TranslationResult` objects
+        return [
+            TranslationResult(
+                service=self,
+                source=text,
+                source_language=self._language_denormalize(source_language),
+                destination_language=self._language_denormalize(destination_language),
+                result=translation,
+            )
+            for text, (source_language, translation) in zip(texts, results)
+        ]
+
+    def _translate_batch(self, texts: List[str], destination_language: str, source_language: str) -> List:
+        """
+        Private method that concrete Translators can implement to translate multiple texts with as few requests as possible.
+        Receives the validated and normalized parameters and must return a list of (source_language, translation) tuples,
+        in the same order as `texts`.
+
+        Defaults to translating each text separately.
+        """
+        return [self._translate(text, destination_language, source_language) for text in texts]
+
+    def _supports_batch(self) -> bool:
+        """
+        Returns True if the translator is able to translate multiple texts in the same request (implements `_translate_batch`)
+        """
+        return type(self)._translate_batch is not BaseTranslator._translate_batch
+
+    @instrumented("translate_html")
+    def translate_html(self, html: Union[str, PageElement, Tag, BeautifulSoup], destination_language: str, source_language: str = "auto", parser: str = "html.parser", threads_limit: int = 100, timeout: float = None, exclude: List[str] = None, attributes: List[str] = None, cancel: Event = None) -> Union[str, PageElement, Tag, BeautifulSoup]:
         """
         Translates the given HTML string or BeautifulSoup object to the given language
 
         i.e
          English: `<div class="hello"><h1>Hello</h1> everyone and <a href="/welcome">welcome</a> to <span class="w-full">my website</span></div>`
-         French: `<div class="hello"><h1>Bonjour</h1>tout le monde et<a href="/welcome">Bienvenue</a>à<span class="w-full">Mon site internet</span></div>`
+         French: `<div class="hello"><h1>Bonjour</h1> tout le monde et <a href="/welcome">Bienvenue</a> à <span class="w-full">Mon site internet</span></div>`
 
         Note: This method is not perfect since it is not tag/context aware. Example: `<span>Hello <strong>everyone</strong></span>` will not be understood as
         "Hello everyone" with "everyone" in bold but rather "Hello" and "everyone" separately.
@@ -155,7 +320,16 @@ class BaseTranslator(ABC):
             parser : str, default = "html.parser"
                 The parser that BeautifulSoup will use to parse the HTML string.
             threads_limit : int, default = 100
-                The maximum number of threads that will be spawned by translate_html
+                The maximum number of nodes translated at the same time (on the shared thread pool, see `translatepy.utils.executor`) when they can't be translated in batches
+            timeout : float, default = None
+                The maximum number of seconds to wait for the translations, the remaining ones are cancelled afterwards (raising `TimeoutError`)
+            exclude : list[str], default = None
+                CSS selectors of the elements which shouldn't be translated.
+                The content of <script>, <style>, <code> and <pre> elements and of the elements with the `notranslate` class or the `translate="no"` attribute is never translated.
+            attributes : list[str], default = None
+                The attributes to translate along with the text nodes (i.e `translatepy.utils.markup.TRANSLATABLE_ATTRIBUTES`: alt, title and placeholder)
+            cancel : threading.Event, default = None
+                An event which can be set (i.e from another thread) to cancel the remaining translations (raising `TimeoutError`)
 
         Returns:
         --------
@@ -169,22 +343,63 @@ class BaseTranslator(ABC):
         dest_lang = Language(destination_language)
         source_lang = Language(source_language)
 
-        def _translate(node: NavigableString):
-            try:
-                node.replace_with(self.translate(str(node), destination_language=dest_lang, source_language=source_lang).result)
-            except Exception:  # ignore if it couldn't find any result or an error occured
-                pass
+        def _translate(text: str) -> TranslationResult:
+            return self.translate(text, destination_language=dest_lang, source_language=source_lang)
 
-        if not isinstance(html, (PageElement, Tag, BeautifulSoup)):
-            page = BeautifulSoup(str(html), str(parser))
-        else:
-            page = html
-        # nodes = [tag.text for tag in page.find_all(text=True, recursive=True, attrs=lambda class_name: "notranslate" not in str(class_name).split()) if not isinstance(tag, (PreformattedString)) and remove_spaces(tag) != ""]
-        nodes = [tag for tag in page.find_all(text=True, recursive=True) if not isinstance(tag, (PreformattedString)) and remove_spaces(tag) != ""]
-        with ThreadPool(threads_limit) as pool:
-            pool.map(_translate, nodes)
+        def _translate_batch(texts: List[str]) -> List[TranslationResult]:
+            return self.translate_batch(texts, destination_language=dest_lang, source_language=source_lang)
+
+        page = parse_html(html, parser)
+        # identical nodes are translated once, and packed in a few requests if the translator supports it
+        translate_nodes(get_text_nodes(page, exclude, attributes), _translate, _translate_batch if self._supports_batch() else None, threads_limit, timeout, cancel)
         return page if isinstance(html, (PageElement, Tag, BeautifulSoup)) else str(page)
 
+    def translate_html_stream(self, html: Union[str, Iterable[str]], destination_language: str, source_language: str = "auto", window_size: int = 100, threads_limit: int = 100, timeout: float = None, exclude: List[str] = None, attributes: List[str] = None, cancel: Event = None) -> Iterator[str]:
+        """
+        Translates the given HTML incrementally and yields the translated HTML as soon as each part is translated
+
+        Contrary to `translate_html`, the whole document is never parsed nor kept in memory,
+        which makes it suitable for very large documents.
+
+        Parameters:
+        ----------
+            html : str | file-like object | Iterable[str]
+                The HTML to be translated. This can also be a file-like object or an iterable of strings (i.e a generator reading a file).
+            destination_language : str
+                The language the HTML needs to be translated in.
+            source_language : str, default = "auto"
+                The language of the HTML.
+            window_size : int, default = 100
+                The number of text nodes translated at once
+            threads_limit : int, default = 100
+                The maximum number of nodes translated at the same time (on the shared thread pool, see `translatepy.utils.executor`) when they can't be translated in batches
+            timeout : float, default = None
+                The maximum number of seconds to wait for the translations of each window, the remaining ones are cancelled afterwards (raising `TimeoutError`)
+            exclude : list[str], default = None
+                Simple CSS selectors (a tag name followed by classes and ids, i.e "div.notes#main") of the elements which shouldn't be translated.
+                The content of <script>, <style>, <code> and <pre> elements and of the elements with the `notranslate` class or the `translate="no"` attribute is never translated.
+            attributes : list[str], default = None
+                The attributes to translate along with the text nodes (i.e `translatepy.utils.markup.TRANSLATABLE_ATTRIBUTES`: alt, title and placeholder)
+            cancel : threading.Event, default = None
+                An event which can be set (i.e from another thread) to cancel the remaining translations (raising `TimeoutError`)
+
+        Yields:
+        -------
+            str:
+                The translated HTML, piece by piece
+        """
+        dest_lang = Language(destination_language)
+        source_lang = Language(source_language)
+
+        def _translate(text: str) -> TranslationResult:
+            return self.translate(text, destination_language=dest_lang, source_language=source_lang)
+
+        def _translate_batch(texts: List[str]) -> List[TranslationResult]:
+            return self.translate_batch(texts, destination_language=dest_lang, source_language=source_lang)
+
+        return translate_html_stream(html, _translate, _translate_batch if self._supports_batch() else None, window_size, threads_limit, timeout, exclude, attributes, cancel)
+
+    @instrumented("transliterate")
     def transliterate(self, text: str, destination_language: str, source_language: str = "auto") -> TransliterationResult:
         """
         Transliterates text from a given language to another specific language.
@@ -215,14 +430,15 @@ class BaseTranslator(ABC):
         self._validate_language_pair(source_code, dest_code)
 
         # Build cache key
-        _cache_key = str({"t": text, "d": dest_code, "s": source_code})
+        _cache_key = cache_key(text, dest_code, source_code)
 
         if _cache_key in self._transliterations_cache:
             # Taking the values from the cache
             source_language, transliteration = self._transliterations_cache[_cache_key]
         else:
             # Call the private concrete implementation of the Translator to get the transliteration
-            source_language, transliteration = self._transliterate(text, dest_code, source_code)
+            source_language, transliteration = self._transliterate(text, dest_code, self._resolve_source_language(text, source_code))
+            self._remember_language(text, source_language, source_code)
 
             # Cache the transliteration values to speed up the translation process in the future
             self._transliterations_cache[_cache_key] = (source_language, transliteration)
@@ -244,6 +460,7 @@ class BaseTranslator(ABC):
         """
         raise UnsupportedMethod()
 
+    @instrumented("spellcheck")
     def spellcheck(self, text: str, source_language: str = "auto") -> SpellcheckResult:
         """
         Checks text spelling in a given language.
@@ -269,14 +486,15 @@ class BaseTranslator(ABC):
         source_code = self._detect_and_validate_lang(source_language)
 
         # Build cache key
-        _cache_key = str({"t": text, "s": source_code})
+        _cache_key = cache_key(text, source_code)
 
         if _cache_key in self._spellchecks_cache:
             # Taking the values from the cache
             source_language, spellcheck = self._spellchecks_cache[_cache_key]
         else:
             # Call the private concrete implementation of the Translator to get the spellchecked text
-            source_language, spellcheck = self._spellcheck(text, source_code)
+            source_language, spellcheck = self._spellcheck(text, self._resolve_source_language(text, source_code))
+            self._remember_language(text, source_language, source_code)
 
             # Cache the spellcheck values to speed up the translation process in the future
             self._spellchecks_cache[_cache_key] = (source_language, spellcheck)
@@ -297,6 +515,7 @@ class BaseTranslator(ABC):
         """
         raise UnsupportedMethod()
 
+    @instrumented("language")
     def language(self, text: str) -> LanguageResult:
         """
         Detect the language of the text
@@ -313,19 +532,18 @@ class BaseTranslator(ABC):
         self._validate_text(text)
 
         # Build cache key
-        _cache_key = str({"t": text})
+        _cache_key = cache_key(text)
 
         if _cache_key in self._languages_cache:
             # Taking the values from the cache
-            language = self._languages_cache[_cache_key]
+            # The cache is shared by every translator, so it holds translatepy's language ids instead of the translators' codes
+            denormalized_lang = Language(self._languages_cache[_cache_key])
         else:
             # Call the private concrete implementation of the Translator to get the language
-            language = self._language(text)
+            denormalized_lang = self._language_denormalize(self._language(text))
 
             # Cache the languages values to speed up the translation process in the future
-            self._languages_cache[_cache_key] = language
-
-        denormalized_lang = self._language_denormalize(language)
+            self._languages_cache[_cache_key] = denormalized_lang.id
 
         # Return a `LanguageResult` object
         return LanguageResult(
@@ -342,6 +560,62 @@ class BaseTranslator(ABC):
         """
         raise UnsupportedMethod()
 
+    def _detect_language(self, text: str) -> str:
+        """
+        Detects the language of the text with `_language` and remembers it,
+        so that no translator needs to detect it again.
+
+        Concrete Translators should use it when they need to resolve an automatic source language
+        and their endpoint can't detect it by itself.
+        """
+        language_code = self._language(text)
+        self._remember_language(text, language_code)
+        return language_code
+
+    def _resolve_source_language(self, text: str, source_language: str) -> str:
+        """
+        Resolves an automatic source language with the language already detected for the text, if any,
+        or with the offline detection if it is confident enough,
+        so that the concrete implementations don't need to make a detection request.
+
+        Returns the given source language if it is not automatic or could not be resolved.
+        """
+        if source_language != self._language_normalize(Language("auto")):
+            return source_language
+
+        _cache_key = cache_key(text)
+        if _cache_key not in self._languages_cache:
+            if self._local_detection_threshold is None:
+                return source_language
+            language_id, confidence = detect_language(text)
+            if language_id is None or confidence < self._local_detection_threshold:
+                return source_language
+            self._languages_cache[_cache_key] = language_id
+
+        try:
+            return self._detect_and_validate_lang(Language(self._languages_cache[_cache_key]))
+        except Exception:  # the language is not supported by this translator
+            return source_language
+
+    def _remember_language(self, text: str, language_code: str, source_language: str = None) -> None:
+        """
+        Caches the language detected by a concrete implementation, to be reused by every translator
+
+        When the source language requested by the caller is given, the language is only remembered if it was automatic
+        (an explicit source language is not a detection and might be wrong)
+        """
+        if language_code is None:
+            return
+        if source_language is not None and source_language != self._language_normalize(Language("auto")):
+            return
+        try:
+            language = self._language_denormalize(language_code)
+        except Exception:  # the returned code might not be understood
+            return
+        if language.id != "auto":
+            self._languages_cache[cache_key(text)] = language.id
+
+    @instrumented("example")
     def example(self, text: str, destination_language: str, source_language: str = "auto") -> ExampleResult:
         """
         Returns a set of examples
@@ -379,14 +653,15 @@ class BaseTranslator(ABC):
         self._validate_language_pair(source_code, dest_code)
 
         # Build cache key
-        _cache_key = str({"t": text, "d": dest_code, "s": source_code})
+        _cache_key = cache_key(text, dest_code, source_code)
 
         if _cache_key in self._examples_cache:
             # Taking the values from the cache
             source_language, example = self._examples_cache[_cache_key]
         else:
             # Call the private concrete implementation of the Translator to get the examples
-            source_language, example = self._example(text, dest_code, source_code)
+            source_language, example = self._example(text, dest_code, self._resolve_source_language(text, source_code))
+            self._remember_language(text, source_language, source_code)
 
             # Cache the translation values to speed up the translation process in the future
             self._examples_cache[_cache_key] = (source_language, example)
@@ -408,6 +683,7 @@ class BaseTranslator(ABC):
         """
         raise UnsupportedMethod()
 
+    @instrumented("dictionary")
     def dictionary(self, text: str, destination_language: str, source_language: str = "auto") -> DictionaryResult:
         """
         Returns a list of dictionary results.
@@ -445,14 +721,15 @@ class BaseTranslator(ABC):
         self._validate_language_pair(source_code, dest_code)
 
         # Build cache key
-        _cache_key = str({"t": text, "d": dest_code, "s": source_code})
+        _cache_key = cache_key(text, dest_code, source_code)
 
         if _cache_key in self._dictionaries_cache:
             # Taking the values from the cache
             source_language, dictionary = self._dictionaries_cache[_cache_key]
         else:
             # Call the private concrete implementation of the Translator to get the dictionary result
-            source_language, dictionary = self._dictionary(text, dest_code, source_code)
+            source_language, dictionary = self._dictionary(text, dest_code, self._resolve_source_language(text, source_code))
+            self._remember_language(text, source_language, source_code)
 
             # Cache the translation values to speed up the translation process in the future
             self._dictionaries_cache[_cache_key] = (source_language, dictionary)
@@ -474,6 +751,7 @@ class BaseTranslator(ABC):
         """
         raise UnsupportedMethod()
 
+    @instrumented("text_to_speech")
     def text_to_speech(self, text: str, speed: int = 100, gender: str = "female", source_language: str = "auto") -> TextToSpechResult:
         """
         Gives back the text to speech result for the given text
@@ -506,14 +784,15 @@ class BaseTranslator(ABC):
             raise ParameterTypeError("Parameter 'speed' must be an integer, {} was given".format(type(speed).__name__))
 
         # Build cache key
-        _cache_key = str({"t": text, "sp": speed, "s": source_code, "g": gender})
+        _cache_key = cache_key(text, speed, source_code, gender)
 
         if _cache_key in self._text_to_speeches_cache:
             # Taking the values from the cache
             source_language, text_to_speech = self._text_to_speeches_cache[_cache_key]
         else:
             # Call the private concrete implementation of the Translator to get text to spech result
-            source_language, text_to_speech = self._text_to_speech(text, speed, gender, source_code)
+            source_language, text_to_speech = self._text_to_speech(text, speed, gender, self._resolve_source_language(text, source_code))
+            self._remember_language(text, source_language, source_code)
 
             # Cache the text to spech result to speed up the translation process in the future
             self._text_to_speeches_cache[_cache_key] = (source_language, text_to_speech)
@@ -602,6 +881,44 @@ class BaseTranslator(ABC):
         self._examples_cache.clear()
         self._dictionaries_cache.clear()
 
+    def _get_caches(self) -> Dict[str, List[LRUDictCache]]:
+        """
+        Returns the exportable caches, by name
+        """
+        return {name: [getattr(self, attribute)] for name, attribute in EXPORTABLE_CACHES.items()}
+
+    def export_cache(self, file) -> int:
+        """
+        Exports the caches to a JSON Lines file, which can be loaded back with `import_cache`
+
+        Parameters:
+        ----------
+            file : str | file-like object
+                The path of the file (compressed with gzip if it ends with ".gz") or a text file-like object
+
+        Returns:
+        --------
+            int:
+                The number of exported entries
+        """
+        return dump_caches(self._get_caches(), file)
+
+    def import_cache(self, file) -> int:
+        """
+        Loads the caches exported with `export_cache`
+
+        Parameters:
+        ----------
+            file : str | file-like object
+                The path of the file (compressed with gzip if it ends with ".gz") or a text file-like object
+
+        Returns:
+        --------
+            int:
+                The number of imported entries
+        """
+        return load_caches(self._get_caches(), file)
+
     def __str__(self) -> str:
         """
         String representation of a translator.
@@ -60,10 +60,17 @@ class BingExampleResult():
         return str(self.source)
 
 
+def session_file_path(request: Request, filename: str) -> str:
+    """
+    Returns the path of the given session file, in the session directory of the request (the translators directory by default)
+    """
+    return os.path.join(getattr(request, "session_directory", None) or HOME_DIR, filename)
+
+
 class BingSessionManager():
-    def __init__(self, request: Request, captcha_callback: Callable[[str], str] = None):
+    def __init__(self, request: Request, captcha_callback: Callable[[str], str] = None, session_file: str = None):
         self.session = request
-        self._auth_session_file = JSONFile(os.path.join(HOME_DIR, ".bing_translatepy"), blocking=False)
+        self._auth_session_file = JSONFile(session_file or session_file_path(request, ".bing_translatepy"), blocking=False)
         with self._auth_session_file as _auth_session:
             _auth_session_data = _auth_session.read()
         self.ig, self.iid, self.key, self.token, self.cookies = _auth_session_data.get("id"), _auth_session_data.get("iid"), _auth_session_data.get("key"), _auth_session_data.get("token"), _auth_session_data.get("cookies")
@@ -152,6 +159,7 @@ class BingTranslate(BaseTranslator):
     """
 
     _supported_languages = {'auto-detect', 'af', 'sq', 'am', 'ar', 'hy', 'as', 'az', 'bn', 'bs', 'bg', 'my', 'ca', 'ca', 'zh-Hans', 'cs', 'da', 'nl', 'nl', 'en', 'et', 'fj', 'fil', 'fil', 'fi', 'fr', 'fr-ca', 'de', 'ga', 'el', 'gu', 'ht', 'ht', 'he', 'hi', 'hr', 'hu', 'is', 'iu', 'id', 'it', 'ja', 'kn', 'kk', 'km', 'ko', 'ku', 'lo', 'lv', 'lt', 'ml', 'mi', 'mr', 'ms', 'mg', 'mt', 'ne', 'nb', 'nb', 'or', 'pa', 'pa', 'fa', 'pl', 'pt', 'ps', 'ps', 'ro', 'ro', 'ro', 'ru', 'sk', 'sl', 'sm', 'es', 'es', 'sr-Cyrl', 'sw', 'sv', 'ty', 'ta', 'te', 'th', 'ti', 'tlh-Latn', 'tlh-Latn', 'to', 'tr', 'uk', 'ur', 'vi', 'cy', 'zh-Hans', 'zh-Hant', 'yue', 'prs', 'mww', 'tlh-Piqd', 'kmr', 'pt-pt', 'otq', 'sr-Cyrl', 'sr-Latn', 'yua'}
+    _max_text_length = 1000  # the limit of Bing's web translator
 
     def __init__(self, request: Request = Request()):
         self.session_manager = BingSessionManager(request)
@@ -167,7 +175,7 @@ class BingTranslate(BaseTranslator):
 
     def _example(self, text, destination_language, source_language) -> str:
         if source_language == "auto-detect":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         _detected_language, translation = self._translate(text, destination_language, source_language)
 
@@ -176,7 +184,7 @@ class BingTranslate(BaseTranslator):
 
     def _spellcheck(self, text: str, source_language: str) -> str:
         if source_language == "auto-detect":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         response = self.session_manager.send("https://www.bing.com/tspellcheckv3", data={'text': text, 'fromLang': source_language})
         result = response["correctedText"]
@@ -201,7 +209,7 @@ class BingTranslate(BaseTranslator):
 
     def _dictionary(self, text: str, destination_language: str, source_language: str):
         if source_language == "auto-detect":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         response = self.session_manager.send("https://www.bing.com/tlookupv3", data={'text': text, 'from': source_language, 'to': destination_language})
         _result = []
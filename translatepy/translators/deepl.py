@@ -10,16 +10,17 @@ About the translation and the language endpoints:
 """
 
 from time import time, sleep
-from re import compile
 from random import randint
 from bs4 import BeautifulSoup
 
 from translatepy.language import Language
 from translatepy.translators.base import BaseTranslator, BaseTranslateException
 from translatepy.utils.annotations import Tuple, List
+from translatepy.utils.chunking import SENTENCES_SPLITTING_REGEX
 from translatepy.utils.request import Request
 
-SENTENCES_SPLITTING_REGEX = compile('(?<=[.!:?])\s+')
+# the maximum number of jobs (sentences) sent in a single `LMT_handle_jobs` request
+MAX_JOBS_PER_REQUEST = 50
 
 
 class DeeplTranslateException(BaseTranslateException):
@@ -116,36 +117,129 @@ class DeeplTranslate(BaseTranslator):
 
         Returned tuple: (Result, Computed Language (None if same as source_language))
         """
-        REGEX_SPLIT = True
+        sentences, computed_lang = self._split_texts_into_sentences([text], destination_language, source_language)
+        return sentences[0], computed_lang
 
-        if REGEX_SPLIT is True:
-            SENTENCES_SPLITTING_REGEX.split(text), None
+    def _split_texts_into_sentences(self, texts: List[str], destination_language: str, source_language: str) -> Tuple[List[List[str]], str]:
+        """
+        Split multiple strings into sentences using a single DeepL API call.\n
+        Fallbacks to a simple Regex splitting if an error occurs or no result is found
 
+        Returned tuple: (Result for each text, Computed Language (None if same as source_language))
+        """
         params = {
-            "texts": [text.strip()],  # What for need strip there?
+            "texts": [text.strip() for text in texts],  # What for need strip there?
             "lang": {
                 "lang_user_selected": source_language,
                 "user_preferred_langs": list(set(self.user_preferred_langs + [destination_language]))
             }
         }
-        resp = self.jsonrpc.send_jsonrpc("LMT_split_into_sentences", params)
+        try:
+            resp = self.jsonrpc.send_jsonrpc("LMT_split_into_sentences", params)
+            splitted_texts = resp["splitted_texts"]
+            if len(splitted_texts) != len(texts):
+                raise ValueError("translatepy internal exception: DeepL did not split every text")
+        except Exception:
+            return [SENTENCES_SPLITTING_REGEX.split(text.strip()) for text in texts], None
 
-        return resp["splitted_texts"][0], resp["lang"]
+        return splitted_texts, resp["lang"]
 
     def _translate(self, text: str, destination_language: str, source_language: str) -> str:
-        priority = 1
-        quality = ""
-
-        # splitting the text into sentences
-        sentences, computed_lang = self._split_into_sentences(text, destination_language, source_language)
+        return self._translate_batch([text], destination_language, source_language)[0]
+
+    def _translate_batch(self, texts: List[str], destination_language: str, source_language: str) -> List:
+        if source_language != self._language_normalize(Language("auto")):
+            return self._translate_texts(texts, destination_language, source_language)
+
+        # DeepL computes a single source language for each request:
+        # the texts are grouped by their already known or offline detected language,
+        # and the texts in an unknown language are translated separately
+        results = [None] * len(texts)
+        groups = {}
+        for index, text in enumerate(texts):
+            language = self._resolve_source_language(text, source_language)
+            if language == source_language:
+                results[index] = self._translate_texts([text], destination_language, source_language)[0]
+            else:
+                groups.setdefault(language, []).append(index)
+        for language, indexes in groups.items():
+            translations = self._translate_texts([texts[index] for index in indexes], destination_language, language)
+            for index, translation in zip(indexes, translations):
+                results[index] = translation
+        return results
+
+    def _translate_texts(self, texts: List[str], destination_language: str, source_language: str) -> List:
+        """
+        Translates the given texts, written in the same source language, in as few `LMT_handle_jobs` requests as possible
+        """
+        # splitting the texts into sentences
+        splitted_texts, computed_lang = self._split_texts_into_sentences(texts, destination_language, source_language)
+
+        # building the jobs of every text, keeping the context of the sentences of each text
+        texts_jobs = [self._build_jobs(sentences) for sentences in splitted_texts]
+        translations = [[] for _ in texts_jobs]
+        detected_languages = [source_language] * len(texts_jobs)
+
+        for batch in self._make_batches(texts_jobs):
+            response = self._handle_jobs([job for _, jobs in batch for job in jobs], destination_language, source_language, computed_lang)
+
+            try:
+                _detected_language = response["source_lang"]
+            except Exception:
+                _detected_language = source_language
+
+            # mapping the translations back to their texts
+            position = 0
+            for index, jobs in batch:
+                translations[index].extend(
+                    obj["beams"][0]["postprocessed_sentence"]
+                    for obj in response["translations"][position:position + len(jobs)]
+                    if obj["beams"]
+                )
+                position += len(jobs)
+                detected_languages[index] = _detected_language
+        return [(language, " ".join(sentences)) for language, sentences in zip(detected_languages, translations)]
+
+    def _make_batches(self, texts_jobs: List[List[dict]]) -> List[List[tuple]]:
+        """
+        Groups the jobs of the texts so that each `LMT_handle_jobs` request holds as many texts as possible,
+        without going over `MAX_JOBS_PER_REQUEST` jobs.\n
+        The jobs of a text are only separated when the text alone has too many sentences.
 
-        # building the a job per sentence
-        jobs = self._build_jobs(sentences, quality)
+        Each batch is a list of (text index, jobs) tuples.
+        """
+        batches = []
+        current_batch = []
+        current_jobs = 0
+        for index, jobs in enumerate(texts_jobs):
+            if current_batch and len(jobs) <= MAX_JOBS_PER_REQUEST and current_jobs + len(jobs) > MAX_JOBS_PER_REQUEST:
+                batches.append(current_batch)
+                current_batch = []
+                current_jobs = 0
+            # the texts with too many sentences fill the current request and continue in the next ones
+            while current_jobs + len(jobs) > MAX_JOBS_PER_REQUEST:
+                room = MAX_JOBS_PER_REQUEST - current_jobs
+                current_batch.append((index, jobs[:room]))
+                batches.append(current_batch)
+                jobs = jobs[room:]
+                current_batch = []
+                current_jobs = 0
+            current_batch.append((index, jobs))
+            current_jobs += len(jobs)
+        if current_batch:
+            batches.append(current_batch)
+        return batches
+
+    def _handle_jobs(self, jobs: List[dict], destination_language: str, source_language: str, computed_lang: str) -> dict:
+        """
+        Sends the given jobs to DeepL in a single `LMT_handle_jobs` request
+        """
+        priority = 1
 
         # timestamp generation
         i_count = 1
-        for sentence in sentences:
-            i_count += sentence.count("i")
+        for job in jobs:
+            i_count += job["raw_en_sentence"].count("i")
         ts = int(time() * 10) * 100 + 1000
 
         # params building
@@ -159,22 +253,13 @@ class DeeplTranslate(BaseTranslator):
             "timestamp": ts + (i_count - ts % i_count)
         }
 
-        if source_language == "auto":
+        if source_language == self._language_normalize(Language("auto")) and computed_lang:
             params["lang"]["source_lang_computed"] = computed_lang
             params["lang"]["user_preferred_langs"].append(computed_lang)
         else:
             params["lang"]["source_lang_user_selected"] = source_language
 
-        results = self.jsonrpc.send_jsonrpc("LMT_handle_jobs", params)
-
-        try:
-            _detected_language = results["source_lang"]
-        except:
-            _detected_language = source_language
-
-        if results is not None:
-            translations = results["translations"]
-            return _detected_language, " ".join(obj["beams"][0]["postprocessed_sentence"] for obj in translations if obj["beams"])
+        return self.jsonrpc.send_jsonrpc("LMT_handle_jobs", params)
 
     def _language(self, text: str) -> str:
         priority = 1
@@ -216,7 +301,7 @@ class DeeplTranslate(BaseTranslator):
 
     def _dictionary(self, text: str, destination_language: str, source_language: str) -> str:
         if source_language == "AUTO":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         destination_language = Language(destination_language).name.lower()
         source_language = Language(source_language).name.lower()
@@ -9,10 +9,12 @@ Class GoogleTranslateV2 uses official API methods that are used in Google Transl
 """
 
 from json import dumps, loads
+from urllib.parse import urlencode
 
-from translatepy.exceptions import ServiceURLError, UnsupportedMethod
+from translatepy.exceptions import ServiceURLError, TranslationError, UnsupportedMethod
 from translatepy.language import Language
 from translatepy.translators.base import BaseTranslator
+from translatepy.utils.annotations import List
 from translatepy.utils.gtoken import TokenAcquirer
 from translatepy.utils.request import Request
 from translatepy.utils.utils import convert_to_float
@@ -56,6 +58,12 @@ DOMAINS = {
 
 }
 
+# the maximum length of the encoded texts sent in the URL of a batch request before switching to a POST request
+BATCH_URL_LENGTH_LIMIT = 2000
+# the maximum number of characters and texts sent in a single batch request
+BATCH_CHARACTERS_LIMIT = 5000
+BATCH_TEXTS_LIMIT = 128
+
 _google_supported_languages = {'auto', 'af', 'sq', 'am', 'ar', 'hy', 'az', 'eu', 'be', 'bn', 'bs', 'bg', 'my', 'ca', 'ca', 'ceb', 'zh-cn', 'co', 'cs', 'da', 'nl', 'nl', 'en', 'eo', 'et', 'fi', 'fr', 'fy', 'ka', 'de', 'gd', 'gd', 'ga', 'gl', 'el', 'gu', 'ht', 'ht', 'ha', 'haw', 'he', 'hi', 'hr', 'hu', 'ig', 'is', 'id', 'it', 'jw', 'ja', 'kn', 'kk', 'km', 'ky', 'ky', 'ko', 'ku', 'lo', 'la', 'lv', 'lt', 'lb', 'lb', 'mk', 'ml', 'mi', 'mr', 'ms', 'mg', 'mt', 'mn', 'ne', 'no', 'ny', 'ny', 'ny', 'or', 'pa', 'pa', 'fa', 'pl', 'pt', 'ps', 'ps', 'ro', 'ro', 'ro', 'ru', 'si', 'si', 'sk', 'sl', 'sm', 'sn', 'sd', 'so', 'st', 'es', 'es', 'sr', 'su', 'sw', 'sv', 'ta', 'te', 'tg', 'tl', 'th', 'tr', 'ug', 'ug', 'uk', 'ur', 'uz', 'vi', 'cy', 'xh', 'yi', 'yo', 'zu', 'zh-CN', 'zh-TW'}
 
 
@@ -73,6 +81,8 @@ class GoogleTranslate(BaseTranslator):
         google_v2 = GoogleTranslateV2(service_url=service_url, request=request)
 
         self.services = [google_v1, google_v2]
+        # GoogleTranslateV2 is able to send multiple texts in a single request
+        self.batch_services = [google_v2, google_v1]
 
     def _translate(self, text, destination_language, source_language):
         exception = None
@@ -85,6 +95,17 @@ class GoogleTranslate(BaseTranslator):
         else:
             raise exception
 
+    def _translate_batch(self, texts, destination_language, source_language):
+        exception = None
+        for service in self.batch_services:
+            try:
+                return service._translate_batch(texts, destination_language, source_language)
+            except Exception as ex:
+                exception = ex
+                continue
+        else:
+            raise exception
+
     def _transliterate(self, text, destination_language, source_language):
         exception = None
         for service in self.services:
@@ -331,41 +352,43 @@ class GoogleTranslateV2(BaseTranslator):
         self.service_url = service_url
         self.token_acquirer = TokenAcquirer(service_url)
 
+        self._endpoints = [self._translate_gtx, self._translate_dict_chrome_ex, self._translate_gtx_bubble, self._translate_gtx_input]
+        # the index of the endpoint which last succeeded
+        self._preferred_endpoint = 0
+
     def _translate(self, text: str, destination_language: str, source_language: str) -> str:
+        # the endpoint which last succeeded is tried first, to avoid going through the known failing ones
+        endpoints = sorted(range(len(self._endpoints)), key=lambda index: index != self._preferred_endpoint)
+        for index in endpoints:
+            try:
+                result = self._endpoints[index](text, destination_language, source_language)
+            except Exception:  # if it fails, continue with the other endpoints
+                continue
+            if result is not None:
+                self._preferred_endpoint = index
+                return result
+
+    def _translate_gtx(self, text: str, destination_language: str, source_language: str):
         params = {"client": "gtx", "dt": "t", "sl": source_language, "tl": destination_language, "q": text}
         request = self.session.get("https://translate.googleapis.com/translate_a/single", params=params)
-        response = request.json()
         if request.status_code < 400:
+            response = request.json()
             try:
                 _detected_language = response[2]
             except Exception:
                 _detected_language = source_language
             return _detected_language, "".join([sentence[0] for sentence in response[0]])
 
-        params = {"client": "dict-chrome-ex", "sl": source_language, "tl": destination_language, "q": text}
-        request = self.session.get("https://clients5.google.com/translate_a/t", params=params)
-        response = request.json()
-        if request.status_code < 400:
-            try:
-                try:
-                    _detected_language = response['ld_result']["srclangs"][0]
-                except Exception:
-                    _detected_language = source_language
-                return "".join((sentence["trans"] if "trans" in sentence else "") for sentence in response["sentences"])
-            except Exception:
-                try:
-                    try:
-                        _detected_language = response[0][0][2]
-                    except Exception:
-                        _detected_language = source_language
-                    return "".join(sentence for sentence in response[0][0][0][0])
-                except Exception:  # if it fails, continue with the other endpoints
-                    pass
+    def _translate_dict_chrome_ex(self, text: str, destination_language: str, source_language: str):
+        result = self._request_dict_chrome_ex([text], destination_language, source_language)
+        if result is not None:
+            return result[0]
 
+    def _translate_gtx_bubble(self, text: str, destination_language: str, source_language: str):
         params = {"dt": ["t", "bd", "ex", "ld", "md", "qca", "rw", "rm", "ss", "t", "at"], "client": "gtx", "q": text, "hl": destination_language, "sl": source_language, "tl": destination_language, "dj": "1", "source": "bubble"}
         request = self.session.get("https://translate.googleapis.com/translate_a/single", params=params)
-        response = request.json()
         if request.status_code < 400:
+            response = request.json()
             try:
                 _detected_language = response.get("src", None)
                 if _detected_language is None:
@@ -376,16 +399,89 @@ class GoogleTranslateV2(BaseTranslator):
                 _detected_language = source_language
             return _detected_language, " ".join([sentence["trans"] for sentence in response["sentences"] if "trans" in sentence])
 
+    def _translate_gtx_input(self, text: str, destination_language: str, source_language: str):
         params = {"client": "gtx", "dt": ["t", "bd"], "dj": "1", "source": "input", "q": text, "sl": source_language, "tl": destination_language}
         request = self.session.get("https://translate.googleapis.com/translate_a/single", params=params)
-        response = request.json()
         if request.status_code < 400:
+            response = request.json()
             try:
                 _detected_language = response["src"]
             except Exception:
                 _detected_language = source_language
             return _detected_language, "".join([sentence["trans"] for sentence in response["sentences"] if "trans" in sentence])
 
+    def _request_dict_chrome_ex(self, texts: List[str], destination_language: str, source_language: str):
+        """
+        Translates multiple texts at once using the `dict-chrome-ex` endpoint, which accepts multiple `q` parameters
+
+        Returns a list of (source_language, translation) tuples or None if the request failed
+        """
+        params = {"client": "dict-chrome-ex", "sl": source_language, "tl": destination_language}
+        if len(urlencode({"q": texts}, doseq=True)) <= BATCH_URL_LENGTH_LIMIT:
+            params["q"] = texts
+            request = self.session.get("https://clients5.google.com/translate_a/t", params=params)
+        else:  # too long to fit in the URL
+            request = self.session.post("https://clients5.google.com/translate_a/t", params=params, data={"q": texts})
+
+        if request.status_code >= 400:
+            return None
+
+        response = request.json()
+
+        if isinstance(response, dict):  # older format, only used with a single text
+            try:
+                _detected_language = response["ld_result"]["srclangs"][0]
+            except Exception:
+                _detected_language = source_language
+            return [(_detected_language, "".join((sentence["trans"] if "trans" in sentence else "") for sentence in response["sentences"]))]
+
+        results = []
+        for element in response:
+            # [translation, detected_language] when the source language is "auto", translation otherwise
+            if isinstance(element, list):
+                _detected_language = element[1] if len(element) > 1 else source_language
+                element = element[0]
+            else:
+                _detected_language = source_language
+            results.append((_detected_language, str(element)))
+
+        if len(results) != len(texts):
+            return None
+        return results
+
+    def _translate_batch(self, texts: List[str], destination_language: str, source_language: str) -> List:
+        results = []
+        for batch in self._make_batches(texts):
+            try:
+                result = self._request_dict_chrome_ex(batch, destination_language, source_language)
+            except Exception:
+                result = None
+            if result is None:  # fallback to translating each text with the other endpoints
+                result = [self._translate(text, destination_language, source_language) for text in batch]
+                if None in result:
+                    raise TranslationError("Google Translate could not translate all of the given texts")
+            results.extend(result)
+        return results
+
+    def _make_batches(self, texts: List[str]) -> List[List[str]]:
+        """
+        Splits the given texts in batches fitting in a single `dict-chrome-ex` request
+        """
+        batches = []
+        current_batch = []
+        current_length = 0
+        for text in texts:
+            length = len(text)
+            if current_batch and (current_length + length > BATCH_CHARACTERS_LIMIT or len(current_batch) >= BATCH_TEXTS_LIMIT):
+                batches.append(current_batch)
+                current_batch = []
+                current_length = 0
+            current_batch.append(text)
+            current_length += length
+        if current_batch:
+            batches.append(current_batch)
+        return batches
+
     def _transliterate(self, text: str, destination_language: str, source_language: str) -> str:
         params = {"dt": ["t", "bd", "ex", "ld", "md", "qca", "rw", "rm", "ss", "t", "at"], "client": "gtx", "q": text, "hl": destination_language, "sl": source_language, "tl": destination_language, "dj": "1", "source": "bubble"}
         request = self.session.get("https://translate.googleapis.com/translate_a/single", params=params)
@@ -408,7 +504,7 @@ class GoogleTranslateV2(BaseTranslator):
 
     def _text_to_speech(self, text: str, speed: int, gender: str, source_language: str) -> bytes:
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         params = {"client": "gtx", "ie": "UTF-8", "tl": source_language, "q": text}
         request = self.session.get("https://translate.googleapis.com/translate_tts", params=params)
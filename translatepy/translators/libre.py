@@ -18,10 +18,14 @@ class LibreTranslate(BaseTranslator):
 
         Must return a tuple with (detected_language, result)
         """
-        if source_language == "auto":
-            source_language = self._language(text)
+        # LibreTranslate detects the language by itself when the source is "auto"
         response = self.session.post("https://libretranslate.com/translate", data={"q": str(text), "source": str(source_language), "target": str(destination_language)}, headers={"Origin": "https://libretranslate.com", "Host": "libretranslate.com", "Referer": "https://libretranslate.com/"})
-        return source_language, response.json()["translatedText"]
+        response = response.json()
+        try:
+            _detected_language = response["detectedLanguage"]["language"]
+        except Exception:
+            _detected_language = source_language
+        return _detected_language, response["translatedText"]
 
     def _language(self, text: str) -> str:
         """
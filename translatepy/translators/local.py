@@ -0,0 +1,46 @@
+"""
+Offline language detection
+
+This implementation doesn't make any request and only supports the language detection,
+see `translatepy.utils.detection`
+"""
+
+from translatepy.exceptions import NoResult
+from translatepy.language import Language
+from translatepy.translators.base import BaseTranslator
+from translatepy.utils.detection import CONFIDENCE_THRESHOLD, detect_language
+
+
+class LocalTranslate(BaseTranslator):
+    """
+    translatepy's offline language detector
+    """
+
+    def __init__(self, threshold: float = CONFIDENCE_THRESHOLD):
+        """
+        Parameters:
+        ----------
+            threshold : float
+                The minimum confidence needed for a detection to be returned
+        """
+        self.threshold = float(threshold)
+
+    def _language(self, text: str) -> str:
+        """
+        This is the language detection endpoint
+
+        Must return a string with the language code
+        """
+        language_id, confidence = detect_language(text)
+        if language_id is None or confidence < self.threshold:
+            raise NoResult("The language of the text could not be detected confidently ({:.2f} < {:.2f})".format(confidence, self.threshold))
+        return language_id
+
+    def _language_normalize(self, language: Language) -> str:
+        return language.id
+
+    def _language_denormalize(self, language_code: str) -> Language:
+        return Language(language_code)
+
+    def __str__(self) -> str:
+        return "Local"
@@ -7,17 +7,31 @@ import re
 import os
 import uuid
 import time
+from threading import Lock, Timer
+from weakref import WeakSet
 from safeIO import JSONFile
 
-from translatepy.exceptions import UnsupportedMethod
+from translatepy.exceptions import UnsupportedLanguage
 from translatepy.language import Language
 from translatepy.translators.base import BaseTranslateException, BaseTranslator
 from translatepy.utils.request import Request
-from translatepy.utils.annotations import Callable, Dict
-from translatepy.translators.bing import BingSessionManager, BingExampleResult
+from translatepy.utils.annotations import Callable, Dict, List
+from translatepy.translators.bing import BingSessionManager, BingExampleResult, session_file_path
 
 HOME_DIR = os.path.abspath(os.path.dirname(__file__))
 
+# the maximum number of elements and characters accepted by the API in a single request
+MAX_ARRAY_ELEMENTS = 100
+MAX_REQUEST_CHARACTERS = 10000
+
+# the number of seconds before the token expiration at which it gets refreshed in the background
+TOKEN_REFRESH_MARGIN = 60
+# the number of seconds waited before retrying a failed background refresh, doubled after each failure
+TOKEN_REFRESH_RETRY_DELAY = 5
+TOKEN_REFRESH_MAX_RETRY_DELAY = 300
+# the number of seconds the text to speech voices list is kept in cache
+VOICES_CACHE_DURATION = 3600
+
 
 class MicrosoftException(BaseTranslateException):
     error_codes = {
@@ -25,19 +39,116 @@ class MicrosoftException(BaseTranslateException):
     }
 
 
+class TokenRefresher():
+    def __init__(self, path: str) -> None:
+        """
+        Refreshes the authentication token of the sessions sharing the given session file in the background,
+        shortly before it expires, so that no request has to wait for it
+
+        A single refresher (and timer) is used for every MicrosoftSessionManager using the same session file,
+        and it only holds weak references to them, so that they can still be garbage collected.
+        Use `get_refresher` to get the refresher of a session file.
+        """
+        self.path = path
+        self.managers = WeakSet()
+        self.failures = 0
+        self._timer = None
+        self._lock = Lock()
+
+    def add(self, manager: "MicrosoftSessionManager") -> None:
+        """
+        Registers the given session and schedules the refresh of its token
+        """
+        with self._lock:
+            self.managers.add(manager)
+        self.schedule(manager._token_expiries)
+
+    def schedule(self, expiries: float = None, delay: float = None) -> None:
+        """
+        Schedules the next refresh, TOKEN_REFRESH_MARGIN seconds before the token `expiries` or after `delay` seconds
+        """
+        if delay is None:
+            delay = max(expiries - time.time() - TOKEN_REFRESH_MARGIN, 0)
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = Timer(delay, self.refresh)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def refreshed(self, manager: "MicrosoftSessionManager") -> None:
+        """
+        Shares the new token of the given session with the other sessions and schedules its next refresh
+        """
+        self.failures = 0
+        for other in list(self.managers):
+            if other is not manager:
+                other._region, other._token, other._token_expiries = manager._region, manager._token, manager._token_expiries
+        self.schedule(manager._token_expiries)
+
+    def refresh(self) -> None:
+        """
+        Refreshes the token, retrying later with an exponential backoff if it fails
+        """
+        managers = list(self.managers)
+        if not managers:  # every session got garbage collected
+            with _refreshers_lock:
+                if _refreshers.get(self.path) is self:
+                    del _refreshers[self.path]
+            return
+        try:
+            managers[0]._parse_authorization_data(force=True)  # calls `refreshed`
+        except Exception:  # the token will also be refreshed on the request path when it expires
+            self.failures += 1
+            self.schedule(delay=min(TOKEN_REFRESH_RETRY_DELAY * 2 ** (self.failures - 1), TOKEN_REFRESH_MAX_RETRY_DELAY))
+
+
+# session file path --> TokenRefresher
+_refreshers = {}
+_refreshers_lock = Lock()
+
+
+def get_refresher(path: str) -> TokenRefresher:
+    """
+    Returns the token refresher of the given session file
+    """
+    path = os.path.abspath(path)
+    with _refreshers_lock:
+        refresher = _refreshers.get(path)
+        if refresher is None:
+            refresher = _refreshers[path] = TokenRefresher(path)
+        return refresher
+
+
 class MicrosoftSessionManager():
-    def __init__(self, request: Request):
+    # region --> (timestamp, {(locale, gender): voice name})
+    _voices_cache = {}
+
+    def __init__(self, request: Request, session_file: str = None):
         self.session = request
         self.bing_session = BingSessionManager(request)
 
-        self._auth_session_file = JSONFile(os.path.join(HOME_DIR, ".microsoft_translatepy"), blocking=False)
+        self._auth_lock = Lock()
+
+        session_file = session_file or session_file_path(request, ".microsoft_translatepy")
+        self._refresher = get_refresher(session_file)
+        self._auth_session_file = JSONFile(session_file, blocking=False)
         with self._auth_session_file as _auth_session:
             _auth_session_data = _auth_session.read()
         self._region, self._token, self._token_expiries = _auth_session_data.get("region"), _auth_session_data.get("token"), _auth_session_data.get("token_expiries", 0)
         self._parse_authorization_data()
+        self._refresher.add(self)
+
+    def _parse_authorization_data(self, force: bool = False) -> bool:
+        """
+        Refreshes the authentication token if needed
+
+        Returns True if the token got refreshed
+        """
+        with self._auth_lock:
+            if self._token and time.time() <= self._token_expiries and not force:
+                return False
 
-    def _parse_authorization_data(self, force: bool = False):
-        if not self._token or time.time() > self._token_expiries or force:
             # authentication token is valid for 10 minutes
             token_response = self.bing_session.send("https://www.bing.com/tfetspktok", data={})
             token_status = token_response.get("statusCode", 200)
@@ -50,6 +161,32 @@ class MicrosoftSessionManager():
 
             self._auth_session_file.write({"token": self._token, "region": self._region, "token_expiries": self._token_expiries})
 
+        self._refresher.refreshed(self)
+        return True
+
+    def voices(self) -> Dict:
+        """
+        Returns the text to speech voices short names, indexed by (locale, gender)
+
+        The voices list is kept in cache for VOICES_CACHE_DURATION seconds
+        """
+        self._parse_authorization_data()  # the token might have expired if the background refresh failed
+        region = self._region
+        cached = self._voices_cache.get(region)
+        if cached is not None and time.time() - cached[0] < VOICES_CACHE_DURATION:
+            return cached[1]
+
+        url = "https://{region}.tts.speech.microsoft.com/cognitiveservices/voices/list".format(region=region)
+        request = self.session.get(url, headers={'Authorization': 'Bearer {token}'.format(token=self._token)})
+        if request.status_code >= 400:
+            raise MicrosoftException(request.status_code, "Error while retrieving the text to speech voices")
+
+        voices = {}
+        for voice in request.json():
+            voices.setdefault((voice["Locale"], voice["Gender"]), voice["ShortName"])
+        self._voices_cache[region] = (time.time(), voices)
+        return voices
+
     def send(self, url, data, params: Dict = {}):
         # Try 2 times to make a request
         for _ in range(2):
@@ -73,23 +210,57 @@ class MicrosoftSessionManager():
 
             return response
 
+    def send_batch(self, url, data: List[Dict], params: Dict = {}, text_key: str = "text"):
+        """
+        Sends the given array elements with as few requests as possible, while respecting the API limits
+
+        Returns the concatenated response arrays, in the same order as `data`
+        """
+        results = []
+        current_batch = []
+        current_length = 0
+        for element in data:
+            length = len(element.get(text_key, ""))
+            if current_batch and (len(current_batch) >= MAX_ARRAY_ELEMENTS or current_length + length > MAX_REQUEST_CHARACTERS):
+                results.extend(self.send(url, data=current_batch, params=params))
+                current_batch = []
+                current_length = 0
+            current_batch.append(element)
+            current_length += length
+        if current_batch:
+            results.extend(self.send(url, data=current_batch, params=params))
+        return results
+
+
 class MicrosoftTranslate(BaseTranslator):
     """
     A Python implementation of Microsoft Translation's APIs
     """
 
     _supported_languages = {'auto', 'af', 'sq', 'am', 'ar', 'hy', 'as', 'az', 'bn', 'bs', 'bg', 'my', 'ca', 'ca', 'zh-Hans', 'cs', 'da', 'nl', 'nl', 'en', 'et', 'fj', 'fil', 'fil', 'fi', 'fr', 'fr-ca', 'de', 'ga', 'el', 'gu', 'ht', 'ht', 'he', 'hi', 'hr', 'hu', 'is', 'iu', 'id', 'it', 'ja', 'kn', 'kk', 'km', 'ko', 'ku', 'lo', 'lv', 'lt', 'ml', 'mi', 'mr', 'ms', 'mg', 'mt', 'ne', 'nb', 'nb', 'or', 'pa', 'pa', 'fa', 'pl', 'pt', 'ps', 'ps', 'ro', 'ro', 'ro', 'ru', 'sk', 'sl', 'sm', 'es', 'es', 'sr-Cyrl', 'sw', 'sv', 'ty', 'ta', 'te', 'th', 'ti', 'tlh-Latn', 'tlh-Latn', 'to', 'tr', 'uk', 'ur', 'vi', 'cy', 'zh-Hans', 'zh-Hant', 'yue', 'prs', 'mww', 'tlh-Piqd', 'kmr', 'pt-pt', 'otq', 'sr-Cyrl', 'sr-Latn', 'yua'}
+    _max_text_length = MAX_REQUEST_CHARACTERS
 
     def __init__(self, request: Request = Request()):
         self.session_manager = MicrosoftSessionManager(request)
         self.session = request
 
     def _translate(self, text: str, destination_language: str, source_language: str) -> str:
-        if source_language == "auto":
-            source_language = self._language(text)
-
-        response = self.session_manager.send("https://api.cognitive.microsofttranslator.com/translate", params={'from': source_language, 'to': destination_language}, data=[{"text": text}])
-        return source_language, response[0]["translations"][0]["text"]
+        return self._translate_batch([text], destination_language, source_language)[0]
+
+    def _translate_batch(self, texts: List[str], destination_language: str, source_language: str) -> List:
+        params = {'to': destination_language}
+        if source_language != "auto":  # the API detects the language of each text when "from" is omitted
+            params["from"] = source_language
+
+        response = self.session_manager.send_batch("https://api.cognitive.microsofttranslator.com/translate", params=params, data=[{"text": text} for text in texts])
+        results = []
+        for element in response:
+            try:
+                _detected_language = element["detectedLanguage"]["language"]
+            except Exception:
+                _detected_language = source_language
+            results.append((_detected_language, element["translations"][0]["text"]))
+        return results
 
     def _example(self, text, destination_language, source_language) -> str:
         source_language, translation = self._translate(text, destination_language, source_language)
@@ -105,7 +276,8 @@ class MicrosoftTranslate(BaseTranslator):
         # TODO: Implement
 
     def _dictionary(self, text: str, destination_language: str, source_language: str):
-        source_language = self._language(text)
+        if source_language == "auto":
+            source_language = self._detect_language(text)
 
         response = self.session_manager.send("https://api.cognitive.microsofttranslator.com/dictionary/lookup", data=[{'text': text}], params={'from': source_language, 'to': destination_language})
         _result = []
@@ -116,23 +288,17 @@ class MicrosoftTranslate(BaseTranslator):
 
     def _text_to_speech(self, text: str, speed: int, gender: str, source_language: str):
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         gender = gender.capitalize()
 
-        _supported_langs_url = "https://{region}.tts.speech.microsoft.com/cognitiveservices/voices/list".format(region=self.session_manager._region)
-        _supported_langs_list = self.session_manager.send(_supported_langs_url)
-
         # all locals list: {('zh-HK', 'zh-HK'), ('de', 'de-DE'), ('da', 'da-DK'), ('id', 'id-ID'), ('ko', 'ko-KR'), ('en', 'en-NZ'), ('el', 'el-GR'), ('ms', 'ms-MY'), ('es', 'es-AR'), ('ro', 'ro-RO'), ('pl', 'pl-PL'), ('it', 'it-IT'), ('hr', 'hr-HR'), ('pt', 'pt-PT'), ('hu', 'hu-HU'), ('sw', 'sw-KE'), ('en', 'en-GB'), ('mt', 'mt-MT'), ('tr', 'tr-TR'), ('ar', 'ar-EG'), ('fr', 'fr-CA'), ('te', 'te-IN'), ('fr', 'fr-BE'), ('en', 'en-SG'), ('zh-CN', 'zh-CN'), ('fr', 'fr-FR'), ('en', 'en-PH'), ('cs', 'cs-CZ'), ('fi', 'fi-FI'), ('zh-TW', 'zh-TW'), ('de', 'de-CH'), ('nb', 'nb-NO'), ('bg', 'bg-BG'), ('he', 'he-IL'), ('en', 'en-CA'), ('en', 'en-HK'), ('es', 'es-MX'), ('en', 'en-AU'), ('th', 'th-TH'), ('pt', 'pt-BR'), ('mr', 'mr-IN'), ('sk', 'sk-SK'), ('ru', 'ru-RU'), ('nl', 'nl-NL'), ('en', 'en-US'), ('ta', 'ta-IN'), ('hi', 'hi-IN'), ('cy', 'cy-GB'), ('ar', 'ar-SA'), ('ga', 'ga-IE'), ('nl', 'nl-BE'), ('de', 'de-AT'), ('ca', 'ca-ES'), ('uk', 'uk-UA'), ('es', 'es-CO'), ('es', 'es-ES'), ('es', 'es-US'), ('en', 'en-ZA'), ('ur', 'ur-PK'), ('sv', 'sv-SE'), ('lv', 'lv-LV'), ('lt', 'lt-LT'), ('vi', 'vi-VN'), ('et', 'et-EE'), ('en', 'en-IN'), ('en', 'en-IE'), ('ja', 'ja-JP'), ('fr', 'fr-CH'), ('gu', 'gu-IN'), ('sl', 'sl-SI')}
         _locals = {'zh-CN': 'zh-CN', 'mr': 'mr-IN', 'en': 'en-US', 'ru': 'ru-RU', 'el': 'el-GR', 'es': 'es-CO', 'id': 'id-ID', 'pt': 'pt-PT', 'ko': 'ko-KR', 'ta': 'ta-IN', 'te': 'te-IN', 'et': 'et-EE', 'pl': 'pl-PL', 'it': 'it-IT', 'ms': 'ms-MY', 'mt': 'mt-MT', 'ro': 'ro-RO', 'vi': 'vi-VN', 'bg': 'bg-BG', 'zh-TW': 'zh-TW', 'tr': 'tr-TR', 'de': 'de-CH', 'fr': 'fr-CH', 'nb': 'nb-NO', 'nl': 'nl-BE', 'uk': 'uk-UA', 'he': 'he-IL', 'ur': 'ur-PK', 'hi': 'hi-IN', 'ja': 'ja-JP', 'hr': 'hr-HR', 'sv': 'sv-SE', 'hu': 'hu-HU', 'sw': 'sw-KE', 'lt': 'lt-LT', 'sl': 'sl-SI', 'fi': 'fi-FI', 'lv': 'lv-LV', 'sk': 'sk-SK', 'da': 'da-DK', 'cy': 'cy-GB', 'gu': 'gu-IN', 'ga': 'ga-IE', 'th': 'th-TH', 'ar': 'ar-EG', 'ca': 'ca-ES', 'zh-HK': 'zh-HK', 'cs': 'cs-CZ'}
         _source_local = _locals.get(source_language)
 
-        for _supported_lang in _supported_langs_list:
-            if _supported_lang["Locale"] == _source_local and _supported_lang["Gender"] == gender:
-                voice = _supported_lang["ShortName"]
-                break
-        else:
-            raise UnsupportedMethod("Microsoft Translate doesn't support {source_lang} language".format(source_lang=source_language))
+        voice = self.session_manager.voices().get((_source_local, gender))
+        if voice is None:
+            raise UnsupportedLanguage("Microsoft Translate doesn't support {source_lang} language".format(source_lang=source_language))
 
         speech_url = "https://{region}.tts.speech.microsoft.com/cognitiveservices/v1".format(region=self.session_manager._region)
         headers = {"authorization": "Bearer {token}".format(token=self.session_manager._token), "content-type": "application/ssml+xml", "x-microsoft-outputformat": "audio-48khz-192kbitrate-mono-mp3"}
@@ -9,6 +9,7 @@ class MyMemoryException(BaseTranslateException):
     error_codes = {
         "NO_MATCH": "There is no match to the translation"
     }
+    deterministic_codes = {"NO_MATCH"}
 
 
 class MyMemoryTranslate(BaseTranslator):
@@ -16,6 +17,8 @@ class MyMemoryTranslate(BaseTranslator):
     translatepy's implementation of MyMemory
     """
 
+    _max_text_length = 500  # MyMemory only accepts 500 bytes per request
+
     def __init__(self, request: Request = Request()):
         self.session = request
         self.base_url = "https://api.mymemory.translated.net/get"
@@ -1,24 +1,40 @@
 import base64
+from time import time
 
-from translatepy.exceptions import UnsupportedMethod
+from translatepy.exceptions import UnsupportedLanguage
 from translatepy.language import Language
 from translatepy.translators.base import BaseTranslator
 from translatepy.utils.request import Request
 
+# Reverso language code --> translatepy language id
+REVERSO_LANGUAGES = {
+    "ara": "ara", "chi": "zho", "dut": "nld", "eng": "eng", "fra": "fra", "ger": "deu", "heb": "heb", "ita": "ita",
+    "jpn": "jpn", "pol": "pol", "por": "por", "rum": "ron", "rus": "rus", "spa": "spa", "tur": "tur"
+}
+# translatepy language id --> Reverso language code
+TRANSLATEPY_LANGUAGES = {language_id: code for code, language_id in REVERSO_LANGUAGES.items()}
+
+# the number of seconds the text to speech voices list is kept in cache
+VOICES_CACHE_DURATION = 3600
+
 
 class ReversoTranslate(BaseTranslator):
     """
     A Python implementation of Reverso's API
     """
 
-    _supported_languages = {'auto', 'ara', 'chi', 'dut', 'dut', 'eng', 'fra', 'ger', 'heb', 'ita', 'jpn', 'pol', 'por', 'rum', 'rum', 'rum', 'rus', 'spa', 'spa', 'tur'}
+    _supported_languages = {'auto'} | set(REVERSO_LANGUAGES)
+    _max_text_length = 2000  # the limit of Reverso's web translator
+
+    # (timestamp, {(language name, gender): voice name})
+    _voices_cache = None
 
     def __init__(self, request: Request = Request()):
         self.session = request
 
     def _translate(self, text: str, destination_language: str, source_language: str) -> str:
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         request = self.session.post(
             "https://api.reverso.net/translate/v1/translation",
@@ -46,7 +62,7 @@ class ReversoTranslate(BaseTranslator):
 
     def _spellcheck(self, text: str, source_language: str) -> str:
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         request = self.session.post(
             "https://orthographe.reverso.net/api/v1/Spelling",
@@ -95,7 +111,7 @@ class ReversoTranslate(BaseTranslator):
         # TODO: nrows value
 
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         destination_language = Language(destination_language).alpha2
         source_language = Language(source_language).alpha2
@@ -110,7 +126,7 @@ class ReversoTranslate(BaseTranslator):
 
     def _dictionary(self, text: str, destination_language: str, source_language: str):
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         destination_language = Language(destination_language).alpha2
         source_language = Language(source_language).alpha2
@@ -127,38 +143,50 @@ class ReversoTranslate(BaseTranslator):
             return source_language, _result
 
     def _text_to_speech(self, text, speed, gender, source_language):
+        # the source language is already resolved by `text_to_speech` with the known or offline detected language,
+        # the voice depending on it, it is only detected remotely as a last resort
         if source_language == "auto":
-            source_language = self._language(text)
-
-        _supported_langs_url = "https://voice.reverso.net/RestPronunciation.svc/v1/output=json/GetAvailableVoices"
-        _supported_langs_result = self.session.get(_supported_langs_url)
-        _supported_langs_list = _supported_langs_result.json()["Voices"]
+            source_language = self._detect_language(text)
 
         _gender = "M" if gender == "male" else "F"
         _text = base64.b64encode(text.encode()).decode()
-        _source_language = "US English".lower() if source_language == "eng" else Language.by_reverso(source_language).name.lower()
+        _source_language = "US English".lower() if source_language == "eng" else self._language_denormalize(source_language).name.lower()
 
-        for _supported_lang in _supported_langs_list:
-            if _supported_lang["Language"].lower() == _source_language and _supported_lang["Gender"] == _gender:
-                voice = _supported_lang["Name"]
-                break
-        else:
-            raise UnsupportedMethod("{source_lang} language not supported by Reverso".format(source_lang=source_language))
+        voice = self._voices().get((_source_language, _gender))
+        if voice is None:
+            raise UnsupportedLanguage("{source_lang} language not supported by Reverso".format(source_lang=source_language))
 
         url = "https://voice.reverso.net/RestPronunciation.svc/v1/output=json/GetVoiceStream/voiceName={}?voiceSpeed={}&inputText={}".format(voice, speed, _text)
         response = self.session.get(url)
         if response.status_code < 400:
             return source_language, response.content
 
+    def _voices(self) -> dict:
+        """
+        Returns the text to speech voices names, indexed by (lowercased language name, gender)
+
+        The voices list is kept in cache for VOICES_CACHE_DURATION seconds
+        """
+        cached = ReversoTranslate._voices_cache
+        if cached is not None and time() - cached[0] < VOICES_CACHE_DURATION:
+            return cached[1]
+
+        request = self.session.get("https://voice.reverso.net/RestPronunciation.svc/v1/output=json/GetAvailableVoices")
+        request.raise_for_status()
+
+        voices = {}
+        for voice in request.json()["Voices"]:
+            voices.setdefault((voice["Language"].lower(), voice["Gender"]), voice["Name"])
+        ReversoTranslate._voices_cache = (time(), voices)
+        return voices
+
     def _language_normalize(self, language: Language) -> str:
-        if language.id == "zho":
-            return "chi"
-        return language.alpha3
+        return TRANSLATEPY_LANGUAGES.get(language.id, language.alpha3)
 
     def _language_denormalize(self, language_code):
-        if str(language_code).lower() in {"chi", "zh-cn"}:
+        if str(language_code).lower() == "zh-cn":
             return Language("zho")
-        return Language(language_code)
+        return Language(REVERSO_LANGUAGES.get(str(language_code).lower(), language_code))
 
     def __str__(self) -> str:
         return "Reverso"
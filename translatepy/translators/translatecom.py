@@ -22,7 +22,7 @@ class TranslateComTranslate(BaseTranslator):
         Must return a tuple with (detected_language, result)
         """
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
         request = self.session.post(self.translate_url, data={"text_to_translate": text, "source_lang": source_language, "translated_lang": destination_language, "use_cache_only": "false"})
         if request.status_code < 400:
             result = request.json()["translated_text"]
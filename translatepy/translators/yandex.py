@@ -28,6 +28,7 @@ class YandexTranslateException(BaseTranslateException):
         501: "ERR_LANG_NOT_SUPPORTED",
         503: "ERR_SERVICE_NOT_AVAIBLE",
     }
+    deterministic_codes = {413, 422, 501}
 
 
 class YandexTranslate(BaseTranslator):
@@ -64,12 +65,10 @@ class YandexTranslate(BaseTranslator):
         return self.session_ucid
 
     def _translate(self, text: str, destination_language: str, source_language: str) -> str:
-        if source_language == "auto":
-            source_language = self._language(text)
-
         url = self._api_url.format(endpoint="translate")
         params = {"sid": self._ucid(session_state=True), "srv": "android", "format": "text"}
-        data = {"text": text, "lang": source_language + "-" + destination_language}
+        # when only the destination language is given, Yandex detects the source language by itself
+        data = {"text": text, "lang": destination_language if source_language == "auto" else source_language + "-" + destination_language}
         request = self.session.post(url, params=params, data=data)
         response = request.json()
 
@@ -77,7 +76,7 @@ class YandexTranslate(BaseTranslator):
             raise YandexTranslateException(response["code"])
 
         try:
-            _detected_language = str(data["lang"]).split("-")[0]
+            _detected_language = str(response["lang"]).split("-")[0]
         except Exception:
             _detected_language = source_language
 
@@ -85,7 +84,7 @@ class YandexTranslate(BaseTranslator):
 
     def _transliterate(self, text: str, destination_language: str, source_language: str) -> str:
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         url = "https://translate.yandex.net/translit/translit"
         data = {'text': text, 'lang': source_language + "-" + destination_language}
@@ -98,7 +97,7 @@ class YandexTranslate(BaseTranslator):
 
     def _spellcheck(self, text: str, source_language: str) -> str:
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         url = "https://speller.yandex.net/services/spellservice.json/checkText"
         params = {"sid": self._ucid(), "srv": "android"}
@@ -130,7 +129,7 @@ class YandexTranslate(BaseTranslator):
 
     def _example(self, text: str, destination_language: str, source_language: str):
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         url = "https://dictionary.yandex.net/dicservice.json/queryCorpus"
         params = {"sid": self._ucid(), "srv": "android", "src": text, "ui": "en", "lang": source_language + "-" + destination_language, "flags": 7}
@@ -153,7 +152,7 @@ class YandexTranslate(BaseTranslator):
 
     def _dictionary(self, text: str, destination_language: str, source_language: str):
         if source_language == "auto":
-            source_language = self._language(text)
+            source_language = self._detect_language(text)
 
         url = "https://dictionary.yandex.net/dicservice.json/lookupMultiple"
         params = {"sid": self._ucid(), "srv": "android", "text": text, "ui": "en", "dict": source_language + "-" + destination_language, "flags": 7, "dict_type": "regular"}
@@ -0,0 +1,286 @@
+"""
+Translates large files (plain text, JSON Lines or CSV) record by record
+
+The records are read and translated by windows (bounded concurrency and batching), the results are written
+in the input order as soon as a window is translated, and the progress is saved to a checkpoint file
+so that an interrupted job can be resumed where it stopped.
+"""
+
+import csv
+import os
+from itertools import islice
+from json import dumps, loads
+from typing import Iterator
+
+from translatepy.exceptions import ParameterError, ParameterValueError
+from translatepy.utils.annotations import Dict, List, Tuple
+from translatepy.utils.executor import map_bounded
+from translatepy.utils.sanitize import remove_spaces
+
+
+class TextFormat():
+    """
+    One text per line
+    """
+    name = "txt"
+
+    def __init__(self, column: str = None, output_column: str = None) -> None:
+        self.column = column
+        self.output_column = output_column
+
+    def read(self, file) -> Iterator[Tuple[object, str]]:
+        """
+        Returns an iterator over the (record, text to translate) of the given file
+        """
+        return ((line.rstrip("\r\n"), line.rstrip("\r\n")) for line in file)
+
+    def start(self, file) -> None:
+        """
+        Writes the beginning of a new output file (i.e the CSV header)
+        """
+
+    def write(self, file, record: object, translation: str) -> None:
+        file.write(translation.replace("\n", " ") + "\n")
+
+
+class JSONLinesFormat(TextFormat):
+    """
+    One JSON object per line, translating its `column` field ("text" by default)
+    """
+    name = "jsonl"
+
+    def read(self, file) -> Iterator[Tuple[object, str]]:
+        field = self.column or "text"
+        for line in file:
+            if not line.strip():
+                continue
+            record = loads(line)
+            if not isinstance(record, dict) or field not in record:
+                raise ParameterValueError("The JSON Lines record doesn't have any '{}' field: {}".format(field, line.strip()))
+            yield record, str(record[field])
+
+    def write(self, file, record: dict, translation: str) -> None:
+        record = dict(record)
+        record[self.output_column or self.column or "text"] = translation
+        file.write(dumps(record, ensure_ascii=False) + "\n")
+
+
+class CSVFormat(TextFormat):
+    """
+    A CSV file, translating the `column` column, given by name (the first row being the header) or by index
+    """
+    name = "csv"
+
+    def __init__(self, column: str = None, output_column: str = None) -> None:
+        super().__init__(column, output_column)
+        self.header = None
+        self.index = None
+
+    def read(self, file) -> Iterator[Tuple[object, str]]:
+        reader = csv.reader(file)
+        column = "0" if self.column is None else str(self.column)
+        if column.isdigit():
+            self.index = int(column)
+        else:
+            self.header = next(reader, None) or []
+            if column not in self.header:
+                raise ParameterValueError("The CSV file doesn't have any '{}' column (columns: {})".format(column, ", ".join(self.header)))
+            self.index = self.header.index(column)
+        return ((row, row[self.index] if self.index < len(row) else "") for row in reader)
+
+    def start(self, file) -> None:
+        if self.header is not None:
+            header = list(self.header)
+            if self.output_column is not None:
+                header.append(self.output_column)
+            csv.writer(file).writerow(header)
+
+    def write(self, file, record: list, translation: str) -> None:
+        row = list(record)
+        if self.output_column is not None:
+            row.append(translation)
+        else:
+            row[self.index:self.index + 1] = [translation]
+        csv.writer(file).writerow(row)
+
+
+FORMATS = {
+    "txt": TextFormat,
+    "jsonl": JSONLinesFormat,
+    "ndjson": JSONLinesFormat,
+    "csv": CSVFormat
+}
+
+
+def guess_format(path: str, default: str = "txt") -> str:
+    """
+    Returns the format of the given file from its extension
+    """
+    extension = os.path.splitext(str(path))[1].lstrip(".").lower()
+    return extension if extension in FORMATS else default
+
+
+def _load_checkpoint(path: str) -> Dict[str, int]:
+    if path is None or not os.path.isfile(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        return loads(file.read())
+
+
+def _save_checkpoint(path: str, state: Dict[str, int]) -> None:
+    # replacing the file at once to never leave a partial checkpoint
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.write(dumps(state))
+    os.replace(temporary, path)
+
+
+def _translate_texts(translator, texts: List[str], destination_language: str, source_language: str, concurrency: int, batch_size: int) -> Dict[str, str]:
+    """
+    Translates the given texts, returning {text: translation} (without the texts which couldn't be translated)
+    """
+    texts = list({text: None for text in texts if remove_spaces(text) != ""})  # removing the duplicates
+    batches = [texts[index:index + batch_size] for index in range(0, len(texts), batch_size)]
+
+    def _translate(batch: List[str]) -> List[Tuple[str, str]]:
+        try:
+            return [(text, result.result) for text, result in zip(batch, translator.translate_batch(batch, destination_language, source_language))]
+        except Exception:  # translating each text separately to isolate the failures
+            results = []
+            for text in batch:
+                try:
+                    results.append((text, translator.translate(text, destination_language, source_language).result))
+                except Exception:
+                    pass
+            return results
+
+    return {text: translation for results in map_bounded(_translate, batches, limit=concurrency) for text, translation in results}
+
+
+def translate_file(
+    translator,
+    input,
+    output,
+    destination_language: str,
+    source_language: str = "auto",
+    format: str = None,
+    column: str = None,
+    output_column: str = None,
+    concurrency: int = 8,
+    batch_size: int = 50,
+    checkpoint: str = None,
+    window_size: int = None
+) -> Dict[str, int]:
+    """
+    Translates every record of a file and writes them, in the same order, to the output
+
+    The records which couldn't be translated are written untranslated.
+
+    Parameters:
+    ----------
+        translator : Translate
+            The translator to use
+        input : str | file-like object
+            The file to translate
+        output : str | file-like object
+            The file to write the translations to
+        destination_language : str
+            The language to translate the texts in
+        source_language : str, default = "auto"
+            The language of the texts
+        format : str, default = None
+            "txt", "jsonl" or "csv" (guessed from the input file extension by default)
+        column : str, default = None
+            The JSON Lines field ("text" by default) or the CSV column (name or index, the first one by default) to translate
+        output_column : str, default = None
+            The field or column to write the translations to (replaces the translated one by default)
+        concurrency : int, default = 8
+            The maximum number of batches translated at the same time
+        batch_size : int, default = 50
+            The number of texts translated together
+        checkpoint : str, default = None
+            A file to save the progress to, which is used to resume the job if it exists and the output still exists (the output must be a path)
+        window_size : int, default = None
+            The number of records translated before writing them (defaults to `concurrency * batch_size`)
+
+    Returns:
+    --------
+        dict:
+            {"records": ..., "translated": ..., "failed": ..., "resumed": ...}
+    """
+    format = str(format or (guess_format(input) if isinstance(input, str) else "txt")).lower()
+    if format not in FORMATS:
+        raise ParameterValueError("Parameter 'format' must be one of {}, {} was given".format(", ".join(sorted(FORMATS)), format))
+    output_is_path = not hasattr(output, "write")
+    if checkpoint is not None and not output_is_path:
+        raise ParameterError("A checkpoint can only be used when writing to a file")
+    concurrency = max(1, int(concurrency))
+    batch_size = max(1, int(batch_size))
+    window_size = max(1, int(window_size or concurrency * batch_size))
+
+    handler = FORMATS[format](column=column, output_column=output_column)
+    # the parameters which must be the same to resume a job
+    job = {
+        "input": input if isinstance(input, str) else None,
+        "destination_language": str(destination_language),
+        "source_language": str(source_language),
+        "format": format,
+        "column": column,
+        "output_column": output_column
+    }
+    state = _load_checkpoint(checkpoint)
+    if state is not None and not os.path.isfile(output):
+        state = None  # the output has been removed since, starting again
+    resumed = state is not None
+    if state is None:
+        state = dict(job, records=0, translated=0, failed=0, position=0)
+    else:
+        for key, value in job.items():
+            if state.get(key) != value:
+                raise ParameterError("The checkpoint {} has been created for another {} ({})".format(checkpoint, key.replace("_", " "), state.get(key)))
+
+    input_file = open(input, "r", encoding="utf-8", newline="") if isinstance(input, str) else input
+    output_file = output
+    try:
+        if output_is_path:
+            if resumed:
+                # dropping what has been written after the last checkpoint
+                with open(output, "r+b") as file:
+                    file.truncate(state["position"])
+            output_file = open(output, "a" if resumed else "w", encoding="utf-8", newline="")
+
+        records = handler.read(input_file)
+        if resumed:
+            for _ in islice(records, state["records"]):
+                pass
+        else:
+            handler.start(output_file)
+
+        while True:
+            window = list(islice(records, window_size))
+            if not window:
+                break
+            translations = _translate_texts(translator, [text for _, text in window], destination_language, source_language, concurrency, batch_size)
+            for record, text in window:
+                translation = translations.get(text)
+                if translation is None:
+                    translation = text
+                    if remove_spaces(text) != "":
+                        state["failed"] += 1
+                else:
+                    state["translated"] += 1
+                handler.write(output_file, record, translation)
+            output_file.flush()
+            state["records"] += len(window)
+            if checkpoint is not None:
+                state["position"] = os.fstat(output_file.fileno()).st_size
+                _save_checkpoint(checkpoint, state)
+    finally:
+        if input_file is not input:
+            input_file.close()
+        if output_file is not output:
+            output_file.close()
+
+    if checkpoint is not None and os.path.isfile(checkpoint):
+        os.remove(checkpoint)
+    return {"records": state["records"], "translated": state["translated"], "failed": state["failed"], "resumed": resumed}
@@ -0,0 +1,338 @@
+"""
+Records the HTTP interactions made by `translatepy.utils.request.Request` to cassette files and replays them
+
+Replaying a cassette doesn't make any request, which allows to test and benchmark the translators
+offline and reproducibly, with an optional simulated latency and errors injection.
+"""
+
+from base64 import b64decode, b64encode
+from json import dumps, loads
+from os.path import exists
+from random import Random
+from threading import Lock
+from time import sleep
+from typing import Callable, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from translatepy.exceptions import ParameterValueError, RequestNotRecorded
+from translatepy.utils.annotations import Dict, Tuple
+from translatepy.utils.lru_cacher import open_cache_file
+
+# record: always make the requests and record them
+# replay: only replay the recorded requests
+# auto: replay the recorded requests and record the other ones
+MODES = {"record", "replay", "auto"}
+
+# the requests properties used to find the recorded responses
+MATCH_ON = ("method", "url", "params", "body")
+
+
+def _normalize(value):
+    """
+    Returns a JSON serializable version of the given request parameters or body, which doesn't depend on the dicts order
+    """
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return b64encode(value).decode("ascii")
+    if isinstance(value, dict):
+        value = value.items()
+    if isinstance(value, str):
+        return value
+    try:
+        return sorted([str(key), _normalize(element) if isinstance(element, (list, tuple, dict, bytes)) else str(element)] for key, element in value)
+    except (TypeError, ValueError):  # not a list of pairs
+        return str(value)
+
+
+def _normalize_jsonrpc(request: Dict[str, object]) -> Dict[str, object]:
+    """
+    Removes the JSON-RPC request id and DeepL's timestamp, which change with every request
+    """
+    try:
+        body = loads(request.get("body") or "")
+    except ValueError:
+        return request
+    if not isinstance(body, dict):
+        return request
+    body.pop("id", None)
+    if isinstance(body.get("params"), dict):
+        body["params"].pop("timestamp", None)
+    return dict(request, body=dumps(body, sort_keys=True, ensure_ascii=False))
+
+
+def _normalize_google_token(request: Dict[str, object]) -> Dict[str, object]:
+    """
+    Removes the `tk` token of Google Translate's web client, which is computed from a key changing over time
+    """
+    params = request.get("params")
+    if not isinstance(params, list):
+        return request
+    return dict(request, params=[pair for pair in params if not (isinstance(pair, list) and pair and pair[0] == "tk")])
+
+
+# host --> function returning the given serialized request without the parts changing with every request,
+# so that the recorded requests can be matched. A host also matches its subdomains and its country domains
+# (i.e "deepl.com" matches "www2.deepl.com" and "translate.google" matches "translate.google.fr")
+NORMALIZERS = {
+    "deepl.com": _normalize_jsonrpc,
+    "translate.google": _normalize_google_token
+}
+
+
+def _serialize_request(method: str, url: str, kwargs: dict) -> Dict[str, object]:
+    body = kwargs.get("data")
+    if kwargs.get("json") is not None:
+        body = dumps(kwargs["json"], sort_keys=True, ensure_ascii=False)
+    return {
+        "method": str(method).upper(),
+        "url": str(url),
+        "params": _normalize(kwargs.get("params")),
+        "body": _normalize(body)
+    }
+
+
+def _serialize_response(response: requests.Response) -> Dict[str, object]:
+    result = {
+        "status_code": response.status_code,
+        "reason": response.reason,
+        "url": response.url,
+        "headers": dict(response.headers),
+        "encoding": response.encoding
+    }
+    content = response.content or b""
+    try:
+        result["text"] = content.decode("utf-8")
+    except UnicodeDecodeError:
+        result["base64"] = b64encode(content).decode("ascii")
+    return result
+
+
+def _build_response(data: Dict[str, object]) -> requests.Response:
+    """
+    Builds a `requests.Response` from a recorded response
+    """
+    response = requests.Response()
+    response.status_code = int(data.get("status_code", 200))
+    response.reason = data.get("reason")
+    response.url = data.get("url")
+    response.encoding = data.get("encoding")
+    # the recorded content is already decoded
+    response.headers = CaseInsensitiveDict({
+        key: value
+        for key, value in (data.get("headers") or {}).items()
+        if key.lower() not in {"content-encoding", "transfer-encoding", "content-length"}
+    })
+    if "base64" in data:
+        response._content = b64decode(data["base64"])
+    else:
+        response._content = str(data.get("text", "")).encode("utf-8")
+    response._content_consumed = True
+    return response
+
+
+class Cassette():
+    def __init__(
+        self,
+        path: str = None,
+        mode: str = "replay",
+        match_on: Tuple[str] = MATCH_ON,
+        latency: Union[float, Tuple[float, float]] = 0,
+        error_rate: float = 0,
+        error_status: int = 503,
+        seed: int = None,
+        normalizers: Dict[str, Callable[[dict], dict]] = None
+    ) -> None:
+        """
+        A set of recorded HTTP interactions, to be used with `translatepy.utils.request.Request(cassette=...)`
+
+        Parameters:
+        ----------
+            path : str
+                The JSON Lines file of the cassette (compressed with gzip if it ends with ".gz"), if any
+            mode : str
+                "record", "replay" or "auto" (replaying the recorded requests and recording the other ones)
+            match_on : tuple
+                The requests properties used to find the recorded responses ("method", "url", "params", "body")
+            latency : float | tuple
+                The number of seconds waited before returning a replayed response,
+                or a (minimum, maximum) tuple to pick a random latency
+            error_rate : float
+                The probability (between 0 and 1) of a replayed request to fail
+            error_status : int
+                The status code of the injected errors, or None to raise a connection error instead
+            seed : int
+                The seed of the random latencies and errors, to have reproducible runs
+            normalizers : dict
+                The functions removing the parts of the requests which change with every request (i.e ids, timestamps, tokens) before matching them,
+                indexed by host (defaults to `NORMALIZERS`)
+        """
+        mode = str(mode).lower()
+        if mode not in MODES:
+            raise ParameterValueError("Parameter 'mode' must be one of {}, {} was given".format(", ".join(sorted(MODES)), mode))
+        unknown = set(match_on).difference(MATCH_ON)
+        if unknown:
+            raise ParameterValueError("Unknown 'match_on' properties: {}".format(", ".join(sorted(unknown))))
+        if not 0 <= float(error_rate) <= 1:
+            raise ParameterValueError("Parameter 'error_rate' must be between 0 and 1, {} was given".format(error_rate))
+
+        self.path = path
+        self.mode = mode
+        self.match_on = tuple(match_on)
+        self.latency = latency
+        self.error_rate = float(error_rate)
+        self.error_status = error_status
+        self.normalizers = NORMALIZERS if normalizers is None else dict(normalizers)
+
+        self._random = Random(seed)
+        self._lock = Lock()
+        self._interactions = []
+        self._responses = {}  # request key -> list of recorded responses
+        self._plays = {}  # request key -> number of replays
+
+        if path is not None and mode != "record" and exists(str(path)):
+            self.load(path)
+
+    def _normalizer(self, url: str) -> Callable[[dict], dict]:
+        """
+        Returns the normalizer of the host of the given URL, if any
+        """
+        host = (urlparse(str(url)).hostname or "").lower()
+        for name, normalizer in self.normalizers.items():
+            if host == name or host.endswith("." + name) or host.startswith(name + "."):
+                return normalizer
+        return None
+
+    def _key(self, request: Dict[str, object]) -> str:
+        normalizer = self._normalizer(request.get("url"))
+        if normalizer is not None:
+            request = normalizer(request)
+        return dumps([request.get(field) for field in self.match_on], sort_keys=True, ensure_ascii=False)
+
+    def _add(self, request: Dict[str, object], response: Dict[str, object]) -> None:
+        self._interactions.append({"request": request, "response": response})
+        self._responses.setdefault(self._key(request), []).append(response)
+
+    def load(self, file) -> int:
+        """
+        Loads the interactions of a cassette file (or file-like object)
+
+        Returns the number of loaded interactions
+        """
+        handle = open_cache_file(file, "r")
+        loaded = 0
+        try:
+            with self._lock:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    interaction = loads(line)
+                    self._add(interaction["request"], interaction["response"])
+                    loaded += 1
+        finally:
+            if handle is not file:
+                handle.close()
+        return loaded
+
+    def save(self, file=None) -> int:
+        """
+        Writes the interactions to the cassette file (or to the given file or file-like object)
+
+        Returns the number of written interactions
+        """
+        file = self.path if file is None else file
+        if file is None:
+            raise ParameterValueError("The cassette doesn't have any path to save to")
+        handle = open_cache_file(file, "w")
+        try:
+            with self._lock:
+                for interaction in self._interactions:
+                    handle.write(dumps(interaction, ensure_ascii=False) + "\n")
+                return len(self._interactions)
+        finally:
+            if handle is not file:
+                handle.close()
+
+    def record(self, method: str, url: str, kwargs: dict, response: requests.Response) -> None:
+        """
+        Records the response of the given request
+        """
+        with self._lock:
+            self._add(_serialize_request(method, url, kwargs), _serialize_response(response))
+
+    def _replay(self, method: str, url: str, kwargs: dict) -> requests.Response:
+        """
+        Returns the next recorded response for the given request, or None if it has not been recorded
+
+        The responses recorded for the same request are returned in order, looping over them
+        """
+        key = self._key(_serialize_request(method, url, kwargs))
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                return None
+            plays = self._plays.get(key, 0)
+            self._plays[key] = plays + 1
+            data = responses[plays % len(responses)]
+            latency = self.latency
+            if isinstance(latency, (list, tuple)):
+                latency = self._random.uniform(*latency)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+
+        if latency:
+            sleep(latency)
+        if failed:
+            if self.error_status is None:
+                raise requests.ConnectionError("Injected connection error for {} {}".format(method.upper(), url))
+            return _build_response({"status_code": self.error_status, "reason": "Injected Error", "url": data.get("url")})
+        return _build_response(data)
+
+    def play(self, method: str, url: str, kwargs: dict, perform: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Returns the response for the given request, replaying it or performing (and recording) it depending on the mode
+
+        Parameters:
+        ----------
+            method : str
+                The HTTP method
+            url : str
+                The URL of the request
+            kwargs : dict
+                The options given to `requests.Session.request`
+            perform : function
+                A function making the actual request
+
+        Raises:
+        -------
+            RequestNotRecorded:
+                When the request has not been recorded in "replay" mode
+        """
+        if self.mode != "record":
+            response = self._replay(method, url, kwargs)
+            if response is not None:
+                return response
+            if self.mode == "replay":
+                raise RequestNotRecorded("{} {} has not been recorded in the cassette".format(method.upper(), url))
+        response = perform()
+        self.record(method, url, kwargs, response)
+        return response
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        if self.mode != "replay" and self.path is not None:
+            self.save()
+
+    def __repr__(self) -> str:
+        return "Cassette({} interactions, mode={})".format(len(self), self.mode)
@@ -0,0 +1,61 @@
+"""
+Splits long texts into chunks which can be translated separately
+"""
+
+from re import compile
+
+from translatepy.utils.annotations import List
+
+PARAGRAPHS_SPLITTING_REGEX = compile(r"\n\s*\n")
+SENTENCES_SPLITTING_REGEX = compile(r"(?<=[.!:?])\s+")
+WORDS_SPLITTING_REGEX = compile(r"\s+")
+
+# from the largest to the smallest boundaries
+SPLITTING_REGEXES = [PARAGRAPHS_SPLITTING_REGEX, SENTENCES_SPLITTING_REGEX, WORDS_SPLITTING_REGEX]
+
+
+def _split_keeping_separators(text: str, regex) -> List[str]:
+    """
+    Splits the text with the given regex, keeping each separator at the end of the previous piece
+    """
+    pieces = []
+    last = 0
+    for match in regex.finditer(text):
+        if match.end() > last:
+            pieces.append(text[last:match.end()])
+            last = match.end()
+    if last < len(text):
+        pieces.append(text[last:])
+    return pieces
+
+
+def _split(text: str, limit: int, level: int = 0) -> List[str]:
+    """
+    Splits the text on the largest boundaries possible so that every piece has at most `limit` characters
+    """
+    if len(text) <= limit:
+        return [text]
+    if level >= len(SPLITTING_REGEXES):  # a single word is longer than the limit
+        return [text[index:index + limit] for index in range(0, len(text), limit)]
+    pieces = []
+    for piece in _split_keeping_separators(text, SPLITTING_REGEXES[level]):
+        pieces.extend(_split(piece, limit, level + 1))
+    return pieces
+
+
+def split_text(text: str, limit: int) -> List[str]:
+    """
+    Splits the text into chunks of at most `limit` characters, on paragraphs, sentences or words boundaries
+
+    The whitespaces are kept so that joining the chunks gives back the original text
+    """
+    chunks = []
+    current_chunk = ""
+    for piece in _split(text, limit):
+        if current_chunk and len(current_chunk) + len(piece) > limit:
+            chunks.append(current_chunk)
+            current_chunk = ""
+        current_chunk += piece
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
@@ -0,0 +1,126 @@
+"""
+Offline language detection
+
+Detects the language of a text without making any request, using only the Unicode scripts of its characters.
+
+This is a script-based detector: it is only confident for the scripts used by a single language (Greek, Korean, Thai...),
+and for Japanese kana and Chinese-only characters. The scripts shared by several languages (Latin, Cyrillic, Arabic, Devanagari...)
+only give their most common language with a low confidence, and Latin texts are not detected at all,
+so that the translation services detect them.
+"""
+
+from collections import Counter
+
+from translatepy.utils.annotations import Tuple
+
+# The minimum confidence for a detection to be trusted without asking a translation service
+CONFIDENCE_THRESHOLD = 0.8
+
+# (first code point, last code point, script)
+# Latin (and other unlisted) letters are grouped under the "Other" script
+SCRIPTS_RANGES = [
+    (0x0370, 0x03FF, "Greek"), (0x1F00, 0x1FFF, "Greek"),
+    (0x0400, 0x052F, "Cyrillic"),
+    (0x0530, 0x058F, "Armenian"),
+    (0x0590, 0x05FF, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"), (0x0750, 0x077F, "Arabic"), (0xFB50, 0xFDFF, "Arabic"), (0xFE70, 0xFEFF, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B00, 0x0B7F, "Oriya"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+    (0x0D80, 0x0DFF, "Sinhala"),
+    (0x0E00, 0x0E7F, "Thai"),
+    (0x0E80, 0x0EFF, "Lao"),
+    (0x1000, 0x109F, "Myanmar"),
+    (0x10A0, 0x10FF, "Georgian"),
+    (0x1100, 0x11FF, "Hangul"), (0x3130, 0x318F, "Hangul"), (0xAC00, 0xD7AF, "Hangul"),
+    (0x1200, 0x139F, "Ethiopic"),
+    (0x1780, 0x17FF, "Khmer"),
+    (0x1800, 0x18AF, "Mongolian"),
+    (0x3040, 0x309F, "Kana"), (0x30A0, 0x30FF, "Kana"), (0x31F0, 0x31FF, "Kana"), (0xFF66, 0xFF9F, "Kana"),
+    (0x3400, 0x4DBF, "Han"), (0x4E00, 0x9FFF, "Han"), (0xF900, 0xFAFF, "Han"),
+]
+
+# the maximum number of characters of the text used for the detection
+MAX_TEXT_LENGTH = 1000
+
+# the number of Han characters needed to be fully confident that a text without kana is Chinese
+HAN_MINIMUM_LENGTH = 8
+
+# the scripts only used by a single language, which tell the language by themselves
+SINGLE_LANGUAGE_SCRIPTS = {
+    "Greek": "ell", "Armenian": "hye", "Gurmukhi": "pan", "Gujarati": "guj", "Oriya": "ori", "Tamil": "tam",
+    "Telugu": "tel", "Kannada": "kan", "Malayalam": "mal", "Sinhala": "sin", "Thai": "tha", "Lao": "lao",
+    "Georgian": "kat", "Hangul": "kor", "Khmer": "khm"
+}
+
+# the scripts shared by several languages, with their most common language
+SHARED_SCRIPTS = {
+    "Cyrillic": "rus", "Hebrew": "heb", "Arabic": "ara", "Devanagari": "hin", "Bengali": "ben",
+    "Myanmar": "mya", "Ethiopic": "amh", "Mongolian": "mon"
+}
+
+# the maximum confidence of a detection based on a script shared by multiple languages
+# (i.e Bengali and Assamese, Amharic and Tigrinya, Chinese and Japanese kanji), below CONFIDENCE_THRESHOLD to let the services decide
+SHARED_SCRIPT_CONFIDENCE = 0.5
+
+# common Chinese characters (simplified or only used in Chinese) which don't appear in Japanese texts
+CHINESE_CHARACTERS = set("们這这們么麼样吗嗎呢没沒说个为时对给让过发见东车长门问间书语谢")
+
+
+def get_script(character: str) -> str:
+    """
+    Returns the Unicode script of the given character
+    """
+    code_point = ord(character)
+    if code_point < 0x0370:  # fast path for ASCII and Latin
+        return "Other"
+    for start, end, script in SCRIPTS_RANGES:
+        if start <= code_point <= end:
+            return script
+    return "Other"
+
+
+def _dominant_script(text: str) -> Tuple[str, float, Counter]:
+    """
+    Returns the most used script of the letters of the text, its share of the letters and the scripts count
+    """
+    scripts = Counter(get_script(character) for character in text if character.isalpha())
+    if not scripts:
+        return None, 0., scripts
+    script, count = scripts.most_common(1)[0]
+    return script, count / sum(scripts.values()), scripts
+
+
+def detect_language(text: str) -> Tuple[str, float]:
+    """
+    Detects the language of the given text without making any request
+
+    Returns a tuple with the translatepy language id (None if it could not be detected)
+    and the confidence of the detection, between 0 and 1
+    """
+    text = str(text)[:MAX_TEXT_LENGTH]
+    script, share, scripts = _dominant_script(text)
+    if script is None:
+        return None, 0.
+
+    # scripts which are specific enough to tell the language
+    if scripts["Kana"]:  # kana are only used in Japanese, along with Han characters
+        return "jpn", (scripts["Kana"] + scripts["Han"]) / sum(scripts.values())
+    if script == "Han":
+        # texts only made of Han characters could also be Japanese kanji, unless they use characters which are only Chinese
+        if not any(character in CHINESE_CHARACTERS for character in text):
+            return "zho", min(share, SHARED_SCRIPT_CONFIDENCE)
+        return "zho", share * min(1, scripts["Han"] / HAN_MINIMUM_LENGTH)
+
+    if script in SINGLE_LANGUAGE_SCRIPTS:
+        return SINGLE_LANGUAGE_SCRIPTS[script], share
+    if script in SHARED_SCRIPTS:
+        return SHARED_SCRIPTS[script], min(share, SHARED_SCRIPT_CONFIDENCE)
+    # the latin script (as well as the unlisted ones) is used by too many languages to tell them apart
+    return None, 0.
@@ -0,0 +1,169 @@
+"""
+A process-wide thread pool shared by the concurrent operations of translatepy (HTML nodes, long texts chunks...)
+
+Using a single bounded pool avoids spawning (and tearing down) new threads for every call
+and bounds the number of requests made to the translation services at the same time.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError, wait
+from threading import Event, Lock, local
+from time import monotonic
+from typing import Any, Callable, Iterable
+
+from translatepy.utils.annotations import Dict, List
+from translatepy.utils.tracing import Span, attach, current_span
+
+# The maximum number of threads of the shared pool, which is the maximum number of concurrent upstream requests
+MAX_WORKERS = 32
+
+_executor = None
+_executor_lock = Lock()
+_worker = local()
+
+# the number of tasks submitted to the shared pool and currently running
+_submitted = 0
+_running = 0
+_counters_lock = Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool, creating it if needed
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        return _executor
+
+
+def set_max_workers(max_workers: int) -> None:
+    """
+    Changes the size of the shared thread pool
+
+    The current pool finishes its running tasks before being replaced
+    """
+    global _executor, MAX_WORKERS
+    with _executor_lock:
+        MAX_WORKERS = max(1, int(max_workers))
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def executor_stats() -> Dict[str, int]:
+    """
+    Returns the saturation of the shared thread pool
+
+    {"max_workers": ..., "threads": ..., "active": ..., "queued": ...}
+    """
+    with _executor_lock:
+        executor = _executor
+        max_workers = MAX_WORKERS
+    with _counters_lock:
+        running, submitted = _running, _submitted
+    return {
+        "max_workers": max_workers,
+        "threads": len(executor._threads) if executor is not None else 0,
+        "active": running,
+        "queued": max(0, submitted - running)
+    }
+
+
+def _run_in_worker(function: Callable, element: Any, span: Span = None) -> Any:
+    global _running
+    with _counters_lock:
+        _running += 1
+    _worker.active = True
+    try:
+        # keeping the span of the caller as the parent of the spans started in the worker
+        with attach(span):
+            return function(element)
+    finally:
+        _worker.active = False
+        _task_done()
+
+
+def _task_done(running: bool = True) -> None:
+    global _submitted, _running
+    with _counters_lock:
+        _submitted -= 1
+        if running:
+            _running -= 1
+
+
+def _submit(executor: ThreadPoolExecutor, function: Callable, element: Any):
+    global _submitted
+    with _counters_lock:
+        _submitted += 1
+    try:
+        future = executor.submit(_run_in_worker, function, element, current_span())
+    except Exception:
+        _task_done(running=False)
+        raise
+    future.add_done_callback(lambda future: future.cancelled() and _task_done(running=False))
+    return future
+
+
+def map_bounded(function: Callable, iterable: Iterable, limit: int = None, timeout: float = None, cancel: Event = None) -> List:
+    """
+    Applies the function to every element on the shared thread pool and returns the results in order
+
+    Parameters:
+    ----------
+        function : function
+            The function to apply
+        iterable : Iterable
+            The elements
+        limit : int, default = None
+            The maximum number of elements processed at the same time by this call (defaults to the size of the pool)
+        timeout : float, default = None
+            The maximum number of seconds to wait for the results
+        cancel : threading.Event, default = None
+            An event which can be set to stop the processing early
+
+    Raises:
+    -------
+        TimeoutError:
+            When the timeout expires or the processing is cancelled.
+            The elements which are not processed yet are dropped.
+    """
+    elements = list(iterable)
+    if not elements:
+        return []
+
+    # running the nested calls (i.e a long text chunks inside an HTML node) in the current worker
+    # to avoid waiting for the pool from inside the pool
+    # (as well as the single elements which don't need to be waited for)
+    if getattr(_worker, "active", False) or (len(elements) == 1 and timeout is None and cancel is None):
+        return [function(element) for element in elements]
+
+    limit = len(elements) if limit is None else max(1, min(int(limit), len(elements)))
+    deadline = None if timeout is None else monotonic() + timeout
+    executor = get_executor()
+
+    results = [None] * len(elements)
+    pending = {}
+    next_index = 0
+    try:
+        while next_index < len(elements) or pending:
+            while next_index < len(elements) and len(pending) < limit:
+                pending[_submit(executor, function, elements[next_index])] = next_index
+                next_index += 1
+
+            if cancel is not None and cancel.is_set():
+                raise TimeoutError("The processing has been cancelled")
+            remaining = None if deadline is None else deadline - monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("The processing did not finish in time")
+            if cancel is not None:  # checking the cancel event regularly
+                remaining = 0.1 if remaining is None else min(remaining, 0.1)
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    return results
@@ -1,12 +1,44 @@
 # Based on: https://github.com/ZhymabekRoman/platonus_api_wrapper/blob/main/platonus_api_wrapper/utils/lru_cacher.py
 
+import gzip
 import logging
+from time import monotonic
 from functools import lru_cache, wraps
+from hashlib import sha1
 from datetime import datetime, timedelta
 from collections import OrderedDict
+from json import dumps, loads
+
+from translatepy.utils.annotations import Dict, List
+from translatepy.utils.metrics import metrics
+from translatepy.utils.tracing import tracer
+
+try:
+    from hashlib import blake2b
+except ImportError:  # Python < 3.6
+    blake2b = None
 
 logger = logging.getLogger('translatepy')
 
+# the size (in bytes) of the cache keys digests
+KEY_DIGEST_SIZE = 16
+
+
+def cache_key(*fields) -> str:
+    """
+    Returns a fixed-size key identifying the given fields (i.e the text and the languages codes)
+
+    The long texts are not stored in the keys, and the keys can be used by persistent caches
+    """
+    # falling back on a truncated SHA-1 digest when BLAKE2 isn't available
+    digest = sha1() if blake2b is None else blake2b(digest_size=KEY_DIGEST_SIZE)
+    for field in fields:
+        field = str(field).encode("utf-8")
+        # prefixing each field with its length to avoid collisions between ("ab", "c") and ("a", "bc")
+        digest.update(len(field).to_bytes(8, "little"))
+        digest.update(field)
+    return digest.digest()[:KEY_DIGEST_SIZE].hex()
+
 
 class LRUDictCache(OrderedDict):
 
@@ -20,7 +52,7 @@ class LRUDictCache(OrderedDict):
         return value
 
     def __setitem__(self, key, value):
-        if key in self:
+        if super().__contains__(key):
             self.move_to_end(key)
         super().__setitem__(key, value)
         if len(self) > self.maxsize:
@@ -31,6 +63,61 @@ class LRUDictCache(OrderedDict):
         super().clear()
 
 
+class MeteredDictCache(LRUDictCache):
+    """
+    A LRU cache recording its hits and misses (membership tests) in the metrics and traces under the given name
+    """
+
+    def __init__(self, name: str, maxsize=1024, *args, **kwds):
+        self.name = str(name)
+        super().__init__(maxsize, *args, **kwds)
+
+    def __contains__(self, key):
+        # the lookups are on the hottest path, only creating the spans when they are recorded
+        if tracer.hooks:
+            with tracer.span("cache.lookup", cache=self.name) as span:
+                found = super().__contains__(key)
+                span.set_attribute("cache.hit", found)
+        else:
+            found = super().__contains__(key)
+        if metrics.enabled:
+            metrics.observe_cache(self.name, found)
+        return found
+
+
+class TTLDictCache(LRUDictCache):
+    """
+    A LRU cache which entries expire after `ttl` seconds
+    """
+
+    def __init__(self, maxsize=1024, ttl: float = 300, *args, **kwds):
+        self.ttl = ttl
+        super().__init__(maxsize, *args, **kwds)
+
+    def __getitem__(self, key):
+        expiration, value = super().__getitem__(key)
+        if monotonic() >= expiration:
+            del self[key]
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, (monotonic() + self.ttl, value))
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
 def timed_lru_cache(seconds: int, maxsize: int = 128):
     def wrapper_cache(func):
         func = lru_cache(maxsize)(func)
@@ -56,3 +143,72 @@ def timed_lru_cache(seconds: int, maxsize: int = 128):
         return wrapped_func
 
     return wrapper_cache
+
+
+def open_cache_file(file, mode: str):
+    """
+    Opens the given path (compressed with gzip if it ends with ".gz"), or returns the given file-like object
+    """
+    if hasattr(file, "read") or hasattr(file, "write"):
+        return file
+    file = str(file)
+    if file.endswith(".gz"):
+        return gzip.open(file, mode + "t", encoding="utf-8")
+    return open(file, mode, encoding="utf-8")
+
+
+def dump_caches(caches: Dict[str, List[LRUDictCache]], file) -> int:
+    """
+    Writes the entries of the given caches to a JSON Lines file (or file-like object)
+
+    Each line is {"c": cache name, "k": key, "v": value}, values which can't be converted to JSON are skipped.
+
+    Returns the number of entries written
+    """
+    count = 0
+    handle = open_cache_file(file, "w")
+    try:
+        for name, cache_list in caches.items():
+            for cache in cache_list:
+                for key, value in list(cache.items()):
+                    try:
+                        line = dumps({"c": name, "k": key, "v": value}, ensure_ascii=False)
+                    except (TypeError, ValueError):  # not serializable
+                        continue
+                    handle.write(line + "\n")
+                    count += 1
+    finally:
+        if handle is not file:
+            handle.close()
+    return count
+
+
+def load_caches(caches: Dict[str, List[LRUDictCache]], file) -> int:
+    """
+    Loads the entries written by `dump_caches` into the given caches
+
+    Lists are converted back to tuples. The oldest entries are evicted if a cache is full.
+
+    Returns the number of entries loaded
+    """
+    count = 0
+    handle = open_cache_file(file, "r")
+    try:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            entry = loads(line)
+            cache_list = caches.get(entry.get("c"))
+            if not cache_list:
+                continue
+            value = entry["v"]
+            if isinstance(value, list):
+                value = tuple(value)
+            for cache in cache_list:
+                cache[entry["k"]] = value
+            count += 1
+    finally:
+        if handle is not file:
+            handle.close()
+    return count
@@ -0,0 +1,451 @@
+"""
+Helpers to translate the text nodes of HTML documents
+"""
+
+from html import escape
+from html.parser import HTMLParser
+from re import compile
+from threading import Event
+from time import monotonic
+from typing import Callable, Iterable, Iterator, Union
+
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, PageElement, PreformattedString, Tag
+
+from translatepy.exceptions import ParameterValueError
+from translatepy.models import TranslationResult
+from translatepy.utils.annotations import Dict, List, Tuple
+from translatepy.utils.executor import map_bounded
+from translatepy.utils.sanitize import remove_spaces
+
+# the elements which content is never translated
+SKIPPED_TAGS = {"script", "style", "code", "pre"}
+# the attributes holding human readable texts, i.e translate_html(..., attributes=TRANSLATABLE_ATTRIBUTES)
+TRANSLATABLE_ATTRIBUTES = ["alt", "title", "placeholder"]
+# the elements which don't have any content nor end tag
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+
+# a tag name, followed by classes and ids (i.e "div.notes#main")
+SIMPLE_SELECTOR_REGEX = compile(r"^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)$")
+SELECTOR_PARTS_REGEX = compile(r"([.#])([\w-]+)")
+
+
+def parse_html(html: Union[str, PageElement, Tag, BeautifulSoup], parser: str = "html.parser") -> Union[PageElement, Tag, BeautifulSoup]:
+    """
+    Returns the given element, or the BeautifulSoup page of the given HTML string
+    """
+    if isinstance(html, (PageElement, Tag, BeautifulSoup)):
+        return html
+    return BeautifulSoup(str(html), str(parser))
+
+
+class AttributeNode():
+    """
+    An attribute of an element, which can be translated like a text node
+    """
+
+    def __init__(self, tag: Tag, attribute: str) -> None:
+        self.tag = tag
+        self.attribute = attribute
+
+    def replace_with(self, value: str) -> None:
+        self.tag[self.attribute] = value
+
+    def __str__(self) -> str:
+        return str(self.tag[self.attribute])
+
+
+def _get_classes(attrs: dict) -> List[str]:
+    classes = attrs.get("class") or []
+    return classes.split() if isinstance(classes, str) else list(classes)
+
+
+def _element_state(name: str, attrs: dict, parent_skipped: bool = False, parent_translate: bool = True) -> Tuple[bool, bool]:
+    """
+    Returns whether the content of the element is skipped and whether it should be translated (following the `translate` attribute)
+    """
+    skipped = parent_skipped or name in SKIPPED_TAGS or "notranslate" in _get_classes(attrs)
+    translate = attrs.get("translate")
+    if translate is None:  # inherited from the parent
+        translate = parent_translate
+    else:
+        translate = str(translate).strip().lower() != "no"
+    return skipped, translate
+
+
+def get_text_nodes(page: Union[PageElement, Tag, BeautifulSoup], exclude: List[str] = None, attributes: List[str] = None) -> Dict[str, List[NavigableString]]:
+    """
+    Returns the translatable text nodes of the page, grouped by their stripped text
+
+    Identical nodes only need to be translated once.
+    The content of <script>, <style>, <code> and <pre> elements, of elements with the `notranslate` class or
+    the `translate="no"` attribute and of the elements matching one of the `exclude` CSS selectors is skipped.
+
+    The given `attributes` of the translatable elements are returned as `AttributeNode` objects.
+    """
+    excluded = set()
+    for selector in exclude or []:
+        excluded.update(id(element) for element in page.select(selector))
+
+    states = {}
+
+    def _state(tag: Tag) -> Tuple[bool, bool]:
+        # walking up to the nearest element with a known state, without recursion as documents can be very deep
+        ancestors = []
+        while isinstance(tag, Tag) and not isinstance(tag, BeautifulSoup) and id(tag) not in states:
+            ancestors.append(tag)
+            tag = tag.parent
+        state = states.get(id(tag), (False, True))
+        for element in reversed(ancestors):
+            skipped, translate = _element_state(element.name, element.attrs, *state)
+            state = states[id(element)] = (skipped or id(element) in excluded, translate)
+        return state
+
+    def _is_translatable(tag: Tag) -> bool:
+        skipped, translate = _state(tag)
+        return translate and not skipped
+
+    nodes = {}
+    for node in page.find_all(string=True, recursive=True):
+        if isinstance(node, PreformattedString) or remove_spaces(node) == "" or not _is_translatable(node.parent):
+            continue
+        nodes.setdefault(str(node).strip(), []).append(node)
+
+    if attributes:
+        tags = page.find_all(True)
+        if isinstance(page, Tag) and not isinstance(page, BeautifulSoup):
+            tags.insert(0, page)
+        for tag in tags:
+            for attribute in attributes:
+                value = tag.get(attribute)
+                if not isinstance(value, str) or remove_spaces(value) == "" or not _is_translatable(tag):
+                    continue
+                nodes.setdefault(value.strip(), []).append(AttributeNode(tag, attribute))
+    return nodes
+
+
+def replace_node(node: Union[NavigableString, AttributeNode], translation: str) -> None:
+    """
+    Replaces the text node (or attribute) with its translation, keeping its surrounding whitespaces
+    """
+    text = str(node)
+    leading_spaces = text[:len(text) - len(text.lstrip())]
+    trailing_spaces = text[len(text.rstrip()):]
+    node.replace_with(leading_spaces + translation + trailing_spaces)
+
+
+def translate_texts(texts: List[str], translate: Callable[[str], TranslationResult], translate_batch: Callable[[List[str]], List[TranslationResult]] = None, threads_limit: int = 100, timeout: float = None, cancel: Event = None) -> List[TranslationResult]:
+    """
+    Translates the given texts, packing them in as few requests as possible if `translate_batch` is given
+
+    Parameters:
+    ----------
+        texts : list[str]
+            The texts to translate
+        translate : function
+            Translates a single text
+        translate_batch : function, default = None
+            Translates a list of texts, packing them in as few requests as possible.
+            If not given or if it fails, each text is translated separately with `translate`
+        threads_limit : int, default = 100
+            The maximum number of texts translated at the same time (on the shared thread pool) when translating them separately
+        timeout : float, default = None
+            The maximum number of seconds to wait for the translations, the remaining ones are cancelled afterwards
+        cancel : threading.Event, default = None
+            An event which can be set to cancel the remaining translations
+
+    Returns:
+    --------
+        list[TranslationResult]:
+            The results, in the same order as `texts` (None for the texts which couldn't be translated)
+
+    Raises TimeoutError when the timeout expires or the translations are cancelled.
+    """
+    if not texts:
+        return []
+
+    deadline = None if timeout is None else monotonic() + timeout
+    if translate_batch is not None:
+        try:
+            return map_bounded(translate_batch, [texts], timeout=timeout, cancel=cancel)[0]
+        except Exception:  # falling back on translating each text separately
+            if (cancel is not None and cancel.is_set()) or (deadline is not None and monotonic() >= deadline):
+                raise
+
+    def _translate(text: str):
+        try:
+            return translate(text)
+        except Exception:  # ignore if it couldn't find any result or an error occured
+            return None
+
+    remaining = None if deadline is None else deadline - monotonic()
+    return map_bounded(_translate, texts, limit=threads_limit, timeout=remaining, cancel=cancel)
+
+
+def translate_nodes(nodes: Dict[str, List[NavigableString]], translate: Callable[[str], TranslationResult], translate_batch: Callable[[List[str]], List[TranslationResult]] = None, threads_limit: int = 100, timeout: float = None, cancel: Event = None) -> List[TranslationResult]:
+    """
+    Translates the given text nodes (as returned by `get_text_nodes`) in place, see `translate_texts`
+
+    Returns:
+    --------
+        list[TranslationResult]:
+            The results of the successful translations
+    """
+    texts = list(nodes)
+    results = translate_texts(texts, translate, translate_batch, threads_limit, timeout, cancel)
+    for text, result in zip(texts, results):
+        if result is None:
+            continue
+        for node in nodes[text]:
+            replace_node(node, result.result)
+
+    return [result for result in results if result is not None]
+
+
+# the size of the pieces read from file-like objects when streaming
+STREAM_READ_SIZE = 65536
+
+
+def _parse_simple_selector(selector: str) -> Tuple[str, List[str], List[str]]:
+    """
+    Returns the tag name, classes and ids of a simple CSS selector (i.e "div.notes#main")
+    """
+    selector = str(selector).strip()
+    match = SIMPLE_SELECTOR_REGEX.match(selector)
+    if selector == "" or match is None:
+        raise ParameterValueError("Only simple selectors (a tag name followed by classes and ids, i.e 'div.notes') can be used when streaming, '{}' was given".format(selector))
+    parts = SELECTOR_PARTS_REGEX.findall(match.group(2))
+    return (match.group(1) or "").lower() or None, [name for kind, name in parts if kind == "."], [name for kind, name in parts if kind == "#"]
+
+
+def parse_stream_selectors(selectors: List[str] = None) -> List[Tuple[str, List[str], List[str]]]:
+    """
+    Returns the (tag name, classes, ids) of the given `exclude` selectors when streaming
+
+    Raises ParameterValueError if one of them isn't a simple selector, which can be used to validate them beforehand
+    """
+    return [_parse_simple_selector(selector) for selector in selectors or []]
+
+
+class HTMLTokenizer(HTMLParser):
+    """
+    An incremental HTML tokenizer which keeps the markup untouched
+
+    The tokens are ("text", unescaped text), ("markup", raw HTML) or ("tag", (tag, attrs, self closing))
+    tuples (for the start tags with attributes to translate), stored in `tokens`
+    """
+
+    def __init__(self, exclude: List[str] = None, attributes: List[str] = None) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tokens = []
+        self.texts_count = 0  # the number of translatable texts in `tokens`
+        self.exclude = parse_stream_selectors(exclude)
+        self.attributes = set(attributes or [])
+        self.stack = []  # (tag, skipped, translate) for every open element
+
+    def _markup(self, markup: str) -> None:
+        self.tokens.append(("markup", markup))
+
+    def _is_excluded(self, tag: str, attrs: dict) -> bool:
+        classes = _get_classes(attrs)
+        for name, selector_classes, ids in self.exclude:
+            if (name is None or name == tag) and all(element in classes for element in selector_classes) and all(element == attrs.get("id") for element in ids):
+                return True
+        return False
+
+    def _is_translatable(self) -> bool:
+        if not self.stack:
+            return True
+        _, skipped, translate = self.stack[-1]
+        return translate and not skipped
+
+    def _start(self, tag: str, attrs: list, self_closing: bool) -> None:
+        attrs_dict = dict(attrs)
+        parent_skipped, parent_translate = (self.stack[-1][1], self.stack[-1][2]) if self.stack else (False, True)
+        skipped, translate = _element_state(tag, attrs_dict, parent_skipped, parent_translate)
+        skipped = skipped or self._is_excluded(tag, attrs_dict)
+        if not self_closing and tag not in VOID_TAGS:
+            self.stack.append((tag, skipped, translate))
+
+        translated_attributes = [name for name, value in attrs if name in self.attributes and value and remove_spaces(value) != ""]
+        if translated_attributes and translate and not skipped:
+            self.tokens.append(("tag", (tag, attrs, self_closing)))
+            self.texts_count += len(translated_attributes)
+        else:
+            self._markup(self.get_starttag_text())
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs, False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs, True)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                del self.stack[index:]
+                break
+        self._markup("</{tag}>".format(tag=tag))
+
+    def handle_data(self, data):
+        if self.cdata_elem is not None:  # the content of <script> and <style> elements
+            self._markup(data)
+        elif remove_spaces(data) == "" or not self._is_translatable():
+            self._markup(escape(data, quote=False))
+        else:
+            self.tokens.append(("text", data))
+            self.texts_count += 1
+
+    def handle_comment(self, data):
+        self._markup("<!--{data}-->".format(data=data))
+
+    def handle_decl(self, decl):
+        self._markup("<!{decl}>".format(decl=decl))
+
+    def handle_pi(self, data):
+        self._markup("<?{data}>".format(data=data))
+
+    def unknown_decl(self, data):
+        self._markup("<![{data}]>".format(data=data))
+
+    def _texts_count(self, token: Tuple[str, object]) -> int:
+        kind, value = token
+        if kind == "text":
+            return 1
+        if kind == "tag":
+            return len([name for name, attribute in value[1] if name in self.attributes and attribute and remove_spaces(attribute) != ""])
+        return 0
+
+    def pop_tokens(self, texts_limit: int = None) -> List[Tuple[str, object]]:
+        """
+        Returns the tokens parsed so far and removes them from the tokenizer
+
+        If `texts_limit` is given, only the tokens up to the one holding the `texts_limit`-th text are returned
+        """
+        if texts_limit is None or texts_limit >= self.texts_count:
+            tokens, self.tokens, self.texts_count = self.tokens, [], 0
+            return tokens
+        texts = 0
+        for index, token in enumerate(self.tokens):
+            texts += self._texts_count(token)
+            if texts >= texts_limit:
+                break
+        tokens, self.tokens = self.tokens[:index + 1], self.tokens[index + 1:]
+        self.texts_count -= texts
+        return tokens
+
+
+def _read_pieces(html: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Yields the pieces of the given HTML string, file-like object or iterable of strings
+    """
+    if isinstance(html, (str, bytes)):
+        html = html.decode("utf-8") if isinstance(html, bytes) else html
+        for index in range(0, len(html), STREAM_READ_SIZE):
+            yield html[index:index + STREAM_READ_SIZE]
+    elif hasattr(html, "read"):
+        while True:
+            piece = html.read(STREAM_READ_SIZE)
+            if not piece:
+                break
+            yield piece.decode("utf-8") if isinstance(piece, bytes) else piece
+    else:
+        for piece in html:
+            yield piece.decode("utf-8") if isinstance(piece, bytes) else str(piece)
+
+
+def _translate_tokens(tokenizer: HTMLTokenizer, tokens: List[Tuple[str, object]], translate: Callable[[str], TranslationResult], translate_batch: Callable[[List[str]], List[TranslationResult]] = None, threads_limit: int = 100, timeout: float = None, cancel: Event = None) -> str:
+    """
+    Translates the texts of the tokens and returns the resulting HTML
+    """
+    texts = {}  # removing the duplicates while keeping the order
+    for kind, value in tokens:
+        if kind == "text":
+            texts[value.strip()] = None
+        elif kind == "tag":
+            for name, attribute in value[1]:
+                if name in tokenizer.attributes and attribute and remove_spaces(attribute) != "":
+                    texts[attribute.strip()] = None
+    texts = list(texts)
+
+    translations = {}
+    for text, result in zip(texts, translate_texts(texts, translate, translate_batch, threads_limit, timeout, cancel)):
+        if result is not None:
+            translations[text] = result.result
+
+    def _translated(value: str) -> str:
+        content = value.strip()
+        leading_spaces = value[:len(value) - len(value.lstrip())]
+        trailing_spaces = value[len(value.rstrip()):]
+        return leading_spaces + translations.get(content, content) + trailing_spaces
+
+    output = []
+    for kind, value in tokens:
+        if kind == "markup":
+            output.append(value)
+        elif kind == "text":
+            output.append(escape(_translated(value), quote=False))
+        else:
+            tag, attrs, self_closing = value
+            result = "<" + tag
+            for name, attribute in attrs:
+                if attribute is None:
+                    result += " " + name
+                    continue
+                if name in tokenizer.attributes and remove_spaces(attribute) != "":
+                    attribute = _translated(attribute)
+                result += ' {name}="{value}"'.format(name=name, value=escape(attribute, quote=True))
+            output.append(result + (" />" if self_closing else ">"))
+    return "".join(output)
+
+
+def translate_html_stream(html: Union[str, Iterable[str]], translate: Callable[[str], TranslationResult], translate_batch: Callable[[List[str]], List[TranslationResult]] = None, window_size: int = 100, threads_limit: int = 100, timeout: float = None, exclude: List[str] = None, attributes: List[str] = None, cancel: Event = None) -> Iterator[str]:
+    """
+    Translates the given HTML incrementally, without building the whole document in memory
+
+    The text runs are translated in windows of `window_size` text nodes, and the translated HTML
+    is yielded as soon as each window is translated.
+
+    Parameters:
+    ----------
+        html : str | file-like object | Iterable[str]
+            The HTML to translate
+        translate : function
+            Translates a single text
+        translate_batch : function, default = None
+            Translates a list of texts, packing them in as few requests as possible
+        window_size : int, default = 100
+            The number of text nodes translated at once
+        threads_limit : int, default = 100
+            The maximum number of texts translated at the same time (on the shared thread pool) when translating them separately
+        timeout : float, default = None
+            The maximum number of seconds to wait for the translations of each window, the remaining ones are cancelled afterwards
+        exclude : list[str], default = None
+            Simple CSS selectors (i.e "div.notes#main") of the elements which shouldn't be translated
+        attributes : list[str], default = None
+            The attributes to translate (i.e `TRANSLATABLE_ATTRIBUTES`)
+        cancel : threading.Event, default = None
+            An event which can be set to cancel the remaining translations (i.e when the client disconnects)
+
+    Yields:
+    -------
+        str:
+            The translated HTML, piece by piece
+
+    Raises ParameterValueError when called (before anything is yielded) if one of the `exclude` selectors isn't supported.
+    """
+    window_size = max(1, int(window_size))
+    # creating the tokenizer now to validate the selectors before the caller starts streaming
+    tokenizer = HTMLTokenizer(exclude, attributes)
+    return _stream_tokens(tokenizer, html, translate, translate_batch, window_size, threads_limit, timeout, cancel)
+
+
+def _stream_tokens(tokenizer: HTMLTokenizer, html: Union[str, Iterable[str]], translate: Callable[[str], TranslationResult], translate_batch: Callable[[List[str]], List[TranslationResult]], window_size: int, threads_limit: int, timeout: float, cancel: Event) -> Iterator[str]:
+    for piece in _read_pieces(html):
+        tokenizer.feed(piece)
+        while tokenizer.texts_count >= window_size:
+            yield _translate_tokens(tokenizer, tokenizer.pop_tokens(window_size), translate, translate_batch, threads_limit, timeout, cancel)
+    tokenizer.close()
+    tokens = tokenizer.pop_tokens()
+    if tokens:
+        yield _translate_tokens(tokenizer, tokens, translate, translate_batch, threads_limit, timeout, cancel)
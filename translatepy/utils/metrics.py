@@ -0,0 +1,357 @@
+"""
+Collects metrics on the translators calls, the HTTP requests and the caches
+
+The public methods of every translator record their latency and outcome (success or exception type),
+the requests record their latency, status and size, attributed to the translator making them,
+and the translators caches record their hits and misses.
+
+The metrics are available with `metrics.snapshot()` (or `Translate.stats()`),
+can be sent to exporters with `metrics.export()` and rendered in the Prometheus text format with `prometheus_text()`.
+"""
+
+import logging
+from bisect import bisect_left
+from functools import wraps
+from json import dumps
+from threading import Lock, local
+from time import perf_counter, time
+
+from translatepy.utils.annotations import Dict, Tuple
+from translatepy.utils.tracing import NO_SPAN, call_attributes, tracer
+
+# the upper bounds (in seconds) of the latency histograms buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf"))
+
+_context = local()
+
+
+class Histogram():
+    """
+    Counts the observed values in fixed buckets
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.
+
+    def observe(self, value: float) -> None:
+        self.counts[min(bisect_left(self.buckets, value), len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self) -> dict:
+        """
+        Returns the histogram with cumulative buckets counts (values lower or equal to each bound)
+        """
+        buckets = {}
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = total
+        return {
+            "buckets": buckets,
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.
+        }
+
+
+class Exporter():
+    """
+    The base class of the metrics exporters, which receive the metrics snapshots
+    """
+
+    def export(self, snapshot: dict) -> None:
+        raise NotImplementedError
+
+
+class JSONExporter(Exporter):
+    def __init__(self, file) -> None:
+        """
+        Appends each snapshot as a JSON line to the given path or file-like object
+        """
+        self.file = file
+
+    def export(self, snapshot: dict) -> None:
+        line = dumps(snapshot, ensure_ascii=False) + "\n"
+        if hasattr(self.file, "write"):
+            self.file.write(line)
+        else:
+            with open(self.file, "a", encoding="utf-8") as file:
+                file.write(line)
+
+
+class LoggingExporter(Exporter):
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO) -> None:
+        """
+        Logs a summary line for each translator
+        """
+        self.logger = logger or logging.getLogger("translatepy")
+        self.level = level
+
+    def export(self, snapshot: dict) -> None:
+        for service, data in snapshot["services"].items():
+            calls = sum(method["latency"]["count"] for method in data["methods"].values())
+            errors = sum(count for method in data["methods"].values() for outcome, count in method["outcomes"].items() if outcome != "success")
+            self.logger.log(self.level, "%s: %d calls, %d errors, %d requests, %d bytes in, %d bytes out",
+                            service, calls, errors, data["requests"]["count"], data["requests"]["bytes_in"], data["requests"]["bytes_out"])
+        for cache, data in snapshot["caches"].items():
+            self.logger.log(self.level, "%s cache: %d hits, %d misses", cache, data["hits"], data["misses"])
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class PrometheusWriter():
+    """
+    Renders metrics in the Prometheus text exposition format (version 0.0.4)
+    """
+
+    def __init__(self, namespace: str = "translatepy") -> None:
+        self.namespace = namespace
+        self._families = {}  # name --> (type, help, samples lines)
+
+    def _family(self, kind: str, name: str, description: str) -> Tuple[str, list]:
+        name = "{}_{}".format(self.namespace, name) if self.namespace else name
+        if name not in self._families:
+            self._families[name] = (kind, description, [])
+        return name, self._families[name][2]
+
+    @staticmethod
+    def _sample(name: str, value: float, labels: dict = None) -> str:
+        if labels:
+            name += "{" + ",".join('{}="{}"'.format(key, _escape_label(element)) for key, element in labels.items()) + "}"
+        return "{} {}".format(name, _format_value(value))
+
+    def counter(self, name: str, description: str, value: float, labels: dict = None) -> None:
+        name, samples = self._family("counter", name, description)
+        samples.append(self._sample(name, value, labels))
+
+    def gauge(self, name: str, description: str, value: float, labels: dict = None) -> None:
+        name, samples = self._family("gauge", name, description)
+        samples.append(self._sample(name, value, labels))
+
+    def histogram(self, name: str, description: str, histogram: dict, labels: dict = None) -> None:
+        """
+        Adds a histogram, given as returned by `Histogram.as_dict()`
+        """
+        name, samples = self._family("histogram", name, description)
+        labels = labels or {}
+        for bound, count in histogram["buckets"].items():
+            samples.append(self._sample(name + "_bucket", count, dict(labels, le=bound)))
+        samples.append(self._sample(name + "_sum", histogram["sum"], labels))
+        samples.append(self._sample(name + "_count", histogram["count"], labels))
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, description, samples) in self._families.items():
+            lines.append("# HELP {} {}".format(name, description.replace("\\", "\\\\").replace("\n", "\\n")))
+            lines.append("# TYPE {} {}".format(name, kind))
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def prometheus_text(snapshot: dict = None, writer: PrometheusWriter = None) -> str:
+    """
+    Renders a metrics snapshot (defaults to the current metrics) in the Prometheus text format
+
+    Parameters:
+    ----------
+        snapshot : dict
+            A snapshot returned by `Metrics.snapshot()`
+        writer : PrometheusWriter
+            A writer which might already contain other metrics (i.e the server ones)
+    """
+    snapshot = metrics.snapshot() if snapshot is None else snapshot
+    writer = writer or PrometheusWriter()
+    for service, data in snapshot["services"].items():
+        for method, call in data["methods"].items():
+            labels = {"service": service, "method": method}
+            writer.histogram("service_call_duration_seconds", "The duration of the translators methods calls", call["latency"], labels)
+            for outcome, count in call["outcomes"].items():
+                writer.counter("service_calls_total", "The number of translators methods calls by outcome", count, dict(labels, outcome=outcome))
+        requests = data["requests"]
+        if requests["count"]:
+            labels = {"service": service}
+            writer.histogram("upstream_request_duration_seconds", "The duration of the HTTP requests made to the translation services", requests["latency"], labels)
+            for status, count in requests["status"].items():
+                writer.counter("upstream_requests_total", "The number of HTTP requests made to the translation services by status code", count, dict(labels, status=status))
+            for error, count in requests["errors"].items():
+                writer.counter("upstream_errors_total", "The number of HTTP requests to the translation services which failed without response", count, dict(labels, error=error))
+            writer.counter("upstream_received_bytes_total", "The number of bytes received from the translation services", requests["bytes_in"], labels)
+            writer.counter("upstream_sent_bytes_total", "The number of bytes sent to the translation services", requests["bytes_out"], labels)
+    for cache, data in snapshot["caches"].items():
+        labels = {"cache": cache}
+        writer.counter("cache_hits_total", "The number of cache lookups which found a result", data["hits"], labels)
+        writer.counter("cache_misses_total", "The number of cache lookups which didn't find any result", data["misses"], labels)
+        writer.gauge("cache_hit_ratio", "The ratio of cache lookups which found a result", data["hit_ratio"], labels)
+    return writer.render()
+
+
+class Metrics():
+    """
+    A thread safe registry of the translatepy metrics
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.exporters = []
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clears all of the recorded metrics
+        """
+        with self._lock:
+            self._calls = {}  # (service, method) --> {"latency": Histogram, "outcomes": {outcome: count}}
+            self._requests = {}  # service --> requests metrics
+            self._caches = {}  # cache name --> [hits, misses]
+            self._start = time()
+
+    def observe_call(self, service: str, method: str, duration: float, exception: Exception = None) -> None:
+        """
+        Records a call to a translator public method
+        """
+        outcome = "success" if exception is None else type(exception).__name__
+        with self._lock:
+            data = self._calls.get((service, method))
+            if data is None:
+                data = self._calls[(service, method)] = {"latency": Histogram(), "outcomes": {}}
+            data["latency"].observe(duration)
+            data["outcomes"][outcome] = data["outcomes"].get(outcome, 0) + 1
+
+    def observe_request(self, service: str, duration: float, status_code: int = None, bytes_in: int = 0, bytes_out: int = 0, exception: Exception = None) -> None:
+        """
+        Records an HTTP request made by the given translator (or to the given host)
+        """
+        with self._lock:
+            data = self._requests.get(service)
+            if data is None:
+                data = self._requests[service] = {"latency": Histogram(), "count": 0, "status": {}, "errors": {}, "bytes_in": 0, "bytes_out": 0}
+            data["latency"].observe(duration)
+            data["count"] += 1
+            if exception is not None:
+                name = type(exception).__name__
+                data["errors"][name] = data["errors"].get(name, 0) + 1
+            else:
+                status = str(status_code)
+                data["status"][status] = data["status"].get(status, 0) + 1
+            data["bytes_in"] += bytes_in
+            data["bytes_out"] += bytes_out
+
+    def observe_cache(self, cache: str, hit: bool) -> None:
+        """
+        Records a cache lookup
+        """
+        with self._lock:
+            data = self._caches.get(cache)
+            if data is None:
+                data = self._caches[cache] = [0, 0]
+            data[0 if hit else 1] += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Returns a copy of the metrics
+
+        {
+            "time": ..., "since": ...,
+            "services": {service: {"methods": {method: {"latency": ..., "outcomes": ...}}, "requests": {...}}},
+            "caches": {cache: {"hits": ..., "misses": ..., "hit_ratio": ...}}
+        }
+        """
+        with self._lock:
+            services = {}
+
+            def _service(name: str) -> dict:
+                if name not in services:
+                    services[name] = {
+                        "methods": {},
+                        "requests": {"latency": Histogram().as_dict(), "count": 0, "status": {}, "errors": {}, "bytes_in": 0, "bytes_out": 0}
+                    }
+                return services[name]
+
+            for (service, method), data in self._calls.items():
+                _service(service)["methods"][method] = {"latency": data["latency"].as_dict(), "outcomes": dict(data["outcomes"])}
+            for service, data in self._requests.items():
+                requests = dict(data, status=dict(data["status"]), errors=dict(data["errors"]))
+                requests["latency"] = data["latency"].as_dict()
+                _service(service)["requests"] = requests
+
+            caches = {
+                name: {"hits": hits, "misses": misses, "hit_ratio": hits / (hits + misses) if hits + misses else 0.}
+                for name, (hits, misses) in self._caches.items()
+            }
+            return {"time": time(), "since": self._start, "services": services, "caches": caches}
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        self.exporters.append(exporter)
+
+    def remove_exporter(self, exporter: Exporter) -> None:
+        self.exporters.remove(exporter)
+
+    def export(self) -> dict:
+        """
+        Sends a snapshot of the metrics to every exporter and returns it
+        """
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            try:
+                exporter.export(snapshot)
+            except Exception:
+                logging.getLogger("translatepy").exception("Error while exporting the metrics with {}".format(exporter))
+        return snapshot
+
+
+# the metrics registry used by translatepy
+metrics = Metrics()
+
+
+def current_service() -> str:
+    """
+    Returns the name of the translator running in the current thread, if any
+    """
+    return getattr(_context, "service", None)
+
+
+def instrumented(method: str):
+    """
+    Records the latency and outcome of the decorated translator method, and attributes the requests it makes to the translator
+
+    The call is also traced in a "translator.<method>" span
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(self, *args, **kwargs):
+            if not metrics.enabled and not tracer.hooks:
+                return function(self, *args, **kwargs)
+            service = str(self)
+            previous = current_service()
+            _context.service = service
+            span = tracer.span("translator.{}".format(method), service=service, method=method, **call_attributes(function, (self,) + args, kwargs)) if tracer.hooks else NO_SPAN
+            start = perf_counter()
+            try:
+                with span:
+                    result = function(self, *args, **kwargs)
+            except Exception as exception:
+                if metrics.enabled:
+                    metrics.observe_call(service, method, perf_counter() - start, exception)
+                raise
+            finally:
+                _context.service = previous
+            if metrics.enabled:
+                metrics.observe_call(service, method, perf_counter() - start)
+            return result
+        return wrapper
+    return decorator
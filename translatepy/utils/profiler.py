@@ -0,0 +1,259 @@
+"""
+A built-in profiler for translatepy
+
+It runs either cProfile (exact calls statistics, for the current thread only) or a sampling profiler
+(a background thread recording the stacks of the threads running translatepy, with a low overhead),
+and splits the time between CPU (bs4, Language resolution, parsing...) and waiting (network, locks...).
+
+The sampled stacks are written in the "collapsed" format, which can be turned into a flame graph
+by `flamegraph.pl`, speedscope or inferno.
+"""
+
+import cProfile
+import pstats
+import sys
+import time
+from collections import Counter
+from json import dumps
+from os.path import abspath, dirname, join
+from threading import Event, Thread, get_ident
+
+from translatepy.exceptions import ParameterValueError
+from translatepy.utils.annotations import Dict, List
+
+MODES = {"sampling", "cprofile"}
+
+PACKAGE_DIRECTORY = dirname(dirname(abspath(__file__)))
+
+# (category, paths fragments), the first category matching a frame of the stack is used
+CPU_CATEGORIES = (
+    ("bs4", ("/bs4/", "/soupsieve/", "/translatepy/utils/markup.py")),
+    ("language", ("/translatepy/language.py", "/translatepy/utils/similarity.py", "/translatepy/utils/detection.py")),
+    ("parsing", ("/json/", "/html/parser.py", "/xml/", "/lxml/", "/re/", "/sre_", "/translatepy/utils/sanitize.py")),
+)
+NETWORK_PATHS = ("/socket.py", "/ssl.py", "/http/client.py", "/urllib3/", "/requests/", "/selectors.py")
+# the functions which block without using the CPU (used to classify the samples when the threads CPU time isn't available)
+WAITING_PATHS = NETWORK_PATHS + ("/threading.py", "/queue.py", "/concurrent/futures/")
+WAITING_BUILTINS = ("recv", "send", "connect", "read", "write", "select", "poll", "sleep", "acquire", "getaddrinfo", "do_handshake")
+
+
+def _path(filename: str) -> str:
+    return str(filename).replace("\\", "/")
+
+
+def _matches(filename: str, fragments: tuple) -> bool:
+    filename = _path(filename)
+    return any(fragment in filename for fragment in fragments)
+
+
+def categorize(filenames: List[str], waiting: bool) -> str:
+    """
+    Returns the category of a sample, given the files of its stack and whether the thread was waiting
+    """
+    if waiting:
+        if any(_matches(filename, NETWORK_PATHS) for filename in filenames):
+            return "wait.network"
+        return "wait.other"
+    for category, fragments in CPU_CATEGORIES:
+        if any(_matches(filename, fragments) for filename in filenames):
+            return "cpu." + category
+    return "cpu.other"
+
+
+def _categorize_function(filename: str, name: str) -> str:
+    """
+    Returns the category of a function from the cProfile statistics (which don't have the full stacks)
+    """
+    if filename == "~":  # built-in function
+        if any(builtin in name for builtin in WAITING_BUILTINS):
+            return "wait.network" if "socket" in name or "ssl" in name.lower() or "getaddrinfo" in name else "wait.other"
+        return "cpu.other" if "json" not in name else "cpu.parsing"
+    return categorize([filename], waiting=False)
+
+
+def _thread_cpu_time(ident: int) -> float:
+    """
+    Returns the CPU time used by the given thread, or None if it isn't available on this platform
+    """
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError, ValueError, OverflowError):
+        return None
+
+
+class Profiler():
+    def __init__(self, mode: str = "sampling", interval: float = 0.005, threads: List[int] = None) -> None:
+        """
+        Profiles the code running between `start()` and `stop()` (or inside a `with` block)
+
+        Parameters:
+        ----------
+            mode : str
+                "sampling" (a low overhead profiler sampling the threads stacks) or "cprofile" (the exact calls of the current thread)
+            interval : float
+                The number of seconds between two samples
+            threads : list[int]
+                The identifiers of the threads to sample (defaults to every thread running translatepy)
+        """
+        mode = str(mode).lower()
+        if mode not in MODES:
+            raise ParameterValueError("Parameter 'mode' must be one of {}, {} was given".format(", ".join(sorted(MODES)), mode))
+        self.mode = mode
+        self.interval = float(interval)
+        self.threads = None if threads is None else set(threads)
+
+        self.stacks = Counter()  # collapsed stack --> number of samples
+        self.categories = Counter()  # category --> estimated number of seconds
+        self.samples = 0
+        self.wall = 0.
+        self.cpu = 0.
+
+        self._profile = None
+        self._sampler = None
+        self._stop = Event()
+        self._threads_cpu = {}
+        self._start = None
+        self._start_cpu = None
+
+    # sampling
+
+    def _sample(self, elapsed: float) -> None:
+        current = get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == current or (self.threads is not None and ident not in self.threads):
+                continue
+
+            frames = []
+            while frame is not None:
+                frames.append(frame)
+                frame = frame.f_back
+            frames.reverse()
+            filenames = [frame.f_code.co_filename for frame in frames]
+            # ignoring the idle threads (i.e the thread pool workers waiting for tasks)
+            if self.threads is None and not any(_path(filename).startswith(_path(PACKAGE_DIRECTORY)) for filename in filenames):
+                continue
+
+            cpu_time = _thread_cpu_time(ident)
+            previous = self._threads_cpu.get(ident)
+            self._threads_cpu[ident] = cpu_time
+            if cpu_time is not None and previous is not None:
+                waiting = cpu_time - previous < elapsed / 2
+            else:
+                waiting = _matches(filenames[-1], WAITING_PATHS)
+
+            self.stacks[";".join("{}:{}".format(filename.replace("\\", "/").rsplit("/", 1)[-1], frame.f_code.co_name).replace(";", ":") for filename, frame in zip(filenames, frames))] += 1
+            self.categories[categorize(filenames, waiting)] += elapsed
+            self.samples += 1
+
+    def _sampling_loop(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    # control
+
+    def start(self) -> "Profiler":
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._stop.clear()
+            self._sampler = Thread(target=self._sampling_loop, name="translatepy-profiler", daemon=True)
+            self._sampler.start()
+        return self
+
+    def stop(self) -> "Profiler":
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        self.wall = time.perf_counter() - self._start
+        self.cpu = time.process_time() - self._start_cpu
+        if self._profile is not None:
+            self.categories = Counter()
+            for (filename, _, name), (_, _, total_time, _, _) in pstats.Stats(self._profile).stats.items():
+                self.categories[_categorize_function(filename, name)] += total_time
+        return self
+
+    def __enter__(self) -> "Profiler":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    # results
+
+    def report(self) -> Dict[str, object]:
+        """
+        Returns a summary of the profile
+
+        {"mode": ..., "wall": ..., "cpu": ..., "samples": ..., "cpu_time": ..., "wait_time": ..., "categories": {category: seconds}}
+
+        The categories are estimated from the samples (in "sampling" mode) or from the functions own time (in "cprofile" mode),
+        and are summed over all of the profiled threads.
+        """
+        categories = {category: round(seconds, 6) for category, seconds in self.categories.most_common()}
+        return {
+            "mode": self.mode,
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "samples": self.samples,
+            "cpu_time": sum(seconds for category, seconds in categories.items() if category.startswith("cpu.")),
+            "wait_time": sum(seconds for category, seconds in categories.items() if category.startswith("wait.")),
+            "categories": categories
+        }
+
+    def summary(self) -> str:
+        report = self.report()
+        lines = ["Profile ({mode}): {wall:.3f}s wall, {cpu:.3f}s process CPU".format(**report)]
+        total = sum(report["categories"].values()) or 1
+        for category, seconds in report["categories"].items():
+            lines.append("    {:<14} {:>9.3f}s {:>6.1%}".format(category, seconds, seconds / total))
+        return "\n".join(lines)
+
+    def write_collapsed(self, file) -> int:
+        """
+        Writes the sampled stacks in the collapsed format ("frame;frame;frame count" lines) to the given path or file-like object
+
+        Returns the number of written stacks
+        """
+        lines = "".join("{} {}\n".format(stack, count) for stack, count in self.stacks.most_common())
+        if hasattr(file, "write"):
+            file.write(lines)
+        else:
+            with open(file, "w", encoding="utf-8") as handle:
+                handle.write(lines)
+        return len(self.stacks)
+
+    def write(self, prefix: str) -> List[str]:
+        """
+        Writes the profile next to the given path prefix and returns the written files
+
+        - <prefix>.json: the report
+        - <prefix>.folded: the sampled stacks for the flame graphs ("sampling" mode)
+        - <prefix>.pstats: the cProfile statistics, readable with `pstats` or snakeviz ("cprofile" mode)
+        """
+        written = [prefix + ".json"]
+        with open(written[0], "w", encoding="utf-8") as handle:
+            handle.write(dumps(self.report(), indent=4))
+        if self._profile is not None:
+            written.append(prefix + ".pstats")
+            self._profile.dump_stats(written[-1])
+        else:
+            written.append(prefix + ".folded")
+            self.write_collapsed(written[-1])
+        return written
+
+
+def profile_directory_prefix(directory: str, name: str) -> str:
+    """
+    Returns a unique path prefix in the given directory for a profile with the given name (i.e an endpoint)
+    """
+    name = "".join(character if character.isalnum() else "_" for character in str(name)).strip("_") or "profile"
+    return join(directory, "{}-{}-{}".format(int(time.time() * 1000), get_ident(), name))
@@ -1,13 +1,17 @@
 from copy import copy
 from json import loads
-from time import time
+from time import perf_counter, time
 from typing import List, Union
+from urllib.parse import urlsplit
 
 import pyuseragents
 import requests
 from requests.models import CaseInsensitiveDict
 from translatepy.exceptions import RequestStatusError
+from translatepy.utils.cassette import Cassette
 from translatepy.utils.lru_cacher import LRUDictCache
+from translatepy.utils.metrics import current_service, metrics
+from translatepy.utils.tracing import tracer
 
 
 class Response():
@@ -77,11 +81,12 @@ class Response():
             raise RequestStatusError(self.status_code, "Request Status Code: {code}".format(code=str(self.status_code)))
 
     def json(self, **kwargs):
-        return loads(self.text, **kwargs)
+        with tracer.span("response.parse", format="json", size=len(self.content or b"")):
+            return loads(self.text, **kwargs)
 
 
 class Request():
-    def __init__(self, proxy_urls: Union[str, List] = None, cache_duration: Union[int, float] = 2):
+    def __init__(self, proxy_urls: Union[str, List] = None, cache_duration: Union[int, float] = 2, cassette: Cassette = None, session_directory: str = None):
         """
         translatepy's version of `requests.Session`
 
@@ -93,6 +98,10 @@ class Request():
                 The URL(s) for the proxies to be used (they will be used as HTTP and HTTPS proxies)
             cache_duration : int | float
                 The duration of the cache for GET requests
+            cassette : Cassette
+                A cassette to record the requests to, or to replay them from (see `translatepy.utils.cassette`)
+            session_directory : str
+                The directory where the translators store their sessions (tokens, cookies), the translators directory by default
 
         Returns:
         --------
@@ -120,6 +129,8 @@ class Request():
         self.cache_duration = float(cache_duration)
 
         self.headers = HEADERS
+        self.cassette = cassette
+        self.session_directory = session_directory
 
         self._proxies_index = 0
         self.proxies = ([proxy_urls] if isinstance(proxy_urls, str) else list(proxy_urls) if proxy_urls is not None else [])
@@ -134,6 +145,43 @@ class Request():
                 "https": url
             })
 
+    def _perform(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Internal function to make the actual request, rotating the proxies"""
+        self._set_session_proxies(self.proxies[self._proxies_index])
+        request = self.session.request(method, url, **kwargs)
+        if self._proxies_index != len(self.proxies) - 1:
+            self._proxies_index += 1
+        else:
+            self._proxies_index = 0
+        return request
+
+    def _send(self, method: str, url: str, **kwargs) -> Response:
+        """Internal function to make a request, through the cassette if any"""
+        with tracer.span("http.request", **{"http.method": method, "http.url": url}) as span:
+            start = perf_counter()
+            try:
+                if self.cassette is None:
+                    request = self._perform(method, url, **kwargs)
+                else:
+                    request = self.cassette.play(method, url, kwargs, lambda: self._perform(method, url, **kwargs))
+            except Exception as exception:
+                if metrics.enabled:
+                    metrics.observe_request(current_service() or urlsplit(url).netloc, perf_counter() - start, exception=exception)
+                raise
+            result = Response(request)
+            request.close()
+            span.set_attribute("http.status_code", result.status_code)
+            if metrics.enabled:
+                body = getattr(request.request, "body", None)
+                metrics.observe_request(
+                    current_service() or urlsplit(url).netloc,
+                    perf_counter() - start,
+                    status_code=result.status_code,
+                    bytes_in=len(result.content or b""),
+                    bytes_out=len(body) if body else 0
+                )
+            return result
+
     def post(self, url: str, **kwargs) -> Response:
         """
         Makes a POST request with the given URL
@@ -150,15 +198,7 @@ class Request():
             Response:
                 The response for the request
         """
-        self._set_session_proxies(self.proxies[self._proxies_index])
-        request = self.session.post(url, **kwargs)
-        result = Response(request)
-        request.close()
-        if self._proxies_index != len(self.proxies) - 1:
-            self._proxies_index += 1
-        else:
-            self._proxies_index = 0
-        return result
+        return self._send("POST", url, **kwargs)
 
     def get(self, url: str, **kwargs) -> Response:
         """
@@ -179,14 +219,7 @@ class Request():
         _cache_key = str(url) + str(kwargs)
         if _cache_key in self.GETCACHE and time() - self.GETCACHE[_cache_key]["timestamp"] < self.cache_duration:
             return self.GETCACHE[_cache_key]["response"]
-        self._set_session_proxies(self.proxies[self._proxies_index])
-        request = self.session.get(url, **kwargs)
-        result = Response(request)
-        request.close()
-        if self._proxies_index != len(self.proxies) - 1:
-            self._proxies_index += 1
-        else:
-            self._proxies_index = 0
+        result = self._send("GET", url, **kwargs)
         self.GETCACHE[_cache_key] = {
             "timestamp": time(),
             "response": copy(result)
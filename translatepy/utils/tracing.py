@@ -0,0 +1,310 @@
+"""
+Lightweight tracing hooks
+
+The calls made by translatepy are split in spans (`Translate.translate` --> service attempt --> translator method
+--> cache lookup --> HTTP request --> response parse), carrying attributes like the service, the method, the language pair,
+the text length, the cache hits and the status codes.
+
+The spans are only created when a hook is registered with `tracer.add_hook()`, which receives them when they start and end.
+
+>>> from translatepy.utils.tracing import tracer
+>>> tracer.add_hook(on_end=lambda span: print("  " * span.depth, span.name, span.duration, span.attributes))
+"""
+
+import logging
+from contextlib import contextmanager
+from functools import wraps
+from inspect import signature
+from itertools import count
+from threading import Lock, local
+from time import perf_counter, time
+
+from translatepy.utils.annotations import Dict
+
+_context = local()
+_ids = count(1)
+
+
+class Span():
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict = None) -> None:
+        """
+        A timed operation, with its attributes and the span which started it (`parent`)
+        """
+        self.tracer = tracer
+        self.id = next(_ids)
+        self.name = str(name)
+        self.attributes = dict(attributes or {})
+        self.parent = None
+        self.exception = None
+        self.start_time = None  # the UNIX timestamp of the start of the span
+        self.end_time = None
+        self._start = None
+
+    @property
+    def depth(self) -> int:
+        """The number of ancestors of the span"""
+        depth, parent = 0, self.parent
+        while parent is not None:
+            depth, parent = depth + 1, parent.parent
+        return depth
+
+    @property
+    def duration(self) -> float:
+        """The duration of the span in seconds, or None if it did not end yet"""
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.parent = current_span()
+        _set_current(self)
+        self._start = perf_counter()
+        self.start_time = time()
+        self.tracer._start(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # using the monotonic clock for the duration
+        self.end_time = self.start_time + (perf_counter() - self._start)
+        if exc_value is not None and isinstance(exc_value, Exception):
+            self.exception = exc_value
+        _set_current(self.parent)
+        self.tracer._end(self)
+
+    def __repr__(self) -> str:
+        return "Span({}, {})".format(self.name, self.attributes)
+
+
+class _NoSpan():
+    """
+    The span returned when tracing is disabled, which doesn't record anything
+    """
+    attributes = {}
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def set_attributes(self, **attributes) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class SpanHook():
+    """
+    The base class of the tracing hooks, which receive the spans when they start and end
+    """
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+class CallbackHook(SpanHook):
+    def __init__(self, on_start=None, on_end=None) -> None:
+        """
+        A hook calling the given functions with the spans
+        """
+        self.start_callback = on_start
+        self.end_callback = on_end
+
+    def on_start(self, span: Span) -> None:
+        if self.start_callback is not None:
+            self.start_callback(span)
+
+    def on_end(self, span: Span) -> None:
+        if self.end_callback is not None:
+            self.end_callback(span)
+
+
+class OpenTelemetryHook(SpanHook):
+    def __init__(self, tracer=None) -> None:
+        """
+        Forwards the spans to OpenTelemetry (needs the `opentelemetry-api` package)
+
+        Parameters:
+        ----------
+            tracer : opentelemetry.trace.Tracer
+                The OpenTelemetry tracer to use (defaults to a "translatepy" tracer from the global tracer provider)
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as exception:
+            raise ImportError("OpenTelemetryHook needs the OpenTelemetry API (pip install opentelemetry-api)") from exception
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("translatepy")
+        self._spans = {}  # translatepy span id --> OpenTelemetry span
+        self._lock = Lock()
+
+    @staticmethod
+    def _attributes(attributes: dict) -> Dict[str, object]:
+        return {
+            key: value if isinstance(value, (str, bool, int, float)) else str(value)
+            for key, value in attributes.items()
+            if value is not None
+        }
+
+    def on_start(self, span: Span) -> None:
+        with self._lock:
+            parent = None if span.parent is None else self._spans.get(span.parent.id)
+        # without any parent, the span is attached to the current OpenTelemetry context (i.e the application span)
+        context = None if parent is None else self._trace.set_span_in_context(parent)
+        otel_span = self.tracer.start_span(span.name, context=context, attributes=self._attributes(span.attributes), start_time=int(span.start_time * 1e9))
+        with self._lock:
+            self._spans[span.id] = otel_span
+
+    def on_end(self, span: Span) -> None:
+        with self._lock:
+            otel_span = self._spans.pop(span.id, None)
+        if otel_span is None:
+            return
+        otel_span.set_attributes(self._attributes(span.attributes))
+        if span.exception is not None:
+            otel_span.record_exception(span.exception)
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, type(span.exception).__name__))
+        otel_span.end(end_time=int(span.end_time * 1e9))
+
+
+class Tracer():
+    """
+    Creates the spans and sends them to the registered hooks
+    """
+
+    def __init__(self) -> None:
+        self.hooks = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.hooks)
+
+    def add_hook(self, hook: SpanHook = None, on_start=None, on_end=None) -> SpanHook:
+        """
+        Registers a hook, or the given callbacks, and returns it
+
+        Parameters:
+        ----------
+            hook : SpanHook
+                The hook to register
+            on_start : function
+                A function called with each span when it starts (if no hook is given)
+            on_end : function
+                A function called with each span when it ends (if no hook is given)
+        """
+        if hook is None:
+            hook = CallbackHook(on_start=on_start, on_end=on_end)
+        # replacing the list to avoid changing it while the spans are sent
+        self.hooks = self.hooks + [hook]
+        return hook
+
+    def remove_hook(self, hook: SpanHook) -> None:
+        self.hooks = [element for element in self.hooks if element is not hook]
+
+    def span(self, name: str, **attributes):
+        """
+        Returns a span to use as a context manager
+
+        >>> with tracer.span("http.request", url=url) as span:
+        ...     span.set_attribute("status_code", 200)
+        """
+        if not self.hooks:
+            return NO_SPAN
+        return Span(self, name, attributes)
+
+    def _send(self, event: str, span: Span) -> None:
+        for hook in self.hooks:
+            try:
+                getattr(hook, event)(span)
+            except Exception:
+                logging.getLogger("translatepy").exception("Error while sending a span to {}".format(hook))
+
+    def _start(self, span: Span) -> None:
+        self._send("on_start", span)
+
+    def _end(self, span: Span) -> None:
+        self._send("on_end", span)
+
+
+# the tracer used by translatepy
+tracer = Tracer()
+
+
+def current_span() -> Span:
+    """
+    Returns the span running in the current thread, if any
+    """
+    return getattr(_context, "span", None)
+
+
+def _set_current(span: Span) -> None:
+    _context.span = span
+
+
+@contextmanager
+def attach(span: Span):
+    """
+    Makes the given span the current one in this thread (i.e for the work submitted to another thread)
+    """
+    previous = current_span()
+    _set_current(span if isinstance(span, Span) else None)
+    try:
+        yield span
+    finally:
+        _set_current(previous)
+
+
+_signatures = {}
+
+
+def call_attributes(function, args: tuple, kwargs: dict) -> Dict[str, object]:
+    """
+    Returns the attributes describing a call to a translatepy method (the text length and the languages)
+    """
+    parameters = _signatures.get(function)
+    if parameters is None:
+        parameters = _signatures[function] = signature(function)
+    try:
+        arguments = parameters.bind(*args, **kwargs).arguments
+    except TypeError:
+        return {}
+    attributes = {}
+    for name in ("text", "texts", "html"):
+        value = arguments.get(name)
+        if isinstance(value, str):
+            attributes["text_length"] = len(value)
+        elif isinstance(value, (list, tuple)):
+            attributes["texts"] = len(value)
+    for name in ("destination_language", "source_language"):
+        value = arguments.get(name)
+        if value is not None:
+            attributes[name] = getattr(value, "id", value)
+    return attributes
+
+
+def traced(name: str):
+    """
+    Records the decorated method in a span with the given name, described with `call_attributes`
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not tracer.hooks:
+                return function(*args, **kwargs)
+            with tracer.span(name, **call_attributes(function, args, kwargs)):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator